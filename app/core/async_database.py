@@ -0,0 +1,55 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.concurrency import run_in_threadpool
+
+from core.confing import settings
+
+
+class DatabaseExecutor:
+    """Выделенные потоки для запросов к SQLite.
+
+    Блокирующие вызовы репозиториев уходят сюда, а не в общий threadpool
+    Starlette, поэтому async-роуты не упираются в его лимит в 40 потоков.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._submitted = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="db")
+        return self._executor
+
+    async def run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        self._submitted += 1
+        return await loop.run_in_executor(
+            self._get_executor(), functools.partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, "submitted": self._submitted}
+
+
+db_executor = DatabaseExecutor(settings.DB_EXECUTOR_WORKERS)
+
+
+async def run_db(func, *args, **kwargs):
+    """Выполнить синхронный вызов к БД, не блокируя event loop.
+
+    DB_EXECUTOR_MODE=executor — выделенный пул потоков (по умолчанию),
+    DB_EXECUTOR_MODE=threadpool — старый путь через threadpool Starlette, для сравнения.
+    """
+    if settings.DB_EXECUTOR_MODE == "threadpool":
+        return await run_in_threadpool(func, *args, **kwargs)
+    return await db_executor.run(func, *args, **kwargs)
+
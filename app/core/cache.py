@@ -0,0 +1,185 @@
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable
+
+from core.confing import settings
+
+MISS = object()
+
+
+class CacheBackend(ABC):
+    """Хранилище кэша. Для общего кэша между воркерами (Redis и т.п.)
+    достаточно реализовать эти методы с сериализацией значений."""
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Значение или MISS"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+def _sizeof(value: Any) -> int:
+    if hasattr(value, "model_dump_json"):
+        return len(value.model_dump_json())
+    return sys.getsizeof(value)
+
+
+class MemoryCache(CacheBackend):
+    """LRU + TTL в памяти процесса с ограничением по числу записей и по байтам"""
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._evictions = 0
+        self._expirations = 0
+
+    def _pop(self, key: str):
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISS
+            expires_at, _, value = entry
+            if expires_at < time.monotonic():
+                self._pop(key)
+                self._expirations += 1
+                return MISS
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (time.monotonic() + ttl, size, value)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._pop(oldest)
+                self._evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+        }
+
+
+class ResponseCache:
+    """Read-through кэш ответов сервисов со счётчиками попаданий.
+
+    Пока ключ загружается, у него есть поколение, invalidate() его увеличивает.
+    Загрузчик, начавший читать до инвалидации, мог получить старую строку — его
+    результат в кэш не кладётся, иначе устаревшая запись жила бы весь TTL.
+    Поколение хранится, только пока по ключу идёт хотя бы одна загрузка: без
+    этого словарь рос бы на каждый когда-либо изменённый id мимо лимитов памяти.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float = 60.0, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self._hits = 0
+        self._misses = 0
+        self._generations: dict[str, int] = {}
+        self._loading: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stale_skips = 0
+
+    def set_backend(self, backend: CacheBackend):
+        self.backend = backend
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return loader()
+
+        value = self.backend.get(key)
+        if value is not MISS:
+            self._hits += 1
+            return value
+
+        self._misses += 1
+        with self._lock:
+            self._loading[key] = self._loading.get(key, 0) + 1
+            generation = self._generations.get(key, 0)
+        try:
+            value = loader()
+            with self._lock:
+                if self._generations.get(key, 0) != generation:
+                    self._stale_skips += 1
+                    return value
+                self.backend.set(key, value, self.ttl)
+            return value
+        finally:
+            with self._lock:
+                self._loading[key] -= 1
+                if not self._loading[key]:
+                    del self._loading[key]
+                    self._generations.pop(key, None)
+
+    def invalidate(self, key: str):
+        with self._lock:
+            if key in self._loading:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self.backend.delete(key)
+
+    def clear(self):
+        with self._lock:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        total = self._hits + self._misses
+        return {
+            "enabled": self.enabled,
+            "hits": self._hits,
+            "misses": self._misses,
+            "stale_skips": self._stale_skips,
+            "hit_rate": round(self._hits / total, 4) if total else 0.0,
+            **self.backend.stats(),
+        }
+
+
+response_cache = ResponseCache(
+    MemoryCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_MAX_BYTES),
+    ttl=settings.CACHE_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED,
+)
@@ -8,9 +8,95 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    JWT_VERIFY_CACHE_ENABLED: bool = True
+    JWT_VERIFY_CACHE_MAX_ENTRIES: int = 10000
     
     # Security
     BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 0  # 0 — по числу ядер
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_MODE: str = "process"  # process | thread
+    AUTH_MODE: str = "lookup"  # lookup — пользователь из БД на каждый запрос, stateless — из claims токена
+    AUTH_USER_STATUS_TTL_SECONDS: float = 30.0
+    AUTH_USER_STATUS_MAX_ENTRIES: int = 100000
+    
+    # Rate limiting
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_LIMIT_PER_IP: int = 20
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = 5
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: float = 60.0
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_SWEEP_INTERVAL: float = 60.0
+    
+    # Database
+    DATABASE_PATH: Optional[str] = None  # по умолчанию app/core/travel_db.sqlite
+    DB_POOL_SIZE: int = 5
+    DB_POOL_TIMEOUT: float = 5.0
+    DB_POOL_HEALTH_CHECK_INTERVAL: float = 30.0
+    DB_EXECUTOR_MODE: str = "executor"  # executor | threadpool
+    DB_EXECUTOR_WORKERS: int = 5
+    
+    # SQLite storage profile
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64000  # отрицательное значение — в KiB
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    
+    # Response cache
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: float = 60.0
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    
+    # JSON-байты прямо из моделей для списков и выгрузки; убрать имя — вернуть обычный путь
+    FAST_JSON_ENDPOINTS: set[str] = {"hotels.list", "places.list", "reviews.list", "export"}
+    
+    # Outbound HTTP для интеграций
+    HTTP_CONNECT_TIMEOUT: float = 3.0
+    HTTP_READ_TIMEOUT: float = 10.0
+    HTTP_POOL_TIMEOUT: float = 5.0
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20  # на хост
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = True  # только если установлен пакет h2
+    
+    # Провайдеры; без URL — встроенные заглушки
+    BOOKING_API_URL: Optional[str] = None
+    BOOKING_API_KEY: Optional[str] = None
+    FOURSQUARE_API_URL: Optional[str] = None  # боевой: https://api.foursquare.com/v3
+    FOURSQUARE_API_KEY: Optional[str] = None
+    HOTEL_SEARCH_DEADLINE_SECONDS: float = 1.5  # общий дедлайн опроса провайдеров
+    HOTEL_SEARCH_LOCAL_LIMIT: int = 20
+    
+    # Устойчивость интеграций: автомат, адаптивный таймаут, хеджирование
+    RESILIENCE_ENABLED: bool = True
+    BREAKER_WINDOW_SECONDS: float = 30.0
+    BREAKER_MIN_CALLS: int = 20  # меньше вызовов в окне — автомат не срабатывает
+    BREAKER_ERROR_RATE: float = 0.5
+    BREAKER_SLOW_CALL_SECONDS: float = 2.0
+    BREAKER_SLOW_CALL_RATE: float = 0.5
+    BREAKER_OPEN_SECONDS: float = 15.0
+    BREAKER_HALF_OPEN_CALLS: int = 3
+    ADAPTIVE_TIMEOUT_MULTIPLIER: float = 2.0  # таймаут = p95 × множитель
+    ADAPTIVE_TIMEOUT_MIN_SECONDS: float = 0.2
+    ADAPTIVE_TIMEOUT_MAX_SECONDS: float = 5.0
+    PROVIDER_LATENCY_MIN_SAMPLES: int = 20  # меньше замеров — таймаут по верхней границе, без хеджей
+    HEDGE_ENABLED: bool = True
+    HEDGE_MIN_DELAY_SECONDS: float = 0.05
+    HEDGE_MAX_RATIO: float = 0.1  # не больше 10% вызовов с повторным запросом
+    
+    # Склейка одновременных одинаковых чтений (single-flight)
+    SINGLE_FLIGHT_ENABLED: bool = True
+    
+    # Кэш ответов провайдеров
+    PROVIDER_CACHE_ENABLED: bool = True
+    PROVIDER_CACHE_TTL_SECONDS: float = 300.0
+    PROVIDER_CACHE_STALE_SECONDS: float = 600.0  # после TTL отдаём старое и обновляем в фоне
+    PROVIDER_CACHE_MAX_ENTRIES: int = 10000
+    PROVIDER_CACHE_GRID_DEGREES: float = 0.01  # ячейка округления координат поиска мест
+    PROVIDER_CACHE_DB_PATH: Optional[str] = None  # файл SQLite, чтобы кэш пережил перезапуск
     
     class Config:
         env_file = ".env"
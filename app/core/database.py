@@ -1,12 +1,450 @@
 import sqlite3
+import logging
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from queue import Queue, Empty, Full
 
-DB_PATH = Path(__file__).parent / "travel_db.sqlite"
+from core.confing import settings
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = Path(settings.DATABASE_PATH) if settings.DATABASE_PATH else Path(__file__).parent / "travel_db.sqlite"
+
+
+JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SYNCHRONOUS_LEVELS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Не дождались свободного соединения в пуле"""
+
+
+def _choice(name: str, value: str, allowed: set[str]) -> str:
+    value = value.upper()
+    if value not in allowed:
+        raise ValueError(f"Недопустимое значение {name}={value}, ожидается одно из {sorted(allowed)}")
+    return value
+
+
+def apply_pragmas(conn: sqlite3.Connection):
+    """Применяем профиль хранилища из настроек к соединению"""
+    journal_mode = _choice("SQLITE_JOURNAL_MODE", settings.SQLITE_JOURNAL_MODE, JOURNAL_MODES)
+    synchronous = _choice("SQLITE_SYNCHRONOUS", settings.SQLITE_SYNCHRONOUS, SYNCHRONOUS_LEVELS)
+    temp_store = _choice("SQLITE_TEMP_STORE", settings.SQLITE_TEMP_STORE, TEMP_STORES)
+
+    conn.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    conn.execute(f"PRAGMA synchronous = {synchronous}")
+    conn.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+    conn.execute(f"PRAGMA cache_size = {int(settings.SQLITE_CACHE_SIZE)}")
+    conn.execute(f"PRAGMA temp_store = {temp_store}")
+
+
+def storage_report(conn: sqlite3.Connection) -> dict:
+    """Фактические значения pragma (SQLite может молча не принять часть из них)"""
+    report = {}
+    for pragma in ("journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store", "busy_timeout"):
+        report[pragma] = conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+    return report
+
+
+class ConnectionPool:
+    """Пул долгоживущих соединений с SQLite.
+
+    Соединения выдаются по принципу checkout/checkin: `connection()` берёт
+    соединение из очереди, а по выходу из блока возвращает его обратно.
+    Новые соединения открываются лениво, пока не достигнут `size`.
+    """
+
+    def __init__(self, db_path: Path, size: int = 5, timeout: float = 5.0,
+                 health_check_interval: float = 30.0):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle: Queue = Queue(maxsize=size)
+        self._lock = threading.Lock()
+        self._last_used: dict[int, float] = {}
+        self._open = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._waits = 0
+        self._health_failures = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        apply_pragmas(conn)
+        logger.debug(f"Открыто соединение с {self.db_path}")
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        last_used = self._last_used.get(id(conn), 0.0)
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Соединение не прошло проверку: {e}")
+            self._health_failures += 1
+            return False
+
+    def _discard(self, conn: sqlite3.Connection):
+        self._last_used.pop(id(conn), None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._open -= 1
+
+    def acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise sqlite3.ProgrammingError("Пул соединений закрыт")
+
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except Empty:
+                conn = None
+                with self._lock:
+                    if self._open < self.size:
+                        self._open += 1
+                        create = True
+                    else:
+                        create = False
+                if create:
+                    try:
+                        conn = self._connect()
+                    except sqlite3.Error:
+                        with self._lock:
+                            self._open -= 1
+                        raise
+                else:
+                    with self._lock:
+                        self._waits += 1
+                    try:
+                        conn = self._idle.get(timeout=self.timeout)
+                    except Empty:
+                        raise PoolTimeoutError(
+                            f"Нет свободного соединения за {self.timeout} сек"
+                        )
+
+            if not self._is_healthy(conn):
+                self._discard(conn)
+                continue
+
+            with self._lock:
+                self._checkouts += 1
+            return conn
+
+    def release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            self._discard(conn)
+            return
+        self._last_used[id(conn)] = time.monotonic()
+        try:
+            self._idle.put_nowait(conn)
+        except Full:
+            self._discard(conn)
+
+    @contextmanager
+    def connection(self):
+        """Соединение из пула: commit при успехе, rollback при ошибке"""
+        conn = self.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except Empty:
+                break
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        return {
+            "db_path": str(self.db_path),
+            "size": self.size,
+            "open": self._open,
+            "idle": self._idle.qsize(),
+            "in_use": self._open - self._idle.qsize(),
+            "checkouts": self._checkouts,
+            "waits": self._waits,
+            "health_failures": self._health_failures,
+        }
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Пул для текущего DB_PATH (пересоздаётся, если путь подменили, например в тестах)"""
+    global _pool
+    pool = _pool
+    if pool is not None and pool.db_path == DB_PATH:
+        return pool
+
+    with _pool_lock:
+        if _pool is None or _pool.db_path != DB_PATH:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(
+                DB_PATH,
+                size=settings.DB_POOL_SIZE,
+                timeout=settings.DB_POOL_TIMEOUT,
+                health_check_interval=settings.DB_POOL_HEALTH_CHECK_INTERVAL,
+            )
+        return _pool
+
+
+def get_connection():
+    """Короткий путь: `with get_connection() as conn: ...`"""
+    return get_pool().connection()
+
+
+@contextmanager
+def read_only_connection():
+    """Отдельное соединение только для чтения, мимо пула.
+
+    Для долгих потоковых чтений (выгрузки): их длительность задаёт клиент,
+    и соединение из пула, занятое на всё скачивание, отнимало бы его у
+    остальных запросов. mode=ro — запись через него невозможна.
+    """
+    conn = sqlite3.connect(f"{DB_PATH.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    try:
+        conn.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        conn.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+        conn.execute(f"PRAGMA cache_size = {int(settings.SQLITE_CACHE_SIZE)}")
+        yield conn
+    finally:
+        conn.close()
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def pool_stats() -> dict:
+    return get_pool().stats()
+
+
+def build_update_set(update_data: dict, columns: tuple[str, ...]) -> tuple[str, list]:
+    """SET-часть UPDATE только из переданных полей: ("name = ?, rating = ?", [значения]).
+
+    Имена колонок берутся из белого списка columns, а не из ключей запроса.
+    """
+    fields = [column for column in columns if column in update_data]
+    return ", ".join(f"{column} = ?" for column in fields), [update_data[column] for column in fields]
+
+
+def _columns(cursor: sqlite3.Cursor, table: str) -> list[str]:
+    return [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+
+
+def _rebuild_table(cursor: sqlite3.Cursor, table: str, create_sql: str, select_sql: str):
+    """Пересоздание таблицы с сохранением данных (SQLite не умеет менять порядок/ограничения колонок)"""
+    cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    cursor.execute(create_sql)
+    cursor.execute(f"INSERT INTO {table} {select_sql} FROM {table}_old")
+    cursor.execute(f"DROP TABLE {table}_old")
+
+
+def _migration_align_columns(cursor: sqlite3.Cursor):
+    """Приводим таблицы к колонкам, которые ждут репозитории"""
+    if "address" not in _columns(cursor, "places"):
+        _rebuild_table(
+            cursor, "places",
+            """CREATE TABLE places(
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               name TEXT NOT NULL,
+               type TEXT,
+               address TEXT,
+               rating REAL)""",
+            "SELECT id, name, type, NULL, rating",
+        )
+
+    if "place_id" not in _columns(cursor, "reviews"):
+        _rebuild_table(
+            cursor, "reviews",
+            """CREATE TABLE reviews(
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                hotel_id INTEGER,
+                place_id INTEGER,
+                user_id INTEGER NOT NULL,
+                text TEXT,
+                rating INTEGER CHECK(rating >= 1 AND rating <= 5),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (hotel_id) REFERENCES hotels(id) ON DELETE CASCADE,
+                FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE,
+                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+                )""",
+            "SELECT id, hotel_id, NULL, user_id, comment, rating, created_at",
+        )
+
+    if "deleted_at" not in _columns(cursor, "users"):
+        cursor.execute("ALTER TABLE users ADD COLUMN deleted_at TIMESTAMP")
+
+
+def _migration_review_indexes(cursor: sqlite3.Cursor):
+    """Составные индексы под выборки отзывов по отелю, месту и пользователю"""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reviews_hotel ON reviews(hotel_id, created_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reviews_place ON reviews(place_id, created_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reviews_user ON reviews(user_id, created_at, id)")
+
+
+def _migration_review_stats(cursor: sqlite3.Cursor):
+    """Агрегаты отзывов по отелям и местам, поддерживаются инкрементально при записи отзывов"""
+    cursor.execute(
+        """CREATE TABLE IF NOT EXISTS review_stats(
+            target_type TEXT NOT NULL,
+            target_id INTEGER NOT NULL,
+            review_count INTEGER NOT NULL DEFAULT 0,
+            rating_sum INTEGER NOT NULL DEFAULT 0,
+            rating_1 INTEGER NOT NULL DEFAULT 0,
+            rating_2 INTEGER NOT NULL DEFAULT 0,
+            rating_3 INTEGER NOT NULL DEFAULT 0,
+            rating_4 INTEGER NOT NULL DEFAULT 0,
+            rating_5 INTEGER NOT NULL DEFAULT 0,
+            last_review_at TIMESTAMP,
+            PRIMARY KEY (target_type, target_id)
+        ) WITHOUT ROWID"""
+    )
+
+    rebuild_review_stats(cursor)
+
+
+def rebuild_review_stats(cursor: sqlite3.Cursor):
+    """Полный пересчёт review_stats из reviews (после миграции или массовой загрузки в обход репозитория)"""
+    cursor.execute("DELETE FROM review_stats")
+    for target_type, column in (("hotel", "hotel_id"), ("place", "place_id")):
+        cursor.execute(
+            f"""INSERT INTO review_stats
+            SELECT '{target_type}', {column}, COUNT(*), SUM(rating),
+                   SUM(rating = 1), SUM(rating = 2), SUM(rating = 3), SUM(rating = 4), SUM(rating = 5),
+                   MAX(created_at)
+            FROM reviews WHERE {column} IS NOT NULL GROUP BY {column}"""
+        )
+
+
+def _migration_created_at(cursor: sqlite3.Cursor):
+    """created_at для отелей и мест и индексы под инкрементальную выгрузку"""
+    for table in ("hotels", "places"):
+        if "created_at" not in _columns(cursor, table):
+            # ALTER TABLE не принимает DEFAULT CURRENT_TIMESTAMP, поэтому новые строки дозаполняет триггер
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN created_at TIMESTAMP")
+            cursor.execute(f"UPDATE {table} SET created_at = CURRENT_TIMESTAMP")
+            cursor.execute(
+                f"""CREATE TRIGGER IF NOT EXISTS {table}_created_at AFTER INSERT ON {table}
+                WHEN NEW.created_at IS NULL
+                BEGIN
+                    UPDATE {table} SET created_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+                END"""
+            )
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_created ON {table}(created_at, id)")
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reviews_created ON reviews(created_at, id)")
+
+
+def _migration_refresh_tokens(cursor: sqlite3.Cursor):
+    """Хранилище refresh-токенов: ротация, обнаружение повторного использования, отзыв"""
+    cursor.execute(
+        """CREATE TABLE IF NOT EXISTS refresh_tokens(
+            jti TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            family_id TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            replaced_by TEXT,
+            revoked INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        ) WITHOUT ROWID"""
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user ON refresh_tokens(user_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_refresh_tokens_family ON refresh_tokens(family_id)")
+
+
+# Порядок не менять: номер миграции = позиция в списке, текущая версия хранится в PRAGMA user_version
+MIGRATIONS = [
+    _migration_align_columns,
+    _migration_review_indexes,
+    _migration_review_stats,
+    _migration_created_at,
+    _migration_refresh_tokens,
+]
+
+# Запросы, которые обязаны идти по индексу, а не полным сканом
+INDEX_CHECKS = {
+    "idx_reviews_hotel": "SELECT * FROM reviews WHERE hotel_id = ? ORDER BY created_at, id LIMIT ?",
+    "idx_reviews_place": "SELECT * FROM reviews WHERE place_id = ? ORDER BY created_at, id LIMIT ?",
+    "idx_reviews_user": "SELECT * FROM reviews WHERE user_id = ? ORDER BY created_at, id LIMIT ?",
+}
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Применяем недостающие миграции, возвращаем итоговую версию схемы"""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+    for number, migration in enumerate(MIGRATIONS, start=1):
+        if number <= version:
+            continue
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN")
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error(f"Ошибка миграции {number} ({migration.__name__}): {e}")
+            raise e
+        logger.info(f"Применена миграция {number}: {migration.__name__}")
+        version = number
+
+    return version
+
+
+def explain_query_plan(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> list[str]:
+    """Строки EXPLAIN QUERY PLAN (колонка detail)"""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def check_indexes(conn: sqlite3.Connection) -> dict[str, bool]:
+    """Проверяем, что запросы из INDEX_CHECKS используют свои индексы"""
+    result = {}
+    for index_name, sql in INDEX_CHECKS.items():
+        plan = explain_query_plan(conn, sql, (0, 1))
+        used = any(index_name in detail for detail in plan)
+        if not used:
+            logger.warning(f"Запрос не использует {index_name}: {plan}")
+        result[index_name] = used
+    return result
 
 
 def init_db():
     """Инициализируем подключение к бд"""
     conn = sqlite3.connect(DB_PATH)
+    apply_pragmas(conn)
     cursor = conn.cursor()
     
     
@@ -53,5 +491,11 @@ def init_db():
         """)
     
     conn.commit()
+    version = migrate(conn)
+    indexes = check_indexes(conn)
+    report = storage_report(conn)
     conn.close()
-    print(f"Инициализация  {DB_PATH}")
\ No newline at end of file
+    print(f"Инициализация  {DB_PATH} (версия схемы {version})")
+    print(f"Профиль хранилища SQLite: {report}")
+    print(f"Индексы: {indexes}")
+    return report
\ No newline at end of file
@@ -0,0 +1,182 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+
+from core.confing import settings
+
+
+class HashingBusyError(RuntimeError):
+    """Очередь на хэширование заполнена — клиенту отвечаем 429"""
+
+
+def _timed(func, *args):
+    """Выполняется в воркере: результат и момент начала/конца по стенным часам,
+    чтобы родитель посчитал ожидание в очереди отдельно от самого хэширования"""
+    started = time.time()
+    result = func(*args)
+    return result, started, time.time()
+
+
+def hash_rounds(hashed_password: str) -> int | None:
+    """Стоимость из хэша вида $2b$12$...; None, если это не bcrypt"""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[1].startswith("2") or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def calibrate(target_ms: float, min_rounds: int = 4, max_rounds: int = 16, samples: int = 3) -> tuple[int, dict[int, float]]:
+    """Подбор стоимости bcrypt под целевое время хэширования на этом железе.
+
+    Возвращает наибольшую стоимость, медиана которой укладывается в target_ms
+    (но не меньше min_rounds), и замеры по каждой проверенной стоимости в мс.
+    Каждый шаг вдвое дороже предыдущего, поэтому перебор останавливается,
+    как только цель превышена.
+    """
+    timings: dict[int, float] = {}
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        runs = []
+        for _ in range(samples):
+            salt = bcrypt.gensalt(rounds=rounds)
+            started = time.perf_counter()
+            bcrypt.hashpw(b"calibration-password", salt)
+            runs.append((time.perf_counter() - started) * 1000)
+        timings[rounds] = round(sorted(runs)[len(runs) // 2], 3)
+        if timings[rounds] > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
+
+
+class _Timing:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class PasswordHasher:
+    """Пул процессов для bcrypt.
+
+    bcrypt держит CPU ~250 мс на раунд 12; в потоках запросов он вытесняет
+    чтения отелей и мест. Здесь хэширование идёт в отдельных процессах,
+    а число задач в полёте ограничено workers + max_queue — сверх этого
+    сразу HashingBusyError, без ожидания.
+    """
+
+    def __init__(self, workers: int, max_queue: int, mode: str = "process"):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.mode = mode
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+        self._rehashed = 0
+        self._queue_wait = _Timing()
+        self._hash_time = _Timing()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hash")
+            else:
+                # spawn, а не fork: родитель многопоточный (пул БД, event loop)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._executor
+
+    async def _submit(self, func, *args):
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise HashingBusyError("Слишком много запросов на аутентификацию, повторите позже")
+            self._in_flight += 1
+
+        submitted = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(self._get_executor(), _timed, func, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        with self._lock:
+            self._queue_wait.add(max(0.0, started - submitted))
+            self._hash_time.add(finished - started)
+        return result
+
+    async def hash(self, password: str, rounds: int | None = None) -> str:
+        salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
+        hashed = await self._submit(bcrypt.hashpw, password.encode("utf-8"), salt)
+        return hashed.decode("utf-8")
+
+    async def hash_many(self, passwords: list[str], rounds: int | None = None) -> list[str]:
+        """Пакет паролей для административной регистрации: не больше workers задач
+        одновременно, чтобы пакет не вытеснял из очереди обычные входы"""
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def one(password: str) -> str:
+            async with semaphore:
+                return await self.hash(password, rounds)
+
+        return list(await asyncio.gather(*(one(password) for password in passwords)))
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        try:
+            return await self._submit(bcrypt.checkpw, password.encode("utf-8"), hashed_password.encode("utf-8"))
+        except ValueError:
+            # Испорченный хэш в БД считаем неверным паролем
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Хэш посчитан с другой стоимостью, чем BCRYPT_ROUNDS"""
+        return hash_rounds(hashed_password) != settings.BCRYPT_ROUNDS
+
+    def record_rehash(self):
+        with self._lock:
+            self._rehashed += 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "rejected": self._rejected,
+            "rehashed": self._rehashed,
+            "rounds": settings.BCRYPT_ROUNDS,
+            "queue_wait": self._queue_wait.to_dict(),
+            "hash_time": self._hash_time.to_dict(),
+        }
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_MAX_QUEUE,
+    settings.PASSWORD_HASH_MODE,
+)
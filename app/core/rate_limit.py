@@ -0,0 +1,183 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+
+from core.confing import settings
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Лимит запросов превышен, повторите через {math.ceil(retry_after)} с")
+        self.retry_after = retry_after
+
+
+class RateLimitBackend(ABC):
+    """Хранилище счётчиков. Для общего лимита между воркерами (Redis и т.п.)
+    достаточно реализовать hit_all атомарно на стороне хранилища."""
+
+    @abstractmethod
+    def hit_all(self, limits: list[tuple[str, int]], window: float) -> float | None:
+        """Засчитать запрос по всем ключам (key, limit), только если ни один лимит не исчерпан.
+
+        None — разрешён, иначе через сколько секунд можно повторить; отклонённый
+        запрос не тратит лимит ни одного ключа. limit <= 0 отклоняет всё.
+        """
+
+    def hit(self, key: str, limit: int, window: float) -> float | None:
+        return self.hit_all([(key, limit)], window)
+
+    @abstractmethod
+    def reset(self, key: str):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+class _Ring:
+    """Отметки времени последних `limit` запросов в кольцевом буфере фиксированного размера"""
+
+    __slots__ = ("stamps", "head")
+
+    def __init__(self, limit: int):
+        self.stamps = array("d", [-math.inf]) * limit
+        self.head = 0  # самая старая отметка
+
+    def check(self, now: float, window: float) -> float | None:
+        oldest = self.stamps[self.head]
+        if oldest > now - window:
+            return oldest + window - now
+        return None
+
+    def record(self, now: float):
+        self.stamps[self.head] = now
+        self.head = (self.head + 1) % len(self.stamps)
+
+    def newest(self) -> float:
+        return self.stamps[self.head - 1]
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Скользящее окно в памяти процесса.
+
+    На ключ — кольцо из `limit` отметок: запрос разрешён, если самая старая
+    отметка вышла из окна. Память O(limit) на ключ, проверка O(1). Ключи без
+    запросов дольше окна вычищаются раз в sweep_interval; при переполнении
+    max_keys вытесняется самый давно заведённый ключ.
+    """
+
+    def __init__(self, max_keys: int = 100000, sweep_interval: float = 60.0):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self._rings: dict[str, _Ring] = {}
+        self._windows: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + sweep_interval
+        self._rejected = 0
+        self._evicted = 0
+
+    def _sweep(self, now: float):
+        stale = [key for key, ring in self._rings.items() if ring.newest() <= now - self._windows[key]]
+        for key in stale:
+            del self._rings[key]
+            del self._windows[key]
+        self._evicted += len(stale)
+        self._next_sweep = now + self.sweep_interval
+
+    def _ring(self, key: str, limit: int, window: float) -> _Ring:
+        ring = self._rings.get(key)
+        if ring is None or len(ring.stamps) != limit:
+            if ring is None and len(self._rings) >= self.max_keys:
+                oldest = next(iter(self._rings))
+                del self._rings[oldest]
+                del self._windows[oldest]
+                self._evicted += 1
+            ring = self._rings[key] = _Ring(limit)
+            self._windows[key] = window
+        return ring
+
+    def hit_all(self, limits: list[tuple[str, int]], window: float) -> float | None:
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+            if any(limit <= 0 for _, limit in limits):
+                self._rejected += 1
+                return window
+
+            rings = [self._ring(key, limit, window) for key, limit in limits]
+            waits = [wait for wait in (ring.check(now, window) for ring in rings) if wait is not None]
+            if waits:
+                self._rejected += 1
+                return max(waits)
+            for ring in rings:
+                ring.record(now)
+            return None
+
+    def reset(self, key: str):
+        with self._lock:
+            self._rings.pop(key, None)
+            self._windows.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._rings.clear()
+            self._windows.clear()
+
+    def stats(self) -> dict:
+        return {"keys": len(self._rings), "rejected": self._rejected, "evicted": self._evicted}
+
+
+class LoginRateLimiter:
+    """Лимиты попыток входа по IP и по email — до любой работы с bcrypt"""
+
+    def __init__(self, backend: RateLimitBackend, per_ip: int, per_email: int, window: float, enabled: bool = True):
+        self.backend = backend
+        self.per_ip = per_ip
+        self.per_email = per_email
+        self.window = window
+        self.enabled = enabled
+
+    def set_backend(self, backend: RateLimitBackend):
+        self.backend = backend
+
+    def check(self, ip: str | None, email: str):
+        if not self.enabled:
+            return
+
+        checks = [(f"login:email:{email.strip().lower()}", self.per_email)]
+        if ip:
+            checks.insert(0, (f"login:ip:{ip}", self.per_ip))
+
+        # Оба ключа разом: отклонённая по email попытка не тратит лимит IP
+        retry_after = self.backend.hit_all(checks, self.window)
+        if retry_after is not None:
+            raise RateLimitExceeded(retry_after)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "per_ip": self.per_ip,
+            "per_email": self.per_email,
+            "window": self.window,
+            **self.backend.stats(),
+        }
+
+
+login_rate_limiter = LoginRateLimiter(
+    MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS, settings.RATE_LIMIT_SWEEP_INTERVAL),
+    per_ip=settings.LOGIN_RATE_LIMIT_PER_IP,
+    per_email=settings.LOGIN_RATE_LIMIT_PER_EMAIL,
+    window=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+    enabled=settings.LOGIN_RATE_LIMIT_ENABLED,
+)
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from core.confing import settings
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class _AsyncCall:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Склейка одновременных одинаковых вызовов: работу делает первый, остальные ждут его результат.
+
+    do() — для синхронного кода в потоках (репозитории через run_db), do_async() —
+    для корутин. Ошибка первого получают все ожидавшие, ничего не запоминается:
+    следующий вызов после завершения снова выполняется; forget(key) отпускает
+    текущий вызов раньше — после записи новые вызовы не ждут чтение, начатое до
+    неё. Результат общий для всех ожидавших — его нельзя изменять на месте.
+    В do_async отмена одного ожидающего не отменяет работу для остальных, но
+    когда уходит последний (например, по таймауту), работа отменяется — в фоне
+    она никому не нужна.
+    """
+
+    def __init__(self, name: str, enabled: bool = True):
+        self.name = name
+        self.enabled = enabled
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, _AsyncCall] = {}
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._coalesced = 0
+        self._errors = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return fn()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executed += 1
+            else:
+                self._coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            return await fn()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            call = self._tasks.get(key)
+            if call is not None and not call.task.done() and call.task.get_loop() is loop:
+                self._coalesced += 1
+            else:
+                call = _AsyncCall(loop.create_task(self._run(key, fn)))
+                self._tasks[key] = call
+                self._executed += 1
+            call.waiters += 1
+        try:
+            # shield: отмена одного ожидающего не отменяет работу для остальных
+            return await asyncio.shield(call.task)
+        finally:
+            with self._lock:
+                call.waiters -= 1
+                abandoned = call.waiters == 0 and not call.task.done()
+                if abandoned and self._tasks.get(key) is call:
+                    # Отменённая задача станет done() только на следующей итерации
+                    # цикла — новый вызов в этом же тике не должен к ней присоединиться
+                    del self._tasks[key]
+            if abandoned:
+                call.task.cancel()
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            return await fn()
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                call = self._tasks.get(key)
+                if call is not None and call.task is asyncio.current_task():
+                    del self._tasks[key]
+
+    def forget(self, key: Hashable):
+        """Следующий вызов с key выполнится заново, даже если текущий ещё не закончился"""
+        with self._lock:
+            self._calls.pop(key, None)
+            self._tasks.pop(key, None)
+
+    def clear_stats(self):
+        with self._lock:
+            self._executed = self._coalesced = self._errors = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._executed + self._coalesced
+            return {
+                "enabled": self.enabled,
+                "executed": self._executed,
+                "coalesced": self._coalesced,
+                "errors": self._errors,
+                "in_flight": len(self._calls) + len(self._tasks),
+                "coalesced_rate": round(self._coalesced / total, 4) if total else 0.0,
+            }
+
+
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+
+def single_flight(name: str) -> SingleFlight:
+    """Именованный экземпляр: статистика всех собирается в single_flight_stats()"""
+    with _flights_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = _flights[name] = SingleFlight(name, enabled=settings.SINGLE_FLIGHT_ENABLED)
+        return flight
+
+
+def single_flight_stats() -> dict:
+    with _flights_lock:
+        flights = list(_flights.values())
+    return {flight.name: flight.stats() for flight in flights}
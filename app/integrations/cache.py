@@ -0,0 +1,317 @@
+import asyncio
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.confing import settings
+from core.singleflight import single_flight
+from integrations.hotels.base import BaseHotelProvider
+from integrations.places.base import BasePlaceProvider
+from integrations.resilience import call_deadline
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(value: Any, grid: float) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, (tuple, list)) and len(value) == 2 and all(isinstance(v, (int, float)) for v in value):
+        # Координаты — в центр ячейки сетки: соседние точки делят одну запись кэша
+        return [round((math.floor(v / grid) + 0.5) * grid, 6) for v in value]
+    return value
+
+
+def cache_key(provider: str, method: str, grid: float = 0.01, **params) -> str:
+    """Ключ из нормализованных параметров: регистр и пробелы в строках не важны,
+    координаты округлены до ячейки grid градусов (0.01° — около километра)"""
+    normalized = {name: _normalize(value, grid) for name, value in params.items()}
+    return f"{provider}:{method}:" + json.dumps(normalized, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+class _ProviderStats:
+    __slots__ = ("hits", "stale_hits", "persistent_hits", "misses", "refreshes", "refresh_errors")
+
+    def __init__(self):
+        self.hits = 0
+        self.stale_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def to_dict(self) -> dict:
+        served = self.hits + self.stale_hits + self.persistent_hits
+        total = served + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "hit_rate": round(served / total, 4) if total else 0.0,
+        }
+
+
+class SQLiteCacheStore:
+    """Постоянный уровень: записи переживают перезапуск. Отдельный файл, не основная БД"""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS provider_cache(
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                fresh_until REAL NOT NULL,
+                stale_until REAL NOT NULL
+            ) WITHOUT ROWID"""
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, fresh_until, stale_until FROM provider_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1], row[2]
+
+    def set(self, key: str, value: Any, fresh_until: float, stale_until: float):
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO provider_cache(key, value, fresh_until, stale_until) VALUES(?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value,
+                    fresh_until = excluded.fresh_until, stale_until = excluded.stale_until""",
+                (key, payload, fresh_until, stale_until),
+            )
+            self._conn.commit()
+
+    def purge(self, now: float) -> int:
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM provider_cache WHERE stale_until < ?", (now,)).rowcount
+            self._conn.commit()
+        return deleted
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM provider_cache")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ProviderCache:
+    """Кэш ответов внешних провайдеров: память (LRU) и, опционально, SQLite.
+
+    Запись свежая ttl секунд — отдаём из памяти без запроса. Ещё stale секунд
+    после этого отдаём старое значение сразу, а обновление идёт в фоне, по
+    одному на ключ. Позже — обычный промах с ожиданием провайдера; одновременные
+    промахи по одному ключу склеиваются в один запрос. Ошибки провайдера не
+    кэшируются.
+    """
+
+    def __init__(self, ttl: float = 300.0, stale: float = 600.0, max_entries: int = 10000,
+                 store: Optional[SQLiteCacheStore] = None, enabled: bool = True,
+                 clock: Callable[[], float] = time.time):
+        self.ttl = ttl
+        self.stale = stale
+        self.max_entries = max_entries
+        self.store = store
+        self.enabled = enabled
+        self.clock = clock
+        self._data: OrderedDict[str, Tuple[Any, float, float]] = OrderedDict()
+        self._stats: Dict[str, _ProviderStats] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._flight = single_flight("integrations.providers")
+
+    def _provider_stats(self, provider: str) -> _ProviderStats:
+        stats = self._stats.get(provider)
+        if stats is None:
+            stats = self._stats[provider] = _ProviderStats()
+        return stats
+
+    def _remember(self, key: str, entry: Tuple[Any, float, float]):
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def _lookup(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    async def _store(self, key: str, value: Any) -> Any:
+        now = self.clock()
+        entry = (value, now + self.ttl, now + self.ttl + self.stale)
+        self._remember(key, entry)
+        if self.store is not None:
+            try:
+                await asyncio.to_thread(self.store.set, key, *entry)
+            except sqlite3.Error as e:
+                logger.warning(f"Не удалось сохранить кэш провайдера: {e}")
+        return value
+
+    async def _refresh(self, provider: str, key: str, fetch: Callable[[], Awaitable[Any]]):
+        # Фоновое обновление переживает запрос, который его запустил: его дедлайн не действует
+        call_deadline.set(None)
+        stats = self._provider_stats(provider)
+        try:
+            await self._store(key, await fetch())
+            stats.refreshes += 1
+        except Exception as e:
+            stats.refresh_errors += 1
+            logger.warning(f"Фоновое обновление кэша {provider} не удалось: {e!r}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    def _schedule_refresh(self, provider: str, key: str, fetch: Callable[[], Awaitable[Any]]):
+        task = self._refreshing.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            return
+        self._refreshing[key] = asyncio.create_task(self._refresh(provider, key, fetch))
+
+    async def get_or_fetch(self, provider: str, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Значение из кэша или от провайдера; возвращаемый объект общий — не изменять"""
+        if not self.enabled:
+            return await self._flight.do_async(key, fetch)
+
+        stats = self._provider_stats(provider)
+        now = self.clock()
+
+        entry = self._lookup(key)
+        persistent = False
+        if entry is None and self.store is not None:
+            try:
+                entry = await asyncio.to_thread(self.store.get, key)
+            except sqlite3.Error as e:
+                logger.warning(f"Не удалось прочитать кэш провайдера: {e}")
+                entry = None
+            if entry is not None and entry[2] > now:
+                self._remember(key, entry)
+                persistent = True
+
+        if entry is not None:
+            value, fresh_until, stale_until = entry
+            if now < fresh_until:
+                if persistent:
+                    stats.persistent_hits += 1
+                else:
+                    stats.hits += 1
+                return value
+            if now < stale_until:
+                stats.stale_hits += 1
+                self._schedule_refresh(provider, key, fetch)
+                return value
+
+        stats.misses += 1
+        return await self._flight.do_async(key, lambda: self._fetch_and_store(key, fetch))
+
+    async def _fetch_and_store(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        return await self._store(key, await fetch())
+
+    def purge(self) -> int:
+        """Удалить из SQLite записи, у которых вышло и окно stale"""
+        return self.store.purge(self.clock()) if self.store is not None else 0
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._stats.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._data),
+            "ttl": self.ttl,
+            "stale": self.stale,
+            "persistent": self.store is not None,
+            "providers": {provider: stats.to_dict() for provider, stats in self._stats.items()},
+        }
+
+
+class CachedHotelProvider(BaseHotelProvider):
+    """Провайдер отелей с кэшем поиска и карточек; наличие мест всегда запрашивается заново"""
+
+    def __init__(self, name: str, provider: BaseHotelProvider, cache: ProviderCache):
+        self.name = name
+        self.provider = provider
+        self.cache = cache
+
+    async def search_hotels(self, city: str, check_in: str, check_out: str, guests: int = 2) -> List[Dict[str, Any]]:
+        key = cache_key(self.name, "search_hotels", city=city, check_in=check_in, check_out=check_out, guests=guests)
+        return await self.cache.get_or_fetch(
+            self.name, key, lambda: self.provider.search_hotels(city, check_in, check_out, guests)
+        )
+
+    async def get_hotel_details(self, hotel_id: str) -> Optional[Dict[str, Any]]:
+        key = cache_key(self.name, "get_hotel_details", hotel_id=hotel_id)
+        return await self.cache.get_or_fetch(self.name, key, lambda: self.provider.get_hotel_details(hotel_id))
+
+    async def check_availability(self, hotel_id: str, check_in: str, check_out: str) -> bool:
+        return await self.provider.check_availability(hotel_id, check_in, check_out)
+
+
+class CachedPlaceProvider(BasePlaceProvider):
+    """Провайдер мест с кэшем поиска (координаты по сетке), карточек и отзывов"""
+
+    def __init__(self, name: str, provider: BasePlaceProvider, cache: ProviderCache, grid: float = 0.01):
+        self.name = name
+        self.provider = provider
+        self.cache = cache
+        self.grid = grid
+
+    async def search_places(self, query: str, location: Optional[Tuple[float, float]] = None,
+                            radius: int = 1000, limit: int = 20) -> List[Dict[str, Any]]:
+        key = cache_key(self.name, "search_places", self.grid, query=query, location=location,
+                        radius=radius, limit=limit)
+        return await self.cache.get_or_fetch(
+            self.name, key, lambda: self.provider.search_places(query, location, radius, limit)
+        )
+
+    async def get_place_details(self, place_id: str) -> Optional[Dict[str, Any]]:
+        key = cache_key(self.name, "get_place_details", place_id=place_id)
+        return await self.cache.get_or_fetch(self.name, key, lambda: self.provider.get_place_details(place_id))
+
+    async def get_place_photos(self, photo_reference: str, max_width: int = 400) -> Optional[bytes]:
+        # Байты фото в JSON-кэш не кладём
+        return await self.provider.get_place_photos(photo_reference, max_width)
+
+    async def get_place_reviews(self, place_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        key = cache_key(self.name, "get_place_reviews", place_id=place_id, limit=limit)
+        return await self.cache.get_or_fetch(self.name, key, lambda: self.provider.get_place_reviews(place_id, limit))
+
+
+provider_cache = ProviderCache(
+    ttl=settings.PROVIDER_CACHE_TTL_SECONDS,
+    stale=settings.PROVIDER_CACHE_STALE_SECONDS,
+    max_entries=settings.PROVIDER_CACHE_MAX_ENTRIES,
+    store=SQLiteCacheStore(settings.PROVIDER_CACHE_DB_PATH) if settings.PROVIDER_CACHE_DB_PATH else None,
+    enabled=settings.PROVIDER_CACHE_ENABLED,
+)
@@ -0,0 +1,161 @@
+"""Локальный фейковый провайдер: отдаёт записанные ответы Booking/Foursquare с заданной задержкой.
+
+Нужен, чтобы мерить интеграции без сети и ключей. Запуск из каталога app/:
+
+    python -m integrations.fake_server --port 8100 --latency-ms 80 --jitter-ms 20
+
+и в .env: BOOKING_API_URL=http://127.0.0.1:8100/booking,
+FOURSQUARE_API_URL=http://127.0.0.1:8100/foursquare.
+
+Сервер на asyncio без зависимостей: HTTP/1.1 с keep-alive, поэтому видно,
+сколько соединений на самом деле открывает клиент. Для проверки автомата и
+таймаутов — внесение сбоев: --error-rate отвечает 503 с заданной вероятностью,
+большая --latency-ms изображает зависший провайдер; latency и error_rate можно
+менять у запущенного сервера.
+"""
+import argparse
+import asyncio
+import json
+import random
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Путь -> файл записанного ответа
+ROUTES = {
+    "/booking/hotels/search": "booking_search.json",
+    "/foursquare/places/search": "foursquare_search.json",
+}
+
+
+def load_payloads(fixtures_dir: Path = FIXTURES_DIR) -> dict[str, bytes]:
+    return {path: (fixtures_dir / name).read_bytes() for path, name in ROUTES.items()}
+
+
+class FakeProviderServer:
+    """latency — секунды на любой ответ, либо словарь {путь: секунды} для отдельных маршрутов;
+    error_rate — доля ответов 503, так же числом или словарём по маршрутам"""
+
+    def __init__(self, payloads: dict[str, bytes] | None = None, latency: float | dict[str, float] = 0.0,
+                 jitter: float = 0.0, host: str = "127.0.0.1", port: int = 0, seed: int | None = None,
+                 error_rate: float | dict[str, float] = 0.0):
+        self.payloads = payloads if payloads is not None else load_payloads()
+        self.latency = latency
+        self.error_rate = error_rate
+        self.jitter = jitter
+        self.host = host
+        self.port = port
+        self._random = random.Random(seed)
+        self._server: asyncio.AbstractServer | None = None
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def _delay(self, path: str) -> float:
+        base = self.latency.get(path, 0.0) if isinstance(self.latency, dict) else self.latency
+        return max(0.0, base + self._random.uniform(-self.jitter, self.jitter))
+
+    def _fails(self, path: str) -> bool:
+        rate = self.error_rate.get(path, 0.0) if isinstance(self.error_rate, dict) else self.error_rate
+        return rate > 0 and self._random.random() < rate
+
+    async def start(self) -> "FakeProviderServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeProviderServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get("content-length", 0)):
+                    await reader.readexactly(int(headers["content-length"]))
+
+                path = request_line.split(b" ")[1].decode("latin-1").split("?")[0]
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, path, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, path: str, keep_alive: bool):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delay(path))
+        finally:
+            self.in_flight -= 1
+
+        body = self.payloads.get(path)
+        status = "200 OK" if body is not None else "404 Not Found"
+        if body is None:
+            body = json.dumps({"detail": f"Нет записанного ответа для {path}"}, ensure_ascii=False).encode("utf-8")
+        elif self._fails(path):
+            self.errors += 1
+            status = "503 Service Unavailable"
+            body = json.dumps({"detail": "Внесённый сбой"}, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "errors": self.errors, "connections": self.connections,
+                "max_in_flight": self.max_in_flight}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Фейковый провайдер с записанными ответами")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="доля ответов 503, 0..1")
+    args = parser.parse_args(argv)
+
+    server = FakeProviderServer(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                                host=args.host, port=args.port, error_rate=args.error_rate)
+    print(f"Фейковый провайдер на http://{args.host}:{args.port}: {', '.join(ROUTES)}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,22 @@
 from .base import BaseHotelProvider
 from typing import List, Dict, Any, Optional
 
+from core.confing import settings
+from integrations.http import HttpClient, http_client
+
 class BookingComProvider(BaseHotelProvider):
     """Интеграция с Booking.com API"""
     
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 client: Optional[HttpClient] = None):
+        # Без URL — заглушка; для офлайн-замеров — integrations.fake_server
+        self.base_url = base_url or settings.BOOKING_API_URL
+        self.api_key = api_key or settings.BOOKING_API_KEY
+        self.client = client or http_client
+        self.headers = {"Accept": "application/json"}
+        if self.api_key:
+            self.headers["X-API-Key"] = self.api_key
+    
     async def search_hotels(
         self, 
         city: str, 
@@ -11,16 +24,33 @@ class BookingComProvider(BaseHotelProvider):
         check_out: str, 
         guests: int = 2
     ) -> List[Dict[str, Any]]:
-        # TODO: Реализовать API запрос
-        # Пока возвращаем заглушку
+        if self.base_url is None:
+            # Пока возвращаем заглушку
+            return [
+                {
+                    "id": "1",
+                    "name": "Отель 'Центральный'",
+                    "address": "ул. Ленина, 1",
+                    "price": 5000,
+                    "rating": 4.5
+                }
+            ]
+        
+        payload = await self.client.get_json(
+            f"{self.base_url}/hotels/search",
+            params={"city": city, "checkin_date": check_in, "checkout_date": check_out, "adults": guests},
+            headers=self.headers,
+        )
         return [
             {
-                "id": "1",
-                "name": "Отель 'Центральный'",
-                "address": "ул. Ленина, 1",
-                "price": 5000,
-                "rating": 4.5
+                "id": str(item["hotel_id"]),
+                "name": item["hotel_name"],
+                "address": item.get("address"),
+                "price": item.get("min_total_price"),
+                # review_score у Booking по шкале 10
+                "rating": round(item["review_score"] / 2, 1) if item.get("review_score") is not None else None
             }
+            for item in payload.get("result", [])
         ]
     
     async def get_hotel_details(
@@ -37,4 +67,4 @@ class BookingComProvider(BaseHotelProvider):
         check_out: str
     ) -> bool:
         # TODO: Реализовать
-        return True
\ No newline at end of file
+        return True
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from core.confing import settings
+from integrations.cache import CachedHotelProvider, provider_cache
+from integrations.resilience import CircuitOpenError, ResilientHotelProvider, call_deadline, provider_policies
+
+from .base import BaseHotelProvider
+from .booking import BookingComProvider
+
+logger = logging.getLogger(__name__)
+
+
+class _ProviderMetrics:
+    __slots__ = ("calls", "ok", "errors", "timeouts", "rejected", "total", "max")
+
+    def __init__(self):
+        self.calls = 0
+        self.ok = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, status: str, elapsed: float):
+        self.calls += 1
+        if status == "ok":
+            self.ok += 1
+            self.total += elapsed
+            self.max = max(self.max, elapsed)
+        elif status == "timeout":
+            self.timeouts += 1
+        elif status == "circuit_open":
+            self.rejected += 1
+        else:
+            self.errors += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "ok": self.ok,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "avg_ms": round(self.total / self.ok * 1000, 3) if self.ok else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class HotelProviderRegistry:
+    """Зарегистрированные провайдеры отелей и параллельный опрос всех сразу.
+
+    timeout при регистрации — сколько ждём этого провайдера (не больше общего
+    дедлайна поиска): медленный, но необязательный источник можно ограничить
+    сильнее, чтобы он не задавал задержку всего поиска.
+    """
+
+    def __init__(self):
+        self._providers: Dict[str, tuple[BaseHotelProvider, Optional[float]]] = {}
+        self._metrics: Dict[str, _ProviderMetrics] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, provider: BaseHotelProvider, timeout: Optional[float] = None):
+        with self._lock:
+            self._providers[name] = (provider, timeout)
+            self._metrics.setdefault(name, _ProviderMetrics())
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._providers.pop(name, None)
+
+    def get(self, name: str) -> Optional[BaseHotelProvider]:
+        entry = self._providers.get(name)
+        return entry[0] if entry else None
+
+    def names(self) -> List[str]:
+        return list(self._providers)
+
+    async def _call(self, name: str, provider: BaseHotelProvider, timeout: float,
+                    city: str, check_in: str, check_out: str, guests: int) -> tuple[str, List[Dict[str, Any]], dict]:
+        started = time.perf_counter()
+        # _call идёт отдельной задачей gather — значение видно только этому провайдеру
+        call_deadline.set(asyncio.get_running_loop().time() + timeout)
+        try:
+            items = await asyncio.wait_for(provider.search_hotels(city, check_in, check_out, guests), timeout)
+            status = "ok"
+        except asyncio.TimeoutError:
+            items, status = [], "timeout"
+        except CircuitOpenError:
+            items, status = [], "circuit_open"
+        except Exception as e:
+            logger.warning(f"Провайдер {name} не ответил на поиск: {e!r}")
+            items, status = [], "error"
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self._metrics.setdefault(name, _ProviderMetrics()).add(status, elapsed)
+        return name, items, {"status": status, "count": len(items), "latency_ms": round(elapsed * 1000, 3)}
+
+    async def search_hotels(self, city: str, check_in: str, check_out: str, guests: int,
+                            deadline: float) -> tuple[Dict[str, List[Dict[str, Any]]], Dict[str, dict]]:
+        """Все провайдеры параллельно; за дедлайн (секунды) — только то, что успело прийти.
+
+        Возвращает результаты и статус по каждому источнику. Задержка — не больше
+        дедлайна и не сумма провайдеров, а самый медленный из тех, кого ждём.
+        Опоздавший вызов отменяется вместе с его HTTP-запросом, в том числе
+        сквозь кэш и склейку запросов, если его результат больше никто не ждёт.
+        """
+        calls = [
+            self._call(name, provider, min(timeout or deadline, deadline), city, check_in, check_out, guests)
+            for name, (provider, timeout) in list(self._providers.items())
+        ]
+        results, statuses = {}, {}
+        for name, items, status in await asyncio.gather(*calls):
+            results[name] = items
+            statuses[name] = status
+        return results, statuses
+
+    def clear_metrics(self):
+        with self._lock:
+            self._metrics = {name: _ProviderMetrics() for name in self._providers}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {name: metrics.to_dict() for name, metrics in self._metrics.items()}
+
+
+hotel_providers = HotelProviderRegistry()
+
+
+def _wrap(name: str, provider: BaseHotelProvider) -> BaseHotelProvider:
+    """Кэш снаружи: попадания не тратят окно автомата, а устаревшая запись
+    отдаётся и тогда, когда провайдер отключён автоматом"""
+    if settings.RESILIENCE_ENABLED:
+        provider = ResilientHotelProvider(provider, provider_policies.get(name))
+    return CachedHotelProvider(name, provider, provider_cache)
+
+
+hotel_providers.register("booking", _wrap("booking", BookingComProvider()))
@@ -0,0 +1,200 @@
+import asyncio
+import importlib.util
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+from urllib.parse import urlsplit
+
+import httpx
+
+from core.confing import settings
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """HTTP/2 в httpx требует пакет h2; без него остаёмся на HTTP/1.1"""
+    return importlib.util.find_spec("h2") is not None
+
+
+class _HostStats:
+    __slots__ = ("requests", "errors", "timeouts", "in_flight", "total", "max")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+            "avg_ms": round(self.total / self.requests * 1000, 3) if self.requests else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class HttpClient:
+    """Общий пул исходящих соединений для всех провайдеров.
+
+    Соединения переиспользуются (keep-alive) вместо нового TCP/TLS на каждый
+    запрос. На каждый хост — свой httpx.AsyncClient с max_connections=per_host:
+    медленный провайдер не выберет соединения у остальных, а пул httpcore,
+    который перебирает все свои соединения на каждое событие, остаётся
+    маленьким. Ожидающие слота запросы стоят в семафоре хоста, а не в очереди
+    httpcore. Соединения привязаны к event loop, в котором открыты, поэтому
+    клиенты закрываются вместе с ним: при остановке приложения (aclose) или,
+    без lifespan (TestClient без контекста, asyncio.run в скриптах), на
+    завершении loop — через asyncgen-хук, который asyncio.run вызывает до
+    закрытия loop. Обращение из второго loop, пока первый ещё жив, — ошибка:
+    общий пул между loop работать не может.
+    """
+
+    def __init__(self, connect_timeout: float = 3.0, read_timeout: float = 10.0, pool_timeout: float = 5.0,
+                 per_host: int = 20, max_keepalive: int = 20, keepalive_expiry: float = 30.0, http2: bool = True):
+        self.timeout = httpx.Timeout(connect=connect_timeout, read=read_timeout, write=read_timeout, pool=pool_timeout)
+        self.limits = httpx.Limits(max_connections=per_host, max_keepalive_connections=min(max_keepalive, per_host),
+                                   keepalive_expiry=keepalive_expiry)
+        self.per_host = per_host
+        self.http2 = http2 and http2_available()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_guard = None
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._hosts: dict[str, _HostStats] = {}
+        self._lock = threading.Lock()
+        self._created = 0
+
+    async def _close_clients(self, loop: asyncio.AbstractEventLoop):
+        if self._loop is not loop:
+            return
+        clients, self._clients, self._host_slots = self._clients, {}, {}
+        self._loop = self._loop_guard = None
+        for client in clients.values():
+            await client.aclose()
+
+    async def _guard(self, loop: asyncio.AbstractEventLoop):
+        """Держится открытым, пока жив loop; loop.shutdown_asyncgens() закрывает его — и наши клиенты"""
+        try:
+            yield
+        finally:
+            await self._close_clients(loop)
+
+    async def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None and self._clients:
+            if not self._loop.is_closed():
+                raise RuntimeError("HttpClient уже работает в другом event loop: закройте его через aclose() "
+                                   "или используйте отдельный экземпляр")
+            # loop закрыли без shutdown_asyncgens: закрыть клиенты уже нечем
+            logger.warning(f"Прежний event loop закрыт без закрытия HTTP-клиентов ({len(self._clients)} шт.)")
+        self._loop = loop
+        self._clients = {}
+        self._host_slots = {}
+        self._loop_guard = self._guard(loop)
+        await self._loop_guard.asend(None)
+
+    async def _get_client(self, host: str) -> httpx.AsyncClient:
+        await self._bind_loop()
+        client = self._clients.get(host)
+        if client is None:
+            client = self._clients[host] = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=self.http2)
+            self._host_slots[host] = asyncio.Semaphore(self.per_host)
+            self._created += 1
+        return client
+
+    async def start(self):
+        await self._bind_loop()
+
+    async def aclose(self):
+        if self._loop is None:
+            return
+        if self._loop_guard is not None and self._loop is asyncio.get_running_loop():
+            await self._loop_guard.aclose()
+        else:
+            await self._close_clients(self._loop)
+
+    def _host(self, url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.hostname}:{parts.port}" if parts.port else parts.hostname or ""
+
+    def _stats(self, host: str) -> _HostStats:
+        with self._lock:
+            stats = self._hosts.get(host)
+            if stats is None:
+                stats = self._hosts[host] = _HostStats()
+            return stats
+
+    @asynccontextmanager
+    async def _tracked(self, url: str) -> AsyncIterator[httpx.AsyncClient]:
+        host = self._host(url)
+        client = await self._get_client(host)
+        stats = self._stats(host)
+        async with self._host_slots[host]:
+            stats.in_flight += 1
+            started = time.perf_counter()
+            try:
+                yield client
+            except httpx.TimeoutException:
+                stats.timeouts += 1
+                raise
+            except httpx.HTTPError:
+                stats.errors += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                stats.in_flight -= 1
+                stats.requests += 1
+                stats.total += elapsed
+                stats.max = max(stats.max, elapsed)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Запрос с чтением тела целиком; kwargs — как у httpx (params, headers, json, timeout)"""
+        async with self._tracked(url) as client:
+            return await client.request(method, url, **kwargs)
+
+    async def get_json(self, url: str, **kwargs) -> Any:
+        """GET и разбор JSON; ошибочный статус — httpx.HTTPStatusError"""
+        async with self._tracked(url) as client:
+            response = await client.get(url, **kwargs)
+            response.raise_for_status()
+        return response.json()
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Потоковый ответ: тело читается через aiter_bytes(), слот хоста занят до выхода"""
+        async with self._tracked(url) as client:
+            async with client.stream(method, url, **kwargs) as response:
+                yield response
+
+    def stats(self) -> dict:
+        with self._lock:
+            hosts = {host: stats.to_dict() for host, stats in self._hosts.items()}
+        return {
+            "open_clients": len(self._clients),
+            "clients_created": self._created,
+            "http2": self.http2,
+            "per_host": self.per_host,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "hosts": hosts,
+        }
+
+
+http_client = HttpClient(
+    connect_timeout=settings.HTTP_CONNECT_TIMEOUT,
+    read_timeout=settings.HTTP_READ_TIMEOUT,
+    pool_timeout=settings.HTTP_POOL_TIMEOUT,
+    per_host=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+    max_keepalive=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    http2=settings.HTTP2_ENABLED,
+)
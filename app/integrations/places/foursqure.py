@@ -1,5 +1,7 @@
 from typing import List, Dict, Any, Optional, Tuple
 from .base import BasePlaceProvider
+from core.confing import settings
+from integrations.http import HttpClient, http_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -7,9 +9,12 @@ logger = logging.getLogger(__name__)
 class FoursquareProvider(BasePlaceProvider):
     """Интеграция с Foursquare API"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        self.api_key = api_key or "YOUR_FOURSQUARE_API_KEY"
-        self.base_url = "https://api.foursquare.com/v3"
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 client: Optional[HttpClient] = None):
+        self.api_key = api_key or settings.FOURSQUARE_API_KEY or "YOUR_FOURSQUARE_API_KEY"
+        # Без URL — заглушка; боевой https://api.foursquare.com/v3, офлайн — integrations.fake_server
+        self.base_url = base_url or settings.FOURSQUARE_API_URL
+        self.client = client or http_client
         self.headers = {
             "Authorization": self.api_key,
             "Accept": "application/json"
@@ -27,9 +32,16 @@ class FoursquareProvider(BasePlaceProvider):
         Документация: https://developer.foursquare.com/reference/places-search
         """
        
-        # Пока возвращаем заглушку для тестирования
         logger.info(f"Поиск мест Foursquare: {query}, location={location}")
-        
+
+        if self.base_url is not None:
+            params = {"query": query, "radius": radius, "limit": limit}
+            if location is not None:
+                params["ll"] = f"{location[0]},{location[1]}"
+            payload = await self.client.get_json(f"{self.base_url}/places/search", params=params, headers=self.headers)
+            return [self._from_search_result(item) for item in payload.get("results", [])]
+
+        # Пока возвращаем заглушку для тестирования
         return [
             {
                 "id": "fsq1",
@@ -59,6 +71,25 @@ class FoursquareProvider(BasePlaceProvider):
             }
         ]
     
+    def _from_search_result(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Ответ Places API v3 -> формат заглушки"""
+        location = item.get("location", {})
+        point = item.get("geocodes", {}).get("main", {})
+        return {
+            "id": item["fsq_id"],
+            "name": item["name"],
+            "categories": [category["name"].lower() for category in item.get("categories", [])],
+            "location": {
+                "address": location.get("address") or location.get("formatted_address"),
+                "lat": point.get("latitude"),
+                "lng": point.get("longitude")
+            },
+            # rating у Foursquare по шкале 10
+            "rating": round(item["rating"] / 2, 1) if item.get("rating") is not None else None,
+            "price_level": item.get("price", 0),
+            "source": "foursquare"
+        }
+
     async def get_place_details(
         self,
         place_id: str
@@ -0,0 +1,20 @@
+from typing import Dict
+
+from core.confing import settings
+from integrations.cache import CachedPlaceProvider, provider_cache
+from integrations.resilience import ResilientPlaceProvider, provider_policies
+
+from .base import BasePlaceProvider
+from .foursqure import FoursquareProvider
+
+
+def _wrap(name: str, provider: BasePlaceProvider) -> BasePlaceProvider:
+    if settings.RESILIENCE_ENABLED:
+        provider = ResilientPlaceProvider(provider, provider_policies.get(name))
+    return CachedPlaceProvider(name, provider, provider_cache, grid=settings.PROVIDER_CACHE_GRID_DEGREES)
+
+
+# Провайдеры мест по имени: кэш, затем автомат и адаптивный таймаут
+place_providers: Dict[str, BasePlaceProvider] = {
+    "foursquare": _wrap("foursquare", FoursquareProvider()),
+}
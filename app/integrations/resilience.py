@@ -0,0 +1,375 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.confing import settings
+from integrations.hotels.base import BaseHotelProvider
+from integrations.places.base import BasePlaceProvider
+
+logger = logging.getLogger(__name__)
+
+# Момент (loop.time()), после которого результат вызова уже никому не нужен —
+# например, дедлайн поиска по всем провайдерам. Политика обрывает вызов по нему
+# сама, на DEADLINE_MARGIN секунд раньше, и записывает это как таймаут
+call_deadline: ContextVar[Optional[float]] = ContextVar("call_deadline", default=None)
+DEADLINE_MARGIN = 0.01
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Провайдер отключён автоматом: вызов отклонён сразу, без запроса"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Провайдер {name} временно отключён, повтор через {retry_after:.1f} с")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class CircuitBreaker:
+    """Автомат по скользящему окну: ошибки и медленные вызовы за window секунд.
+
+    closed — вызовы идут; доля ошибок или медленных (дольше slow_call секунд)
+    не ниже порога при хотя бы min_calls вызовах в окне — open: вызовы
+    отклоняются сразу open_seconds секунд. Затем half_open: пропускаем
+    half_open_calls пробных вызовов; все успешны — closed, любая ошибка — open.
+    """
+
+    def __init__(self, name: str, window: float = 30.0, min_calls: int = 20, error_rate: float = 0.5,
+                 slow_call: float = 2.0, slow_rate: float = 0.5, open_seconds: float = 15.0,
+                 half_open_calls: int = 3, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call = slow_call
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.clock = clock
+        self.state = CLOSED
+        self._calls: deque[Tuple[float, bool, bool]] = deque()  # (время, ошибка, медленный)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.rejected = 0
+
+    def _trim(self, now: float):
+        while self._calls and self._calls[0][0] < now - self.window:
+            self._calls.popleft()
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self._opened_at = now
+        self.opened += 1
+        logger.warning(f"Автомат провайдера {self.name} разомкнут")
+
+    def before_call(self):
+        """Разрешить вызов или бросить CircuitOpenError"""
+        with self._lock:
+            now = self.clock()
+            if self.state == OPEN:
+                retry_after = self._opened_at + self.open_seconds - now
+                if retry_after > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, retry_after)
+                self.state = HALF_OPEN
+                self._probes = self._probe_successes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_calls:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, 0.0)
+                self._probes += 1
+
+    def record(self, ok: bool, elapsed: float):
+        with self._lock:
+            now = self.clock()
+            if self.state == HALF_OPEN:
+                if not ok:
+                    self._open(now)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_calls:
+                    self.state = CLOSED
+                    self._calls.clear()
+                return
+            if self.state == OPEN:
+                return
+
+            self._calls.append((now, not ok, elapsed >= self.slow_call))
+            self._trim(now)
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            errors = sum(1 for _, error, _ in self._calls if error)
+            slow = sum(1 for _, _, is_slow in self._calls if is_slow)
+            if errors / total >= self.error_rate or slow / total >= self.slow_rate:
+                self._open(now)
+
+    def release(self):
+        """Вызов отменён до результата: вернуть пробный слот half_open"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def reset(self):
+        with self._lock:
+            self.state = CLOSED
+            self._calls.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = self.clock()
+            self._trim(now)
+            total = len(self._calls)
+            errors = sum(1 for _, error, _ in self._calls if error)
+            slow = sum(1 for _, _, is_slow in self._calls if is_slow)
+            return {
+                "state": self.state,
+                "window_calls": total,
+                "error_rate": round(errors / total, 4) if total else 0.0,
+                "slow_rate": round(slow / total, 4) if total else 0.0,
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "retry_after": round(max(0.0, self._opened_at + self.open_seconds - now), 3)
+                if self.state == OPEN else 0.0,
+            }
+
+
+class ResiliencePolicy:
+    """Автомат, адаптивный таймаут и хеджирование для одного провайдера.
+
+    Таймаут — p95 успешных вызовов × timeout_multiplier в пределах
+    [min_timeout, max_timeout]; пока замеров меньше min_samples — max_timeout.
+    Хеджирование (только для идемпотентных чтений): если ответа нет дольше p95,
+    отправляем второй такой же запрос и берём первый успешный. Хеджей не
+    больше hedge_ratio от числа вызовов, чтобы при общей деградации не удвоить
+    нагрузку на провайдера.
+    """
+
+    def __init__(self, breaker: CircuitBreaker, timeout_multiplier: float = 2.0, min_timeout: float = 0.2,
+                 max_timeout: float = 5.0, min_samples: int = 20, max_samples: int = 200,
+                 hedge: bool = True, hedge_min_delay: float = 0.05, hedge_ratio: float = 0.1):
+        self.breaker = breaker
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_ratio = hedge_ratio
+        self._latencies: deque[float] = deque(maxlen=max_samples)
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @property
+    def name(self) -> str:
+        return self.breaker.name
+
+    def p95(self) -> Optional[float]:
+        if len(self._latencies) < self.min_samples:
+            return None
+        return _percentile(list(self._latencies), 0.95)
+
+    def timeout(self) -> float:
+        p95 = self.p95()
+        if p95 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p95 * self.timeout_multiplier))
+
+    def _hedge_delay(self) -> Optional[float]:
+        p95 = self.p95()
+        if p95 is None or self.hedges >= self.calls * self.hedge_ratio:
+            return None
+        return max(self.hedge_min_delay, p95)
+
+    async def _hedged(self, fn: Callable[[], Awaitable[Any]], delay: float) -> Any:
+        primary = asyncio.ensure_future(fn())
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        self.hedges += 1
+        hedge = asyncio.ensure_future(fn())
+        pending = {primary, hedge}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in (primary, hedge):
+                task.cancel()
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], hedge: bool = True) -> Any:
+        """fn — идемпотентное чтение: при hedge его можно вызвать дважды"""
+        self.breaker.before_call()
+        self.calls += 1
+        timeout = self.timeout()
+        deadline = call_deadline.get()
+        if deadline is not None:
+            remaining = deadline - asyncio.get_running_loop().time() - DEADLINE_MARGIN
+            if remaining > 0:
+                # Дедлайн вызывающего короче нашего таймаута: обрываем сами, чуть
+                # раньше него, чтобы зависший провайдер учёлся как таймаут
+                timeout = min(timeout, remaining)
+        delay = self._hedge_delay() if self.hedge and hedge else None
+        started = time.perf_counter()
+        try:
+            if delay is not None and delay < timeout:
+                result = await asyncio.wait_for(self._hedged(fn, delay), timeout)
+            else:
+                result = await asyncio.wait_for(fn(), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.failures += 1
+            self.breaker.record(False, time.perf_counter() - started)
+            raise
+        except asyncio.CancelledError:
+            # Отмена снаружи (клиент ушёл, остановка приложения) о здоровье
+            # провайдера ничего не говорит; дедлайн поиска сюда не доходит —
+            # он срабатывает раньше как наш собственный таймаут
+            self.breaker.release()
+            raise
+        except Exception:
+            self.failures += 1
+            self.breaker.record(False, time.perf_counter() - started)
+            raise
+
+        elapsed = time.perf_counter() - started
+        self._latencies.append(elapsed)
+        self.breaker.record(True, elapsed)
+        return result
+
+    def reset(self):
+        self.breaker.reset()
+        self._latencies.clear()
+
+    def stats(self) -> dict:
+        p95 = self.p95()
+        return {
+            **self.breaker.stats(),
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "p95_ms": round(p95 * 1000, 3) if p95 is not None else None,
+            "timeout_ms": round(self.timeout() * 1000, 3),
+        }
+
+
+class PolicyRegistry:
+    """Политики по имени провайдера; параметры по умолчанию — из настроек"""
+
+    def __init__(self):
+        self._policies: Dict[str, ResiliencePolicy] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> ResiliencePolicy:
+        with self._lock:
+            policy = self._policies.get(name)
+            if policy is None:
+                policy = self._policies[name] = ResiliencePolicy(
+                    CircuitBreaker(
+                        name,
+                        window=settings.BREAKER_WINDOW_SECONDS,
+                        min_calls=settings.BREAKER_MIN_CALLS,
+                        error_rate=settings.BREAKER_ERROR_RATE,
+                        slow_call=settings.BREAKER_SLOW_CALL_SECONDS,
+                        slow_rate=settings.BREAKER_SLOW_CALL_RATE,
+                        open_seconds=settings.BREAKER_OPEN_SECONDS,
+                        half_open_calls=settings.BREAKER_HALF_OPEN_CALLS,
+                    ),
+                    timeout_multiplier=settings.ADAPTIVE_TIMEOUT_MULTIPLIER,
+                    min_timeout=settings.ADAPTIVE_TIMEOUT_MIN_SECONDS,
+                    max_timeout=settings.ADAPTIVE_TIMEOUT_MAX_SECONDS,
+                    min_samples=settings.PROVIDER_LATENCY_MIN_SAMPLES,
+                    hedge=settings.HEDGE_ENABLED,
+                    hedge_min_delay=settings.HEDGE_MIN_DELAY_SECONDS,
+                    hedge_ratio=settings.HEDGE_MAX_RATIO,
+                )
+            return policy
+
+    def names(self) -> List[str]:
+        return list(self._policies)
+
+    def reset(self, name: str) -> bool:
+        policy = self._policies.get(name)
+        if policy is None:
+            return False
+        policy.reset()
+        return True
+
+    def clear(self):
+        with self._lock:
+            for policy in self._policies.values():
+                policy.reset()
+
+    def stats(self) -> dict:
+        return {name: policy.stats() for name, policy in list(self._policies.items())}
+
+
+class ResilientHotelProvider(BaseHotelProvider):
+    """Провайдер отелей за политикой устойчивости; все методы — идемпотентные чтения"""
+
+    def __init__(self, provider: BaseHotelProvider, policy: ResiliencePolicy):
+        self.provider = provider
+        self.policy = policy
+
+    async def search_hotels(self, city: str, check_in: str, check_out: str, guests: int = 2) -> List[Dict[str, Any]]:
+        return await self.policy.call(lambda: self.provider.search_hotels(city, check_in, check_out, guests))
+
+    async def get_hotel_details(self, hotel_id: str) -> Optional[Dict[str, Any]]:
+        return await self.policy.call(lambda: self.provider.get_hotel_details(hotel_id))
+
+    async def check_availability(self, hotel_id: str, check_in: str, check_out: str) -> bool:
+        return await self.policy.call(lambda: self.provider.check_availability(hotel_id, check_in, check_out))
+
+
+class ResilientPlaceProvider(BasePlaceProvider):
+    """Провайдер мест за политикой устойчивости"""
+
+    def __init__(self, provider: BasePlaceProvider, policy: ResiliencePolicy):
+        self.provider = provider
+        self.policy = policy
+
+    async def search_places(self, query: str, location: Optional[Tuple[float, float]] = None,
+                            radius: int = 1000, limit: int = 20) -> List[Dict[str, Any]]:
+        return await self.policy.call(lambda: self.provider.search_places(query, location, radius, limit))
+
+    async def get_place_details(self, place_id: str) -> Optional[Dict[str, Any]]:
+        return await self.policy.call(lambda: self.provider.get_place_details(place_id))
+
+    async def get_place_photos(self, photo_reference: str, max_width: int = 400) -> Optional[bytes]:
+        # Фото тяжёлые: второй параллельный запрос дороже выигрыша по задержке
+        return await self.policy.call(lambda: self.provider.get_place_photos(photo_reference, max_width),
+                                      hedge=False)
+
+    async def get_place_reviews(self, place_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return await self.policy.call(lambda: self.provider.get_place_reviews(place_id, limit))
+
+
+provider_policies = PolicyRegistry()
@@ -1,10 +1,22 @@
 from fastapi import FastAPI, HTTPException
-from core.database import init_db 
+from core.database import init_db, close_pool, pool_stats
+from core.async_database import db_executor
+from core.cache import response_cache
+from core.singleflight import single_flight_stats
+from core.hashing import password_hasher
+from core.rate_limit import login_rate_limiter
+from modules.auth.status import user_status_cache
+from modules.auth.jwt import verified_tokens
+from integrations.http import http_client
+from integrations.cache import provider_cache
+from integrations.hotels.registry import hotel_providers
 from fastapi.middleware.cors import CORSMiddleware
 from modules.hotels.api import router as hotels_router 
 from modules.places.api import router as places_router 
 from modules.reviews.api import router as reviews_router 
 from modules.auth.api import router as auth_router 
+from modules.export.api import router as export_router
+from modules.integrations.api import router as integrations_router
 from fastapi.responses import JSONResponse
 from fastapi.requests import Request
 
@@ -21,18 +33,44 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(hotels_router, prefix="/hotels", tags=["hotels"])
-app.include_router(places_router, prefix="/places", tags=["places"])
-app.include_router(reviews_router, prefix="/reviews", tags=["reviews"])
-app.include_router(auth_router, prefix="/auth", tags=["auth"])
+app.include_router(hotels_router)
+app.include_router(places_router)
+app.include_router(reviews_router)
+app.include_router(auth_router)
+app.include_router(export_router)
+app.include_router(integrations_router)
 
 
 @app.get("/health")
 def health():
     return {"status": "Ok"}
 
+@app.get("/health/db")
+def health_db():
+    return {"status": "Ok", "pool": pool_stats(), "executor": db_executor.stats()}
+
+@app.get("/health/cache")
+def health_cache():
+    return {"status": "Ok", "responses": response_cache.stats(), "single_flight": single_flight_stats()}
+
+@app.get("/health/auth")
+def health_auth():
+    return {"status": "Ok", "hashing": password_hasher.stats(), "user_status": user_status_cache.stats(),
+            "tokens": verified_tokens.stats(), "rate_limit": login_rate_limiter.stats()}
+
+@app.get("/health/integrations")
+def health_integrations():
+    return {
+        "status": "Ok",
+        "http": http_client.stats(),
+        "hotel_providers": hotel_providers.stats(),
+        "provider_cache": provider_cache.stats(),
+    }
+
 @app.on_event("startup")
 async def startup_event():
+    await http_client.start()
+    provider_cache.purge()
     print("Начало работы")
     
 init_db()
@@ -40,6 +78,11 @@ init_db()
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await http_client.aclose()
+    provider_cache.close()
+    password_hasher.shutdown()
+    db_executor.shutdown()
+    close_pool()
     print("Конец работы")    
     
 
@@ -48,6 +91,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
+        headers=exc.headers,
         )   
     
     
@@ -0,0 +1,91 @@
+"""Служебные команды. Запуск из каталога app/:
+
+    python manage.py import hotels data/hotels.ndjson
+    python manage.py import reviews reviews.csv --format csv --chunk-size 5000
+    python manage.py calibrate-bcrypt --target-ms 250
+    python manage.py purge-refresh-tokens
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from core.database import init_db
+
+
+def _import(args) -> int:
+    from modules.hotels.repository import HotelRepository
+    from modules.hotels.service import HotelService
+    from modules.places.repository import PlaceRepository
+    from modules.places.service import PlaceService
+    from modules.reviews.repository import ReviewRepository
+    from modules.reviews.service import ReviewService
+
+    importers = {
+        "hotels": lambda: HotelService(HotelRepository()).import_hotels,
+        "places": lambda: PlaceService(PlaceRepository()).import_places,
+        "reviews": lambda: ReviewService(ReviewRepository()).import_reviews,
+    }
+
+    path = Path(args.file)
+    fmt = args.format or ("csv" if path.suffix.lower() == ".csv" else "ndjson")
+
+    init_db()
+    with open(path, encoding="utf-8", newline="") as lines:
+        report = importers[args.entity]()(lines, fmt, args.chunk_size)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 1 if report["failed"] else 0
+
+
+def _calibrate_bcrypt(args) -> int:
+    from core.confing import settings
+    from core.hashing import calibrate, password_hasher
+
+    rounds, timings = calibrate(args.target_ms, args.min_rounds, args.max_rounds, args.samples)
+    for cost, ms in timings.items():
+        # Потолок входов в секунду: каждый вход — одна проверка bcrypt на ядро пула
+        ceiling = password_hasher.workers * 1000 / ms if ms else 0
+        marker = " <-" if cost == rounds else ""
+        print(f"rounds={cost:2d}  {ms:9.1f} мс  ~{ceiling:8.1f} входов/сек{marker}")
+
+    print(f"Текущее значение BCRYPT_ROUNDS={settings.BCRYPT_ROUNDS}, рекомендуемое BCRYPT_ROUNDS={rounds}")
+    print("Старые хэши пересчитаются при следующем входе пользователей")
+    return 0
+
+
+def _purge_refresh_tokens(args) -> int:
+    from modules.auth.repository import RefreshTokenRepository
+
+    init_db()
+    print(f"Удалено истёкших refresh токенов: {RefreshTokenRepository().purge_expired()}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="TravelCompanion: служебные команды")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Массовый импорт NDJSON/CSV")
+    import_parser.add_argument("entity", choices=["hotels", "places", "reviews"])
+    import_parser.add_argument("file", help="Путь к файлу NDJSON или CSV")
+    import_parser.add_argument("--format", choices=["ndjson", "csv"], help="По умолчанию — по расширению файла")
+    import_parser.add_argument("--chunk-size", type=int, default=1000)
+    import_parser.set_defaults(handler=_import)
+
+    calibrate_parser = commands.add_parser("calibrate-bcrypt", help="Подбор BCRYPT_ROUNDS под целевую задержку")
+    calibrate_parser.add_argument("--target-ms", type=float, default=250.0, help="Допустимое время одного хэша")
+    calibrate_parser.add_argument("--min-rounds", type=int, default=10)
+    calibrate_parser.add_argument("--max-rounds", type=int, default=16)
+    calibrate_parser.add_argument("--samples", type=int, default=3)
+    calibrate_parser.set_defaults(handler=_calibrate_bcrypt)
+
+    purge_parser = commands.add_parser("purge-refresh-tokens", help="Удалить истёкшие refresh-токены")
+    purge_parser.set_defaults(handler=_purge_refresh_tokens)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+import math
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Request
 from typing import List
 
 from modules.auth.schemas import (
@@ -8,6 +9,10 @@ from modules.auth.schemas import (
 from modules.auth.service import AuthService
 from modules.auth.repository import UserRepository
 from modules.auth.dependencies import get_current_user, check_admin
+from core.async_database import run_db
+from core.hashing import HashingBusyError
+from core.rate_limit import RateLimitExceeded, login_rate_limiter
+from shared.exceptions import TooManyRequestsException
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -16,49 +21,80 @@ def get_auth_service():
     return AuthService(repository)
 
 @router.post("/register", response_model=UserResponse)
-def register(
+async def register(
     user_data: UserCreate,
     service: AuthService = Depends(get_auth_service)
 ):
    
     try:
-        return service.register_user(user_data)
+        return await service.register_user(user_data)
+    except HashingBusyError as e:
+        raise TooManyRequestsException(str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail="Внутренняя ошибка сервера")
 
+@router.post("/users/bulk")
+async def bulk_register(
+    users: List[UserCreate] = Body(..., max_length=1000),
+    admin_user = Depends(check_admin),
+    service: AuthService = Depends(get_auth_service)
+):
+    """Регистрация пачки пользователей администратором; занятые email/username — в errors"""
+    try:
+        return await service.register_users(users)
+    except HashingBusyError as e:
+        raise TooManyRequestsException(str(e))
+
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     login_data: UserLogin,
+    request: Request,
+    background_tasks: BackgroundTasks,
     service: AuthService = Depends(get_auth_service)
 ):
    
     try:
-        return service.login_user(login_data)
+        # До похода в БД и bcrypt: перебор паролей не должен стоить нам CPU
+        login_rate_limiter.check(request.client.host if request.client else None, login_data.email)
+        return await service.login_user(login_data, background_tasks)
+    except RateLimitExceeded as e:
+        raise TooManyRequestsException(str(e), retry_after=math.ceil(e.retry_after))
+    except HashingBusyError as e:
+        raise TooManyRequestsException(str(e))
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
 
 @router.post("/refresh", response_model=Token)
-def refresh(
+async def refresh(
     token_data: RefreshTokenRequest,
     service: AuthService = Depends(get_auth_service)
 ):
    
     try:
-        return service.refresh_tokens(token_data.refresh_token)
+        return await run_db(service.refresh_tokens, token_data.refresh_token)
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
 
+@router.post("/logout-all")
+async def logout_all(
+    current_user: UserResponse = Depends(get_current_user),
+    service: AuthService = Depends(get_auth_service)
+):
+    
+    revoked = await run_db(service.revoke_refresh_tokens, current_user.id)
+    return {"revoked": revoked}
+
 @router.get("/me", response_model=UserResponse)
-def get_me(
+async def get_me(
     current_user: UserResponse = Depends(get_current_user)
 ):
     
     return current_user
 
 @router.get("/admin-test")
-def admin_test(
+async def admin_test(
     admin_user = Depends(check_admin)
 ):
 
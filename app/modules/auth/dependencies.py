@@ -5,10 +5,14 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from modules.auth.jwt import verify_token
 from modules.auth.service import AuthService
 from modules.auth.repository import UserRepository
+from core.async_database import run_db
+from core.confing import settings
+from core.cache import MISS
+from modules.auth.status import user_status_cache
 
 security_scheme = HTTPBearer()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security_scheme)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security_scheme)):
     
     token = credentials.credentials
     
@@ -32,7 +36,13 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     service = AuthService(repository) 
     
     try:
-        user = service.get_current_user(user_id) 
+        # В stateless-режиме профиль берём из токена; старые токены без username — обычным путём
+        if settings.AUTH_MODE == "stateless" and "username" in payload:
+            active = user_status_cache.get(user_id)
+            if active is MISS:
+                active = await run_db(service.load_user_status, user_id)
+            return service.user_from_claims(payload, active)
+        user = await run_db(service.get_current_user, user_id)
         return user
     except ValueError as e:
         raise HTTPException(
@@ -40,7 +50,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             detail=str(e)
         ) 
         
-def check_admin(current_user = Depends(get_current_user)):
+async def check_admin(current_user = Depends(get_current_user)):
     
     if not current_user.is_admin:
         raise HTTPException(
@@ -1,10 +1,68 @@
 import jwt
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict
+from core.cache import MISS, MemoryCache
 from core.confing import settings
 
-def create_tokens(user_data: Dict) -> Dict[str, str]:
-    access_expire = datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_EXPIRE_MINUTES)
+
+class VerifiedTokenCache:
+    """Уже проверенные токены: digest токена -> payload до момента exp.
+
+    Один и тот же bearer-токен приходит сотни раз в минуту; без кэша каждый
+    запрос заново считает HMAC и разбирает JSON. Храним только успешно
+    проверенные токены, ключ — sha256, а не сам токен.
+    """
+
+    def __init__(self, max_entries: int, enabled: bool = True):
+        self.enabled = enabled
+        self._backend = MemoryCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Dict | None:
+        payload = self._backend.get(self._key(token))
+        with self._lock:
+            if payload is MISS:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return dict(payload)
+
+    def set(self, token: str, payload: Dict):
+        ttl = payload.get("exp", 0) - time.time()
+        if ttl > 0:
+            self._backend.set(self._key(token), dict(payload), ttl)
+
+    def clear(self):
+        self._backend.clear()
+
+    def stats(self) -> dict:
+        total = self._hits + self._misses
+        backend = self._backend.stats()
+        return {
+            "enabled": self.enabled,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / total, 4) if total else 0.0,
+            "entries": backend["entries"],
+            "evictions": backend["evictions"],
+            "expirations": backend["expirations"],
+        }
+
+
+verified_tokens = VerifiedTokenCache(settings.JWT_VERIFY_CACHE_MAX_ENTRIES, settings.JWT_VERIFY_CACHE_ENABLED)
+
+
+def create_tokens(user_data: Dict, refresh_claims: Optional[Dict] = None) -> Dict[str, str]:
+    access_expire = datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
     
     access_payload = {
         **user_data,
@@ -18,6 +76,7 @@ def create_tokens(user_data: Dict) -> Dict[str, str]:
     )
     
     refresh_payload = {
+        **(refresh_claims or {}),
         "user_id": user_data["user_id"],
         "exp": refresh_expire,
         "iat": datetime.utcnow(),
@@ -27,13 +86,13 @@ def create_tokens(user_data: Dict) -> Dict[str, str]:
     access_token = jwt.encode(
         access_payload,
         settings.JWT_SECRET_KEY,
-        algorithm=settings.JWT_ALGORITM
+        algorithm=settings.JWT_ALGORITHM
     )
     
     refresh_token = jwt.encode(
         refresh_payload,
         settings.JWT_SECRET_KEY,
-        algorithm=settings.JWT_ALGORITM 
+        algorithm=settings.JWT_ALGORITHM 
     )
     
     return {
@@ -42,13 +101,20 @@ def create_tokens(user_data: Dict) -> Dict[str, str]:
         "token_type": "bearer"
     }
     
+def create_access_token(user_data: Dict) -> str:
+    return create_tokens({"email": None, "is_admin": False, **user_data})["access_token"]
+    
 def verify_token(token: str, token_type: str = "access") -> Optional[Dict]:
     try:
-        paylaod = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM]
-        )    
+        paylaod = verified_tokens.get(token) if verified_tokens.enabled else None
+        if paylaod is None:
+            paylaod = jwt.decode(
+                token,
+                settings.JWT_SECRET_KEY,
+                algorithms=[settings.JWT_ALGORITHM]
+            )    
+            if verified_tokens.enabled:
+                verified_tokens.set(token, paylaod)
         
         if paylaod.get("type") != token_type:
             return None
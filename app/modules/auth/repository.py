@@ -1,175 +1,266 @@
-from passlib.context import CryptContext
 from modules.auth.models import User
-from modules.auth.schemas import UserCreate
 import sqlite3
-from core.database import DB_PATH
+import time
+from core.database import build_update_set, get_connection
 import logging  
 
 logger = logging.getLogger(__name__)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+USER_COLUMNS = User.select_list()
+UPDATABLE_COLUMNS = ("email", "username", "hashed_password")
 
 class UserRepository: 
-    def __init__(self):
-        self.pwd_context = pwd_context
     
+    def _unique_violation(self, error: sqlite3.IntegrityError, username: str | None, email: str | None) -> ValueError:
+        """UNIQUE-ограничения таблицы -> прежние сообщения об ошибке"""
+        message = str(error)
+        if "users.username" in message:
+            return ValueError(f"Имя пользователя {username} уже занято")
+        if "users.email" in message:
+            return ValueError(f"Email {email} уже используется")
+        raise error
     
-    def create_user(self, user_data: UserCreate) -> User:
-        sql = """INSERT INTO  users(username, email, hashed_password) VALUES(?, ?, ?)"""
-        try: 
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            if self.get_by_username(user_data.username):
-                raise ValueError(f"Имя пользователя {user_data.username} уже занято")    
-            if self.get_by_email(user_data.email):
-                raise ValueError(f"Email {user_data.email} уже используется")        
-            
-            hashed_password = self.pwd_context.hash(user_data.password)
+    def create_user(self, user_data: User) -> User:
+        """Пароль уже захэширован сервисом — здесь только запись.
 
-            cursor.execute(sql, (user_data.username, user_data.email, hashed_password))
-            user_id = cursor.lastrowid
-            
-            cursor.execute("SELECT created_at From users WHERE id =?", (user_id,))
-            created_at_row = cursor.fetchone()
-            created_at = created_at_row[0] if created_at_row else "" 
-        
+        Занятость email и username проверяют UNIQUE-ограничения в том же INSERT:
+        один запрос и никакой гонки между проверкой и вставкой.
+        """
+        sql = """INSERT INTO  users(username, email, hashed_password) VALUES(?, ?, ?) RETURNING id, created_at"""
+
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute(sql, (user_data.username, user_data.email, user_data.hashed_password))
+                user_id, created_at = cursor.fetchone()
+
+        except sqlite3.IntegrityError as e:
+            raise self._unique_violation(e, user_data.username, user_data.email)
         except sqlite3.Error as e:
             logger.error(f"Ошибка бд в создание пользователя: {e}")
-            if conn:
-                conn.rollback()
             raise e
-        finally:
-            if conn:
-                conn.close()
         
         return User(
             id=user_id,
             username=user_data.username,
             email=user_data.email,
-            hashed_password=hashed_password,
+            hashed_password=user_data.hashed_password,
             created_at=created_at,
             deleted_at=None
         )               
         
+    def create_users(self, users: list[User]) -> list[User | ValueError]:
+        """Пакетная регистрация в одной транзакции.
+
+        Нарушение UNIQUE откатывает только свой INSERT (ABORT в SQLite),
+        поэтому остальные строки пачки записываются; на месте отклонённых — ValueError.
+        """
+        sql = """INSERT INTO  users(username, email, hashed_password) VALUES(?, ?, ?) RETURNING id, created_at"""
+        results: list[User | ValueError] = []
+
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+
+                for user_data in users:
+                    try:
+                        cursor.execute(sql, (user_data.username, user_data.email, user_data.hashed_password))
+                    except sqlite3.IntegrityError as e:
+                        results.append(self._unique_violation(e, user_data.username, user_data.email))
+                        continue
+                    user_id, created_at = cursor.fetchone()
+                    results.append(User(
+                        id=user_id,
+                        username=user_data.username,
+                        email=user_data.email,
+                        hashed_password=user_data.hashed_password,
+                        created_at=created_at
+                    ))
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка бд в пакетной регистрации: {e}")
+            raise e
+
+        return results
+        
     def get_by_id(self, user_id: int) -> User | None:
-        sql = """SELECT * FROM users where id = ?"""
+        sql = f"""SELECT {USER_COLUMNS} FROM users where id = ?"""
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute(sql,(user_id,))
-            row = cursor.fetchone()
-            if row is None:
-                return None 
-            
-            user = User(id=row[0], username=row[1], email=row[2], hashed_password=row[3])
-            
-            return user
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = User.row_factory
+
+                cursor.execute(sql,(user_id,))
+                return cursor.fetchone()
         except sqlite3.Error as e:
             logger.error(f"Ошибка в базе: {e}")
             raise e
-        finally:
-            if conn:
-                conn.close()
             
         
-    def get_by_email(self, email: str) -> User | None:
-        sql = """SELECT * FROM users WHERE email = ? AND deleted_at IS NULL"""
+    def is_active(self, user_id: int) -> bool | None:
+        """Только статус, без хэша и профиля; None — пользователя нет"""
+        sql = """SELECT is_active, deleted_at FROM users WHERE id = ?"""
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute(sql, (user_id,))
+                row = cursor.fetchone()
 
-        try: 
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute(sql,(email,))
-            row = cursor.fetchone()
-            
             if row is None:
                 return None
-            
-            return User.from_db_row(row)
+
+            return bool(row[0]) and row[1] is None
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка в базе при проверке статуса: {e}")
+            raise e
         
+    def get_by_email(self, email: str) -> User | None:
+        sql = f"""SELECT {USER_COLUMNS} FROM users WHERE email = ? AND deleted_at IS NULL"""
+
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = User.row_factory
+
+                cursor.execute(sql,(email,))
+                return cursor.fetchone()
+
         except sqlite3.Error as e:
             logger.error(f"Ошибка в базе по email: {e}")
-            raise e
-        finally:
-            if conn:
-                conn.close()    
+            raise e    
             
     def get_by_username(self, username: str) -> User | None:
-        sql = """SELECT * FROM users WHERE username = ? AND deleted_at IS NULL"""
+        sql = f"""SELECT {USER_COLUMNS} FROM users WHERE username = ? AND deleted_at IS NULL"""
+
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = User.row_factory
+
+                cursor.execute(sql,(username,))
+                return cursor.fetchone()
 
-        try: 
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute(sql,(username,))
-            row = cursor.fetchone()
-            
-            if row is None:
-                return None
-            
-            return User.from_db_row(row)
-        
         except sqlite3.Error as e:
             logger.error(f"Ошибка в базе по username: {e}")
-            raise e
-        finally:
-            if conn:
-                conn.close()  
+            raise e  
         
     
     def update_user(self, user_id: int, update_data: dict) -> User | None:
+        """Одним UPDATE ... RETURNING и только по переданным полям"""
+        assignments, params = build_update_set(update_data, UPDATABLE_COLUMNS)
+        if not assignments:
+            return self.get_by_id(user_id)
+
+        sql = f"""UPDATE users SET {assignments} WHERE id = ? AND deleted_at IS NULL RETURNING {USER_COLUMNS}"""
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = User.row_factory
+
+                cursor.execute(sql, (*params, user_id))
+                return cursor.fetchone()
+
+        except sqlite3.IntegrityError as e:
+            raise self._unique_violation(e, update_data.get("username"), update_data.get("email"))
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка БД при обновлении пользователя: {e}")
+            raise e
         
-        current_user = self.get_by_id(user_id)
-        
-        if current_user is None:
-            return None
-        
-        updated_email = update_data.get("email", current_user.email)
-        updated_username = update_data.get("username", current_user.username)
-        updated_hashed_password = update_data.get("hashed_password", current_user.hashed_password)
-        
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        sql = """UPDATE users SET email = ?, username = ?, hashed_password = ? WHERE id = ?""" 
-        cursor.execute(sql, (updated_email, updated_username, updated_hashed_password, user_id))
-        
-        conn.commit()
-        conn.close()
-        
-        return User(
-            id=user_id,
-            username=updated_username,
-            email=updated_email,
-            hashed_password=updated_hashed_password
-        )
+    def update_password_hash(self, user_id: int, old_hash: str, new_hash: str) -> bool:
+        """Замена хэша, только если пароль не поменяли, пока считался новый хэш"""
+        sql = "UPDATE users SET hashed_password = ? WHERE id = ? AND hashed_password = ?"
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(sql, (new_hash, user_id, old_hash))
+
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка БД при обновлении хэша пароля: {e}")
+            raise e
         
     def delete_user(self, user_id: int) -> bool:
-        current_user = self.get_by_id(user_id) 
-        
-        if current_user is None:
-            return False
-        
+        sql = "UPDATE users SET deleted_at = CURRENT_TIMESTAMP WHERE id = ? AND deleted_at IS NULL RETURNING id"
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            sql = "UPDATE users SET deleted_at = CURRENT_TIMESTAMP WHERE id = ?"
-            cursor.execute(sql,(user_id,)) 
-            
-            conn.commit()
-            return cursor.rowcount > 0
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(sql,(user_id,))
+                row = cursor.fetchone()
+
+            return row is not None
         except sqlite3.Error as e:
             logger.error(f"Ошибка БД при удалении пользователя: {e}")
-            if conn:
-                conn.rollback()
             raise e
-        finally:
-            if conn:
-                conn.close()    
-        
-    
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return self.pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+
+
+class RefreshTokenRepository:
+    """refresh-токены по jti: каждая проверка — постоянное число поисков по первичному ключу"""
+
+    ROTATED = "rotated"
+    REUSED = "reused"
+    REVOKED = "revoked"
+
+    def add(self, jti: str, user_id: int, family_id: str, expires_at: float):
+        sql = "INSERT INTO refresh_tokens (jti, user_id, family_id, expires_at) VALUES(?, ?, ?, ?)"
+        try:
+            with get_connection() as conn:
+                conn.execute(sql, (jti, user_id, family_id, expires_at))
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка БД при сохранении refresh токена: {e}")
+            raise e
+
+    def rotate(self, jti: str, new_jti: str, user_id: int, family_id: str, expires_at: float) -> str:
+        """Заменяем токен новым в одной транзакции.
+
+        Если jti уже был заменён — это повторное использование украденного
+        или устаревшего токена: отзываем всю цепочку (family_id).
+        """
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute(
+                    """UPDATE refresh_tokens SET replaced_by = ?
+                    WHERE jti = ? AND user_id = ? AND replaced_by IS NULL AND revoked = 0 AND expires_at > ?""",
+                    (new_jti, jti, user_id, time.time()),
+                )
+                if cursor.rowcount == 1:
+                    cursor.execute(
+                        "INSERT INTO refresh_tokens (jti, user_id, family_id, expires_at) VALUES(?, ?, ?, ?)",
+                        (new_jti, user_id, family_id, expires_at),
+                    )
+                    return self.ROTATED
+
+                cursor.execute("SELECT replaced_by, revoked FROM refresh_tokens WHERE jti = ?", (jti,))
+                row = cursor.fetchone()
+                if row is not None and row[0] is not None and not row[1]:
+                    cursor.execute("UPDATE refresh_tokens SET revoked = 1 WHERE family_id = ?", (family_id,))
+                    return self.REUSED
+                return self.REVOKED
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка БД при ротации refresh токена: {e}")
+            raise e
+
+    def revoke_user(self, user_id: int) -> int:
+        """Отзываем все refresh-токены пользователя"""
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("UPDATE refresh_tokens SET revoked = 1 WHERE user_id = ? AND revoked = 0", (user_id,))
+
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка БД при отзыве refresh токенов: {e}")
+            raise e
+
+    def purge_expired(self) -> int:
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM refresh_tokens WHERE expires_at <= ?", (time.time(),))
+
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка БД при очистке refresh токенов: {e}")
+            raise e
@@ -118,6 +118,7 @@ class UserResponse(UserBase):
     """Модель для ответа с данными пользователя"""
     id: int
     is_active: bool = True
+    is_admin: bool = False
     is_superuser: bool = False
     created_at: datetime
     updated_at: Optional[datetime] = None
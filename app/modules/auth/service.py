@@ -1,30 +1,36 @@
-import bcrypt 
 import logging 
+import time
+import uuid
+from fastapi import BackgroundTasks
 from modules.auth.models import User 
 from modules.auth.schemas import UserCreate, UserLogin, Token, UserResponse
-from modules.auth.repository import UserRepository
+from modules.auth.repository import UserRepository, RefreshTokenRepository
 from modules.auth.jwt import create_tokens, verify_token
+from core.async_database import run_db
+from core.hashing import password_hasher
+from shared.bulk import BulkImportReport
+from modules.auth.status import user_status_cache, revoked_tokens
+from core.confing import settings
 
 logger = logging.getLogger(__name__)
 
+# Хэш-заглушка для выравнивания времени входа по несуществующему email; читать через AuthService._dummy_hash()
+_DUMMY_HASH: str | None = None
+
 class AuthService:
-    def __init__(self, repository: UserRepository):
+    def __init__(self, repository: UserRepository, token_repository: RefreshTokenRepository | None = None):
         self.repository = repository
+        self.token_repository = token_repository or RefreshTokenRepository()
         
-    def _hash_password(self, password: str) -> str:
-        salt = bcrypt.gensalt(rounds=12)
-        hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
-        return hashed.decode('utf-8')
+    async def _hash_password(self, password: str) -> str:
+        return await password_hasher.hash(password)
     
-    def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(
-            plain_password.encode('utf-8'),
-            hashed_password.encode('utf-8')
-        )
+    async def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await password_hasher.verify(plain_password, hashed_password)
     
-    def register_user(self, user_data: UserCreate) -> UserResponse:
+    async def register_user(self, user_data: UserCreate) -> UserResponse:
         
-        hashed_password = self._hash_password(user_data.password) 
+        hashed_password = await self._hash_password(user_data.password) 
         
         user = User(
             id=0,
@@ -35,7 +41,7 @@ class AuthService:
             is_admin=False
         )   
         
-        created_user = self.repository.create_user(user)
+        created_user = await run_db(self.repository.create_user, user)
         
         return UserResponse(
             id=created_user.id,
@@ -43,9 +49,90 @@ class AuthService:
             email=created_user.email,
             is_active=created_user.is_active,
             is_admin=created_user.is_admin,
-            created_at=created_user.created_at.isoformat()
+            created_at=created_user.created_at
         )
         
+    async def register_users(self, users: list[UserCreate]) -> dict:
+        """Пакетная регистрация для администратора: хэши параллельно в пуле, запись одной транзакцией"""
+        report = BulkImportReport()
+        report.total = len(users)
+        
+        hashes = await password_hasher.hash_many([user_data.password for user_data in users])
+        results = await run_db(self.repository.create_users, [
+            User(id=0, username=user_data.username, email=user_data.email, hashed_password=hashed_password)
+            for user_data, hashed_password in zip(users, hashes)
+        ])
+        
+        for offset, result in enumerate(results):
+            if isinstance(result, ValueError):
+                report.add_error(offset, str(result))
+            else:
+                report.inserted += 1
+        
+        report.finish()
+        logger.info(f"Пакетная регистрация: {report.inserted}/{report.total}, {report.rows_per_sec} регистраций/сек")
+        return report.to_dict()
+        
+    async def _dummy_hash(self) -> str:
+        global _DUMMY_HASH
+        if _DUMMY_HASH is None or password_hasher.needs_rehash(_DUMMY_HASH):
+            _DUMMY_HASH = await self._hash_password("dummy-password")
+        return _DUMMY_HASH
+        
+    def _claims(self, user: User) -> dict:
+        """Всё, что нужно для UserResponse, — в режиме stateless профиль берётся из токена"""
+        return {
+            "user_id": user.id,
+            "email": user.email,
+            "username": user.username,
+            "is_admin": user.is_admin,
+            "created_at": str(user.created_at)
+        }
+        
+    def load_user_status(self, user_id: int) -> bool:
+        """Статус из БД в кэш; вызывается только при промахе кэша"""
+        active = self.repository.is_active(user_id)
+        if active is None:
+            raise ValueError(f"Пользователь с {user_id} не найден")
+        user_status_cache.set(user_id, active)
+        return active
+        
+    def user_from_claims(self, payload: dict, active: bool) -> UserResponse:
+        """Пользователь из подписанных claims, без обращения к БД"""
+        if not active:
+            raise ValueError("Пользователь неактивирован")
+        
+        return UserResponse(
+            id=payload["user_id"],
+            email=payload["email"],
+            username=payload["username"],
+            is_active=True,
+            is_admin=payload.get("is_admin", False),
+            created_at=payload["created_at"]
+        )
+        
+    def delete_user(self, user_id: int) -> bool:
+        deleted = self.repository.delete_user(user_id)
+        if deleted:
+            user_status_cache.revoke(user_id)
+            self.revoke_refresh_tokens(user_id)
+        return deleted
+        
+    def revoke_refresh_tokens(self, user_id: int) -> int:
+        """Выход со всех устройств: ни один выданный refresh-токен больше не примут"""
+        revoked_tokens.revoke_user(user_id)
+        return self.token_repository.revoke_user(user_id)
+        
+    def _refresh_expires_at(self) -> float:
+        return time.time() + settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS * 86400
+        
+    def _issue_tokens(self, user: User) -> Token:
+        """Новая цепочка refresh-токенов при входе"""
+        jti, family_id = uuid.uuid4().hex, uuid.uuid4().hex
+        tokens = create_tokens(self._claims(user), {"jti": jti, "fam": family_id})
+        self.token_repository.add(jti, user.id, family_id, self._refresh_expires_at())
+        return Token(**tokens)
+        
     def get_current_user(self, user_id: int) -> UserResponse:   
         user = self.repository.get_by_id(user_id) 
         
@@ -61,16 +148,27 @@ class AuthService:
             username=user.username,
             is_active=user.is_active,
             is_admin=user.is_admin,
-            created_at=user.created_at.isoformat()
+            created_at=user.created_at
         )
         
         
-    def login_user(self, login_data: UserLogin) -> Token:
-        user = self.repository.get_by_email(login_data.email)
+    async def _rehash_password(self, user: User, password: str):
+        """Пересчёт хэша с текущей BCRYPT_ROUNDS после успешного входа"""
+        try:
+            new_hash = await self._hash_password(password)
+            if await run_db(self.repository.update_password_hash, user.id, user.hashed_password, new_hash):
+                password_hasher.record_rehash()
+                logger.info(f"Хэш пароля пользователя {user.id} пересчитан с новой стоимостью")
+        except Exception as e:
+            # Не критично: попробуем при следующем входе
+            logger.warning(f"Не удалось пересчитать хэш пользователя {user.id}: {e}")
+        
+    async def login_user(self, login_data: UserLogin, background_tasks: BackgroundTasks | None = None) -> Token:
+        user = await run_db(self.repository.get_by_email, login_data.email)
         
-        fake_hash = "$5b$34$XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX"
-        hash_to_check = user.hashed_password if user else fake_hash
-        password_correct = self._verify_password(login_data.password, hash_to_check)
+        # Для несуществующего email тоже гоняем bcrypt, чтобы время ответа не выдавало, есть ли пользователь
+        hash_to_check = user.hashed_password if user else await self._dummy_hash()
+        password_correct = await self._verify_password(login_data.password, hash_to_check)
         
         if not user or not password_correct:
             raise ValueError("Неверный email или пароль")
@@ -78,17 +176,12 @@ class AuthService:
         if not user.is_active:
             raise ValueError("Пользователь неактивирован")
         
-        user_data = {
-            "user_id": user.id,
-            "email": user.email,
-            "is_admin": user.is_admin
-        }
-        
-        tokens = create_tokens(user_data) 
+        if background_tasks is not None and password_hasher.needs_rehash(user.hashed_password):
+            background_tasks.add_task(self._rehash_password, user, login_data.password)
         
-        return Token(**tokens) 
+        return await run_db(self._issue_tokens, user)
     
-    def resrefh_tokens(self, refresh_token: str) -> Token:
+    def refresh_tokens(self, refresh_token: str) -> Token:
         
         payload = verify_token(refresh_token, token_type="refresh")
         
@@ -99,6 +192,13 @@ class AuthService:
         if not user_id:
             raise ValueError("Токен не содержит used_id")
         
+        jti, family_id = payload.get("jti"), payload.get("fam")
+        if not jti or not family_id:
+            raise ValueError("Refresh токен устарел, войдите заново")
+        
+        if revoked_tokens.is_revoked(payload):
+            raise ValueError("Refresh токен отозван")
+        
         user =self.repository.get_by_id(user_id)
         
         if not user:
@@ -107,12 +207,17 @@ class AuthService:
         if not user.is_active:
             raise ValueError("Пользователь неактивирован")
         
-        user_data = {
-            "user_id": user.id,
-            "email": user.email,
-            "is_admin": user.is_admin
-        }
+        new_jti = uuid.uuid4().hex
+        result = self.token_repository.rotate(jti, new_jti, user_id, family_id, self._refresh_expires_at())
+        
+        if result == RefreshTokenRepository.REUSED:
+            revoked_tokens.revoke_family(family_id)
+            logger.warning(f"Повторное использование refresh токена пользователя {user_id}, цепочка отозвана")
+            raise ValueError("Refresh токен уже использован, все сессии этой цепочки отозваны")
+        
+        if result != RefreshTokenRepository.ROTATED:
+            raise ValueError("Refresh токен отозван")
         
-        tokens = create_tokens(user_data) 
+        tokens = create_tokens(self._claims(user), {"jti": new_jti, "fam": family_id}) 
         
         return Token(**tokens)
\ No newline at end of file
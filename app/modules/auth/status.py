@@ -0,0 +1,104 @@
+import threading
+import time
+
+from core.cache import MISS, MemoryCache
+from core.confing import settings
+
+
+class UserStatusCache:
+    """Активен ли пользователь — для режима AUTH_MODE=stateless.
+
+    Токен сам несёт user_id, email и is_admin, поэтому в БД ходим только
+    за статусом и не чаще раза в TTL на пользователя. Отключение или удаление
+    пользователя должно вызывать revoke(): до истечения TTL его токены
+    иначе продолжат приниматься.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self._backend = MemoryCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._revocations = 0
+
+    def get(self, user_id: int) -> bool | object:
+        """True/False или MISS"""
+        value = self._backend.get(str(user_id))
+        with self._lock:
+            if value is MISS:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def set(self, user_id: int, active: bool):
+        self._backend.set(str(user_id), active, self.ttl)
+
+    def revoke(self, user_id: int):
+        """Хук отключения: токены пользователя отклоняются сразу.
+
+        Запись живёт весь срок access-токена; после неё статус снова читается из БД.
+        """
+        self._backend.set(str(user_id), False, settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+        with self._lock:
+            self._revocations += 1
+
+    def invalidate(self, user_id: int):
+        """Хук повторной активации: следующий запрос перечитает статус из БД"""
+        self._backend.delete(str(user_id))
+
+    def clear(self):
+        self._backend.clear()
+
+    def stats(self) -> dict:
+        total = self._hits + self._misses
+        return {
+            "ttl": self.ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / total, 4) if total else 0.0,
+            "revocations": self._revocations,
+            "entries": self._backend.stats()["entries"],
+        }
+
+
+user_status_cache = UserStatusCache(settings.AUTH_USER_STATUS_TTL_SECONDS, settings.AUTH_USER_STATUS_MAX_ENTRIES)
+
+
+class RevokedTokens:
+    """Отозванные цепочки refresh-токенов и момент отзыва по пользователю.
+
+    Быстрый отказ без похода в БД; источник истины — таблица refresh_tokens,
+    поэтому после перезапуска процесса набор можно начинать с нуля.
+    Записи живут не дольше refresh-токена.
+    """
+
+    def __init__(self, max_entries: int):
+        self._backend = MemoryCache(max_entries=max_entries)
+
+    @property
+    def _ttl(self) -> float:
+        return settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+    def revoke_family(self, family_id: str):
+        self._backend.set(f"family:{family_id}", True, self._ttl)
+
+    def revoke_user(self, user_id: int):
+        self._backend.set(f"user:{user_id}", int(time.time()), self._ttl)
+
+    def is_revoked(self, payload: dict) -> bool:
+        if self._backend.get(f"family:{payload.get('fam')}") is not MISS:
+            return True
+        revoked_at = self._backend.get(f"user:{payload.get('user_id')}")
+        # Токены, выпущенные в ту же секунду, что и отзыв, добивает проверка в БД
+        return revoked_at is not MISS and payload.get("iat", 0) < revoked_at
+
+    def clear(self):
+        self._backend.clear()
+
+    def stats(self) -> dict:
+        return {"entries": self._backend.stats()["entries"]}
+
+
+revoked_tokens = RevokedTokens(settings.AUTH_USER_STATUS_MAX_ENTRIES)
@@ -0,0 +1,45 @@
+from datetime import datetime
+from enum import Enum
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from .service import ExportService
+from .repository import ExportRepository
+from shared.serialization import fast_json_enabled
+from shared.utils import accepts_encoding
+
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+class ExportTable(str, Enum):
+    HOTELS = "hotels"
+    PLACES = "places"
+    REVIEWS = "reviews"
+
+
+def get_export_service():
+    repository = ExportRepository()
+    return ExportService(repository)
+
+@router.get("/{table}")
+async def export_table(
+    table: ExportTable,
+    request: Request,
+    since: datetime | None = Query(None, description="Только записи с created_at >= since (UTC)"),
+    gzip: bool = Query(False, description="Сжимать gzip независимо от Accept-Encoding"),
+    batch_size: int = Query(1000, ge=1, le=10000, description="Строк на один fetchmany"),
+    service: ExportService = Depends(get_export_service)
+):
+    """Потоковая выгрузка таблицы в NDJSON"""
+    compress = gzip or accepts_encoding(request.headers.get("accept-encoding", ""), "gzip")
+    headers = {"Content-Disposition": f'attachment; filename="{table.value}.ndjson"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        service.stream_ndjson(table.value, since, compress, batch_size, fast=fast_json_enabled("export")),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
@@ -0,0 +1,46 @@
+import sqlite3
+import logging
+from typing import Iterator
+
+from core.database import read_only_connection
+
+logger = logging.getLogger(__name__)
+
+# Выгружаемые таблицы и их колонки; users не выгружаем — там хэши паролей
+EXPORT_COLUMNS = {
+    "hotels": ("id", "name", "address", "rating", "created_at"),
+    "places": ("id", "name", "type", "address", "rating", "created_at"),
+    "reviews": ("id", "hotel_id", "place_id", "user_id", "text", "rating", "created_at"),
+}
+
+
+class ExportRepository:
+    def iter_rows(self, table: str, since: str | None = None, batch_size: int = 1000) -> Iterator[list[dict]]:
+        """Серверный курсор: отдаём строки пачками через fetchmany, не держа таблицу в памяти.
+
+        Читаем через отдельное read-only соединение, а не из пула: скорость
+        выгрузки задаёт клиент, и медленные скачивания не должны занимать пул.
+        """
+        columns = EXPORT_COLUMNS[table]
+        sql = f"SELECT {', '.join(columns)} FROM {table}"
+        params: tuple = ()
+        if since is not None:
+            # Идёт по индексу idx_<table>_created (created_at, id)
+            sql += " WHERE created_at >= ? ORDER BY created_at, id"
+            params = (since,)
+        else:
+            sql += " ORDER BY id"
+
+        try:
+            with read_only_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(sql, params)
+
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield [dict(zip(columns, row)) for row in rows]
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка в базе при выгрузке {table}: {e}")
+            raise e
@@ -0,0 +1,43 @@
+import json
+import zlib
+from datetime import datetime, timezone
+from typing import Iterator
+
+from modules.export.repository import ExportRepository, EXPORT_COLUMNS
+from shared.serialization import dump_ndjson
+from shared.utils import format_datetime
+
+
+class ExportService:
+    def __init__(self, repository: ExportRepository):
+        self.repository = repository
+
+    def stream_ndjson(self, table: str, since: datetime | None = None,
+                      compress: bool = False, batch_size: int = 1000, fast: bool = False) -> Iterator[bytes]:
+        """NDJSON по пачкам; при compress=True — gzip на лету, по одной пачке за раз.
+
+        fast=True — пачка кодируется pydantic-core без пробелов после разделителей;
+        после разбора строки те же, что у json.dumps.
+        """
+        if table not in EXPORT_COLUMNS:
+            raise ValueError(f"Таблица {table} недоступна для выгрузки")
+
+        # created_at в SQLite хранится в UTC как 'YYYY-MM-DD HH:MM:SS'; время без пояса считаем UTC
+        if since is not None and since.tzinfo is not None:
+            since = since.astimezone(timezone.utc)
+        since_str = format_datetime(since) if since else None
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+        for rows in self.repository.iter_rows(table, since_str, batch_size):
+            if fast:
+                chunk = dump_ndjson(rows)
+            else:
+                chunk = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+            if compressor:
+                chunk = compressor.compress(chunk)
+                if not chunk:
+                    continue
+            yield chunk
+
+        if compressor:
+            yield compressor.flush()
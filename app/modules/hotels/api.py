@@ -1,7 +1,16 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from .schemas import HotelCreate, HotelUpdate, HotelResponse
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from .schemas import HotelCreate, HotelUpdate, HotelResponse, HotelSearchResponse
 from .service import HotelService
 from .repository import HotelRepository
+from shared.pagination import CursorPage
+from core.async_database import run_db
+from shared.bulk import detect_format
+from shared.serialization import JSONBytesResponse, fast_json_enabled
+from modules.reviews.schemas import ReviewStatsResponse
+from modules.reviews.service import ReviewService
+from modules.reviews.repository import ReviewRepository
+from core.confing import settings
+from integrations.hotels.registry import hotel_providers
 
 
 
@@ -12,56 +21,103 @@ def get_hotel_service():
     return HotelService(repository)
 
 @router.post("/", response_model=HotelResponse)
-def create_hotel(
+async def create_hotel(
     hotel_data: HotelCreate,
     service: HotelService = Depends(get_hotel_service)
 ):
     try:
-        return service.create_hotel(hotel_data)
+        return await run_db(service.create_hotel, hotel_data)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/bulk")
+async def bulk_create_hotels(
+    request: Request,
+    chunk_size: int = Query(1000, ge=1, le=10000, description="Размер пачки"),
+    service: HotelService = Depends(get_hotel_service)
+):
+    """NDJSON (по умолчанию) или CSV (Content-Type: text/csv), по записи на строку"""
+    try:
+        fmt = detect_format(request.headers.get("content-type", ""))
+        return await service.import_hotels_stream(request.stream(), fmt, chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Объявлен до /{hotel_id}, иначе "search" уйдёт в hotel_id и получит 422
+@router.get("/search", response_model=HotelSearchResponse)
+async def search_hotels(
+    city: str = Query(..., min_length=1, description="Город или часть адреса"),
+    check_in: str = Query(..., description="Дата заезда, YYYY-MM-DD"),
+    check_out: str = Query(..., description="Дата выезда, YYYY-MM-DD"),
+    guests: int = Query(2, ge=1, le=30),
+    deadline_ms: int | None = Query(None, ge=50, le=10000, description="Сколько ждать провайдеров"),
+    service: HotelService = Depends(get_hotel_service)
+):
+    """Локальные отели и ответы всех провайдеров, успевших за дедлайн; у каждого — источник"""
+    deadline = deadline_ms / 1000 if deadline_ms else settings.HOTEL_SEARCH_DEADLINE_SECONDS
+    return await service.search_hotels(hotel_providers, city, check_in, check_out, guests,
+                                       deadline=deadline, local_limit=settings.HOTEL_SEARCH_LOCAL_LIMIT)
+
 @router.get("/{hotel_id}", response_model=HotelResponse)
-def get_hotel(
+async def get_hotel(
     hotel_id: int,
     service: HotelService = Depends(get_hotel_service)
 ):
     try:
-        return service.get_hotel(hotel_id)
+        return await run_db(service.get_hotel, hotel_id)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
-@router.get("/", response_model=list[HotelResponse])
-def get_hotels(
+@router.get("/{hotel_id}/stats", response_model=ReviewStatsResponse)
+async def get_hotel_stats(
+    hotel_id: int,
+    service: HotelService = Depends(get_hotel_service)
+):
+    review_service = ReviewService(ReviewRepository(), hotel_service=service)
+    try:
+        return await run_db(review_service.get_hotel_stats, hotel_id)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/", response_model=list[HotelResponse] | CursorPage[HotelResponse])
+async def get_hotels(
     page: int = Query(1, ge=1, description="Номер стр"),
     limit: int = Query(10, ge=1, le=100, description="Количество на стр"),
+    after: str | None = Query(None, description="Курсор keyset-пагинации, пустая строка — первая страница"),
     service: HotelService = Depends(get_hotel_service)
 ):
     try:
-        return service.get_hotels(page=page, limit=limit)
+        if fast_json_enabled("hotels.list"):
+            if after is not None:
+                return JSONBytesResponse(await run_db(service.get_hotels_after_json, after=after, limit=limit))
+            return JSONBytesResponse(await run_db(service.get_hotels_json, page=page, limit=limit))
+
+        if after is not None:
+            return await run_db(service.get_hotels_after, after=after, limit=limit)
+        return await run_db(service.get_hotels, page=page, limit=limit)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
     
 
 
 @router.put("/{hotel_id}", response_model=HotelResponse)
-def updated_hotel(
+async def updated_hotel(
     hotel_id: int,
     update_data: HotelUpdate,
     service: HotelService = Depends(get_hotel_service)
 ):
     try:
-        return service.updated_hotel(hotel_id, update_data.dict())
+        return await run_db(service.update_hotel, hotel_id, update_data.dict(exclude_unset=True))
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))  
 
 @router.delete("/{hotel_id}")
-def deleted_hotel(
+async def deleted_hotel(
     hotel_id:int, 
     service: HotelService = Depends(get_hotel_service)
 ):
     try:
-        deleted = service.delete_hotel(hotel_id)
+        deleted = await run_db(service.delete_hotel, hotel_id)
         if not deleted:
             raise HTTPException(status_code=404, detail=f"Отель с ID {hotel_id} не найдено")
         return {"message": f"Отель с ID {hotel_id} удален","успех": True }
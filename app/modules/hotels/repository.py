@@ -1,119 +1,139 @@
 import sqlite3
 from typing import List
 from modules.hotels.models import Hotel
-from core.database import DB_PATH
+from core.database import build_update_set, get_connection
+from core.singleflight import single_flight
 import logging
 
 
 logger = logging.getLogger(__name__)
 
+HOTEL_COLUMNS = Hotel.select_list()
+UPDATABLE_COLUMNS = ("name", "address", "rating")
+
+# Одновременные чтения одного отеля (популярная страница) — один запрос к БД
+hotel_lookups = single_flight("hotels.get_by_id")
+
 
 class HotelRepository:
     def create_hotel(self, hotel: Hotel) -> Hotel:
         sql = """INSERT INTO hotels (name, address, rating) VALUES(?, ?, ?)"""
-        try:        
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute(sql, (hotel.name, hotel.address, hotel.rating))
-            hotel_id = cursor.lastrowid
-            conn.commit()
-            
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute(sql, (hotel.name, hotel.address, hotel.rating))
+                hotel_id = cursor.lastrowid
+
         except sqlite3.Error as e:
             logger.error(f"Ошибка в базе: {e}")
-            if conn:
-                conn.rollback()
             raise e
-        finally:
-            if conn:  
-                conn.close()
-        
-        return Hotel(id=hotel_id, 
-                     name=hotel.name, 
-                     address=hotel.address, 
+
+        return Hotel(id=hotel_id,
+                     name=hotel.name,
+                     address=hotel.address,
                      rating=hotel.rating)
-                 
+
+    def create_hotels(self, hotels: List[Hotel]) -> int:
+        """Пакетная вставка: один executemany в одной транзакции"""
+        sql = """INSERT INTO hotels (name, address, rating) VALUES(?, ?, ?)"""
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.executemany(sql, [(hotel.name, hotel.address, hotel.rating) for hotel in hotels])
+
+            return len(hotels)
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка в базе: {e}")
+            raise e
+
     def get_by_id(self, hotel_id: int) -> Hotel | None:
-        sql = """Select * From hotels where id = ?"""
+        """Одновременные вызовы с одним id ждут один SELECT; возвращённый Hotel общий — не изменять"""
+        return hotel_lookups.do(hotel_id, lambda: self._fetch_by_id(hotel_id))
+
+    def _fetch_by_id(self, hotel_id: int) -> Hotel | None:
+        sql = f"""SELECT {HOTEL_COLUMNS} FROM hotels WHERE id = ?"""
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = Hotel.row_factory
 
-            cursor.execute(sql, (hotel_id,)) 
-            row = cursor.fetchone() #одну строку
-            if row is None:
-                return None
-            
-            hotel = Hotel(id=row[0], name=row[1], address=row[2], rating=row[3])
-            
-            return hotel 
-        except sqlite3.Error as e:    
+                cursor.execute(sql, (hotel_id,))
+                return cursor.fetchone() #одну строку
+        except sqlite3.Error as e:
             logger.error(f"Ошибка в базе: {e}")
             raise e
-        finally:   
-            if conn:
-                conn.close()
-        
-                   
+
+
     def get_all(self, page: int=1, limit: int=10) -> List[Hotel]:
         offset = (page - 1) * limit
-        sql = """select * from hotels LIMIT ? OFFSET ?""" 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-       
-        cursor.execute(sql,(limit, offset))
-        rows = cursor.fetchall() #все строки
-        
-        hotels = []
-        for row in rows:
-            hotel = Hotel(id=row[0], name=row[1], address=row[2], rating=row[3])
-            hotels.append(hotel)
-        
-        conn.close()    
-        return hotels   
-        
-        
+        sql = f"""SELECT {HOTEL_COLUMNS} FROM hotels LIMIT ? OFFSET ?"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = Hotel.row_factory
+
+            cursor.execute(sql,(limit, offset))
+            return cursor.fetchall() #все строки
+
+    def get_after(self, after_id: int = 0, limit: int = 10) -> List[Hotel]:
+        """Keyset-страница: отели с id больше after_id"""
+        sql = f"""SELECT {HOTEL_COLUMNS} FROM hotels WHERE id > ? ORDER BY id LIMIT ?"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = Hotel.row_factory
+
+            cursor.execute(sql, (after_id, limit))
+            return cursor.fetchall()
+
+
+    def search(self, query: str, limit: int = 20) -> List[Hotel]:
+        """Локальные отели, у которых запрос встречается в названии или адресе"""
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        sql = f"""SELECT {HOTEL_COLUMNS} FROM hotels
+        WHERE name LIKE ? ESCAPE '\\' OR address LIKE ? ESCAPE '\\' ORDER BY rating DESC, id LIMIT ?"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = Hotel.row_factory
+
+            cursor.execute(sql, (pattern, pattern, limit))
+            return cursor.fetchall()
+
+
     def update_hotel(self, hotel_id: int, update_data: dict) -> Hotel | None:
-     
-        current_hotel = self.get_by_id(hotel_id)
-
-        if current_hotel is None:
-            return None
-        
-        updated_name = update_data.get("name", current_hotel.name)
-        updated_address = update_data.get("address", current_hotel.address)
-        updated_rating = update_data.get("rating", current_hotel.rating)    
-        
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        sql = """UPDATE hotels SET name = ?, address = ?, rating = ? WHERE id = ?"""
-        cursor.execute(sql, (updated_name, updated_address, updated_rating, hotel_id))
-        
-        conn.commit()
-        conn.close()
-        
-        return Hotel(
-            id=hotel_id,
-            name=updated_name,
-            address=updated_address,
-            rating=updated_rating
-        )
-    
-        
-    def delete_hotel(self, hotel_id: int) -> bool:
-        current_hotel = self.get_by_id(hotel_id)
+        """Одним UPDATE ... RETURNING и только по переданным полям"""
+        assignments, params = build_update_set(update_data, UPDATABLE_COLUMNS)
+        if not assignments:
+            return self.get_by_id(hotel_id)
 
-        if current_hotel is None:
-            return False
+        sql = f"""UPDATE hotels SET {assignments} WHERE id = ? RETURNING {HOTEL_COLUMNS}"""
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = Hotel.row_factory
 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+                cursor.execute(sql, (*params, hotel_id))
+                hotel = cursor.fetchone()
 
-        sql = "DELETE FROM hotels WHERE id = ?"
-        cursor.execute(sql, (hotel_id,))
+            # Чтения после записи не должны склеиваться с SELECT, начатым до неё
+            hotel_lookups.forget(hotel_id)
+            return hotel
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка в базе: {e}")
+            raise e
 
-        conn.commit()
-        conn.close()
 
-        return True
\ No newline at end of file
+    def delete_hotel(self, hotel_id: int) -> bool:
+        sql = "DELETE FROM hotels WHERE id = ? RETURNING id"
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute(sql, (hotel_id,))
+                row = cursor.fetchone()
+
+            hotel_lookups.forget(hotel_id)
+            return row is not None
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка в базе: {e}")
+            raise e
@@ -13,8 +13,29 @@ class HotelUpdate(BaseModel):
     rating: float | None = Field(None, ge=0, le=5)
 
 class HotelResponse(BaseModel):
-    """Схема для ответа API (включает id)"""
+    """Схема для ответа API (включает id); address и rating в БД допускают NULL"""
     id: int
     name: str
-    address: str
-    rating: float
\ No newline at end of file
+    address: str | None = None
+    rating: float | None = None
+
+class HotelSearchItem(BaseModel):
+    """Отель из поиска: локальный или от провайдера"""
+    source: str = Field(description="local или имя провайдера")
+    id: str
+    name: str
+    address: str | None = None
+    rating: float | None = None
+    price: float | None = None
+    sources: list[str] = Field(default_factory=list, description="Все источники, где найден этот отель")
+
+class ProviderSearchStatus(BaseModel):
+    status: str = Field(description="ok | degraded | timeout | error | circuit_open")
+    count: int = 0
+    skipped: int = Field(0, description="Записи провайдера без обязательных полей, не вошедшие в выдачу")
+    latency_ms: float = 0.0
+
+class HotelSearchResponse(BaseModel):
+    items: list[HotelSearchItem]
+    providers: dict[str, ProviderSearchStatus]
+    partial: bool = Field(description="Кто-то из провайдеров не ответил вовремя или вернул битые записи")
@@ -1,8 +1,30 @@
-from modules.hotels.schemas import HotelCreate, HotelResponse  
+import asyncio
+import logging
+
+from pydantic import ValidationError
+
+from modules.hotels.schemas import HotelCreate, HotelResponse, HotelSearchItem, HotelSearchResponse, ProviderSearchStatus
+from modules.hotels.models import Hotel
 from modules.hotels.repository import HotelRepository
+from shared.pagination import CursorPage, encode_cursor, decode_cursor
+from shared.bulk import aiter_records, bulk_import, bulk_import_async, iter_records
+from shared.serialization import dump_list, dump_page
+from core.cache import response_cache
+from core.async_database import run_db
+from integrations.hotels.registry import HotelProviderRegistry
 
+logger = logging.getLogger(__name__)
 
 
+def _provider_item(source: str, hotel) -> HotelSearchItem:
+    """Отель из ответа провайдера; ValueError — если в нём нет обязательных полей"""
+    try:
+        return HotelSearchItem(source=source, id=str(hotel["id"]), name=hotel["name"],
+                               address=hotel.get("address"), rating=hotel.get("rating"),
+                               price=hotel.get("price"), sources=[source])
+    except (KeyError, TypeError, AttributeError, ValidationError) as e:
+        raise ValueError(f"{type(e).__name__}: {e}") from e
+
 
 class HotelService:
     def __init__(self, repository: HotelRepository):
@@ -22,7 +44,10 @@ class HotelService:
         )
         
         
-    def get_hotel(self, hotel_id: int) -> HotelResponse:    
+    def get_hotel(self, hotel_id: int) -> HotelResponse:
+        return response_cache.get_or_load(f"hotel:{hotel_id}", lambda: self._load_hotel(hotel_id))
+
+    def _load_hotel(self, hotel_id: int) -> HotelResponse:
         hotel = self.repository.get_by_id(hotel_id)
         if hotel is None:
             raise ValueError(f"Такого {hotel_id}не найдено")
@@ -58,6 +83,7 @@ class HotelService:
                 raise ValueError("Адрес не может быть пустым")
             
         updated_hotel = self.repository.update_hotel(hotel_id, update_data)
+        response_cache.invalidate(f"hotel:{hotel_id}")
 
         if updated_hotel is None:
             raise ValueError(f"Отель с ID {hotel_id} не найден")
@@ -71,12 +97,9 @@ class HotelService:
         
         
     def delete_hotel(self, hotel_id: int) -> bool:
-        hotel = self.get_hotel(hotel_id)
-        
-        if hotel is None:
-            return False
-        
-        return self.repository.delete_hotel(hotel_id)
+        deleted = self.repository.delete_hotel(hotel_id)
+        response_cache.invalidate(f"hotel:{hotel_id}")
+        return deleted
     
     def get_hotels(self, page: int = 1, limit: int = 10) -> list[HotelResponse]:
         if page < 1:
@@ -94,4 +117,96 @@ class HotelService:
             )   
             hotel_responses.append(hotel_response)
             
-        return hotel_responses
\ No newline at end of file
+        return hotel_responses
+
+    def get_hotels_json(self, page: int = 1, limit: int = 10) -> bytes:
+        """Тот же ответ, что у get_hotels, но JSON-байтами прямо из моделей"""
+        if page < 1:
+            raise ValueError("Номер страницы должен быть положительным")
+
+        return dump_list(Hotel, self.repository.get_all(page, limit))
+
+    def _hotels_after(self, after: str, limit: int) -> tuple[list[Hotel], str | None]:
+        """Keyset-пагинация: пустой курсор — первая страница"""
+        after_id = decode_cursor(after, 1)[0] if after else 0
+
+        hotels = self.repository.get_after(after_id, limit + 1)
+        has_more = len(hotels) > limit
+        hotels = hotels[:limit]
+        return hotels, encode_cursor(hotels[-1].id) if has_more else None
+
+    def get_hotels_after(self, after: str = "", limit: int = 10) -> CursorPage[HotelResponse]:
+        hotels, next_cursor = self._hotels_after(after, limit)
+
+        return CursorPage[HotelResponse](
+            items=[
+                HotelResponse(
+                    id=hotel.id,
+                    name=hotel.name,
+                    address=hotel.address,
+                    rating=hotel.rating
+                )
+                for hotel in hotels
+            ],
+            next_cursor=next_cursor
+        )
+
+    def get_hotels_after_json(self, after: str = "", limit: int = 10) -> bytes:
+        return dump_page(Hotel, *self._hotels_after(after, limit))
+
+    async def search_hotels(self, providers: HotelProviderRegistry, city: str, check_in: str, check_out: str,
+                            guests: int = 2, deadline: float = 1.5, local_limit: int = 20) -> HotelSearchResponse:
+        """Локальная таблица и все провайдеры одновременно; провайдеры ждём не дольше deadline.
+
+        Отель, найденный в нескольких источниках (совпали название и адрес), отдаём
+        один раз — первым идёт локальный — со списком всех источников. Битые записи
+        провайдера пропускаем, а сам провайдер помечаем degraded — остальные
+        результаты отдаём как обычно.
+        """
+        local, (found, statuses) = await asyncio.gather(
+            run_db(self.repository.search, city, local_limit),
+            providers.search_hotels(city, check_in, check_out, guests, deadline),
+        )
+
+        items: dict[tuple[str, str], HotelSearchItem] = {}
+
+        def add(item: HotelSearchItem):
+            key = (item.name.strip().lower(), (item.address or "").strip().lower())
+            existing = items.get(key)
+            if existing is None:
+                items[key] = item
+                return
+            existing.sources.append(item.source)
+            if existing.price is None:
+                existing.price = item.price
+
+        for hotel in local:
+            add(HotelSearchItem(source="local", id=str(hotel.id), name=hotel.name, address=hotel.address,
+                                rating=hotel.rating, sources=["local"]))
+        for source, hotels in found.items():
+            skipped = 0
+            for hotel in hotels:
+                try:
+                    add(_provider_item(source, hotel))
+                except ValueError as e:
+                    skipped += 1
+                    logger.warning(f"Провайдер {source} вернул некорректный отель, пропускаем: {e}")
+            if skipped:
+                statuses[source] = {**statuses[source], "status": "degraded", "skipped": skipped}
+
+        return HotelSearchResponse(
+            items=list(items.values()),
+            providers={name: ProviderSearchStatus(**status) for name, status in statuses.items()},
+            partial=any(status["status"] != "ok" for status in statuses.values()),
+        )
+
+    def import_hotels(self, lines, fmt: str = "ndjson", chunk_size: int = 1000) -> dict:
+        """Массовый импорт из NDJSON/CSV: валидация схемой HotelCreate, запись пачками"""
+        report = bulk_import(iter_records(lines, fmt), HotelCreate, self.repository.create_hotels, chunk_size)
+        return report.to_dict()
+
+    async def import_hotels_stream(self, chunks, fmt: str = "ndjson", chunk_size: int = 1000) -> dict:
+        """То же для тела запроса: разбор в event loop, в поток БД уходят только пачки"""
+        report = await bulk_import_async(aiter_records(chunks, fmt), HotelCreate, self.repository.create_hotels,
+                                         chunk_size)
+        return report.to_dict()
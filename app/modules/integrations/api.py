@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from integrations.resilience import provider_policies
+from modules.auth.dependencies import check_admin
+
+router = APIRouter(prefix="/integrations", tags=["integrations"])
+
+
+@router.get("/breakers")
+async def get_breakers(admin_user = Depends(check_admin)):
+    """Состояние автоматов, p95 и текущие таймауты по провайдерам"""
+    return provider_policies.stats()
+
+
+@router.post("/breakers/{name}/reset")
+async def reset_breaker(name: str, admin_user = Depends(check_admin)):
+    """Замкнуть автомат вручную, например после починки провайдера"""
+    if not provider_policies.reset(name):
+        raise HTTPException(status_code=404, detail=f"Провайдер {name} не найден")
+    return provider_policies.stats()[name]
@@ -1,7 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from .schemas import PlaceCreate, PlaceUpdate, PlaceResponse
 from .service import PlaceService
 from .repository import PlaceRepository
+from shared.pagination import CursorPage
+from core.async_database import run_db
+from shared.bulk import detect_format
+from shared.serialization import JSONBytesResponse, fast_json_enabled
+from modules.reviews.schemas import ReviewStatsResponse
+from modules.reviews.service import ReviewService
+from modules.reviews.repository import ReviewRepository
 
 
 router = APIRouter(prefix="/places", tags=["places"])
@@ -11,54 +18,86 @@ def get_place_service():
     return PlaceService(repository)
 
 @router.post("/",response_model=PlaceResponse)
-def create_place(
+async def create_place(
     place_data: PlaceCreate,
     service: PlaceService = Depends(get_place_service)
 ):
     try:
-        return service.create_place(place_data)
+        return await run_db(service.create_place, place_data)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
     
+@router.post("/bulk")
+async def bulk_create_places(
+    request: Request,
+    chunk_size: int = Query(1000, ge=1, le=10000, description="Размер пачки"),
+    service: PlaceService = Depends(get_place_service)
+):
+    """NDJSON (по умолчанию) или CSV (Content-Type: text/csv), по записи на строку"""
+    try:
+        fmt = detect_format(request.headers.get("content-type", ""))
+        return await service.import_places_stream(request.stream(), fmt, chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/{place_id}", response_model=PlaceResponse) 
-def get_place(
+async def get_place(
     place_id: int,
     service: PlaceService = Depends(get_place_service)
 ):
     try:
-        return service.get_place(place_id) 
+        return await run_db(service.get_place, place_id) 
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
     
-@router.get("/", response_model=list[PlaceResponse])
-def get_places(
+@router.get("/{place_id}/stats", response_model=ReviewStatsResponse)
+async def get_place_stats(
+    place_id: int,
+    service: PlaceService = Depends(get_place_service)
+):
+    review_service = ReviewService(ReviewRepository(), place_service=service)
+    try:
+        return await run_db(review_service.get_place_stats, place_id)
+    except Exception as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+@router.get("/", response_model=list[PlaceResponse] | CursorPage[PlaceResponse])
+async def get_places(
     page: int = Query(1, ge=1, description="Номер стр"),
     limit: int = Query(10, ge=1 , le=100, description="Количество на стр"),
+    after: str | None = Query(None, description="Курсор keyset-пагинации, пустая строка — первая страница"),
     service: PlaceService = Depends(get_place_service)
 ):
     try:
-        return service.get_places(page=page, limit=limit)
+        if fast_json_enabled("places.list"):
+            if after is not None:
+                return JSONBytesResponse(await run_db(service.get_places_after_json, after=after, limit=limit))
+            return JSONBytesResponse(await run_db(service.get_places_json, page=page, limit=limit))
+
+        if after is not None:
+            return await run_db(service.get_places_after, after=after, limit=limit)
+        return await run_db(service.get_places, page=page, limit=limit)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
     
 @router.put("/{place_id}", response_model=PlaceResponse) 
-def update_place(
+async def update_place(
     place_id: int, 
     update_data: PlaceUpdate,
     service: PlaceService = Depends(get_place_service)
 ):
     try:
-        return service.update_place(place_id, update_data.dict())
+        return await run_db(service.update_place, place_id, update_data.dict(exclude_unset=True))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
     
 @router.delete("/{place_id}")
-def deleted_place(
+async def deleted_place(
     place_id: int, 
     service: PlaceService = Depends(get_place_service)
 ):
     try:
-        deleted = service.delete_place(place_id)
+        deleted = await run_db(service.delete_place, place_id)
         if not deleted:
             raise HTTPException(status_code=404, detail=f"Место с ID {place_id} не найдено")  
         return {"message": f"Место с ID {place_id} удалено","успех": True}          
@@ -1,124 +1,123 @@
 from modules.places.models import Place
 import sqlite3
-from core.database import DB_PATH
-from typing import List 
+from core.database import build_update_set, get_connection
+from typing import List
 import logging
 
 
 
 logger = logging.getLogger(__name__)
 
+PLACE_COLUMNS = Place.select_list()
+UPDATABLE_COLUMNS = ("name", "type", "address", "rating")
+
 
 class PlaceRepository:
     def create_place(self, place: Place) -> Place:
         sql = """INSERT INTO places (name, type, address, rating) VALUES(?, ?, ?, ?)"""
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            type_str = place.type.value if hasattr(place.type, 'value') else place.type
-            
-            cursor.execute(sql,(place.name, type_str, place.address, place.rating))
-            place_id = cursor.lastrowid
-            conn.commit()
-        
+            with get_connection() as conn:
+                cursor = conn.cursor()
+
+                type_str = place.type.value if hasattr(place.type, 'value') else place.type
+
+                cursor.execute(sql,(place.name, type_str, place.address, place.rating))
+                place_id = cursor.lastrowid
+
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка в базе: {e}")
+            raise e
+
+        return Place(id=place_id,
+                     name=place.name,
+                     type=type_str,
+                     address=place.address,
+                     rating=place.rating)
+
+    def create_places(self, places: List[Place]) -> int:
+        """Пакетная вставка: один executemany в одной транзакции"""
+        sql = """INSERT INTO places (name, type, address, rating) VALUES(?, ?, ?, ?)"""
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.executemany(sql, [
+                    (place.name,
+                     place.type.value if hasattr(place.type, 'value') else place.type,
+                     place.address,
+                     place.rating)
+                    for place in places
+                ])
+
+            return len(places)
         except sqlite3.Error as e:
             logger.error(f"Ошибка в базе: {e}")
-            if conn:
-                conn.rollback()
             raise e
-        finally:
-            if conn:
-                conn.close()
- 
-        return Place(id=place_id, 
-                     name=place.name, 
-                     type=type_str, 
-                     address=place.address, 
-                     rating=place.rating) 
-    
+
     def get_by_id(self, place_id: int) -> Place | None:
-        sql = """Select * From places where id = ?"""         
-        try: 
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute(sql,(place_id,))
-            row = cursor.fetchone()
-            if row is None:
-                return None
-            
-            place = Place(id=row[0], name=row[1], type=row[2], address=row[3], rating=row[4])
-
-            return place
-        except sqlite3.Error as e:          
+        sql = f"""SELECT {PLACE_COLUMNS} FROM places WHERE id = ?"""
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = Place.row_factory
+
+                cursor.execute(sql,(place_id,))
+                return cursor.fetchone()
+        except sqlite3.Error as e:
             logger.error(f"Ошибка в базе: {e}")
             raise e
-        finally:
-            if conn:
-                conn.close()
-                
+
     def get_all(self, page: int = 1, limit: int = 10) -> List[Place]:
-        offset = (page - 1) * limit 
-        sql = """select * from places LIMIT ? OFFSET ?""" 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()          
-        
-        cursor.execute(sql,(limit, offset))
-        rows = cursor.fetchall() 
-        
-        places = []
-        for row in rows:
-            place = Place(id=row[0], name=row[1], type=row[2], address=row[3], rating=row[4])
-            places.append(place)
-        
-        conn.close()
-        return places
-    
+        offset = (page - 1) * limit
+        sql = f"""SELECT {PLACE_COLUMNS} FROM places LIMIT ? OFFSET ?"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = Place.row_factory
+
+            cursor.execute(sql,(limit, offset))
+            return cursor.fetchall()
+
+    def get_after(self, after_id: int = 0, limit: int = 10) -> List[Place]:
+        """Keyset-страница: места с id больше after_id"""
+        sql = f"""SELECT {PLACE_COLUMNS} FROM places WHERE id > ? ORDER BY id LIMIT ?"""
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = Place.row_factory
+
+            cursor.execute(sql, (after_id, limit))
+            return cursor.fetchall()
+
     def update_place(self, place_id: int, update_data: dict) -> Place | None:
-        
-        current_place = self.get_by_id(place_id) 
-        
-        if current_place is None:
-            return None
-        
-        updated_name = update_data.get("name",current_place.name)
-        updated_type = update_data.get("type", current_place.type)
-        updated_address = update_data.get("address", current_place.address)
-        updated_rating = update_data.get("rating", current_place.rating)  
-        
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()       
-        
-        sql = """UPDATE places SET name = ?, type = ? ,address = ?, rating = ? WHERE id = ? """  
-        cursor.execute(sql,(updated_name, updated_type, updated_address, updated_rating, place_id)) 
-          
-        conn.commit()
-        conn.close()
-        
-        return Place(
-            id=place_id,
-            name=updated_name,
-            type=updated_type,
-            address=updated_address,
-            rating=updated_rating
-        )  
-        
+        """Одним UPDATE ... RETURNING и только по переданным полям"""
+        if "type" in update_data and hasattr(update_data["type"], "value"):
+            update_data = {**update_data, "type": update_data["type"].value}
+
+        assignments, params = build_update_set(update_data, UPDATABLE_COLUMNS)
+        if not assignments:
+            return self.get_by_id(place_id)
+
+        sql = f"""UPDATE places SET {assignments} WHERE id = ? RETURNING {PLACE_COLUMNS}"""
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = Place.row_factory
+
+                cursor.execute(sql, (*params, place_id))
+                return cursor.fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка в базе: {e}")
+            raise e
+
     def delete_place(self, place_id: int) -> bool:
-        current_place = self.get_by_id(place_id)
-        
-        if current_place is None:
-            return False
-        
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        sql = """DELETE from places where id = ?"""
-        cursor.execute(sql, (place_id,))
-
-        conn.commit()
-        conn.close()
-        
-        return True  
-
-                
\ No newline at end of file
+        sql = """DELETE from places where id = ? RETURNING id"""
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute(sql, (place_id,))
+                row = cursor.fetchone()
+
+            return row is not None
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка в базе: {e}")
+            raise e
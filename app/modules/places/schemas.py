@@ -23,11 +23,12 @@ class PlaceUpdate(BaseModel):
     rating: float | None = Field(None, ge=0, le=5)
 
 class PlaceResponse(BaseModel):
+    # type, address и rating в БД допускают NULL (строки из старой схемы)
     id: int
     name: str
-    type: PlaceType
-    address: str
-    rating: float
+    type: PlaceType | None = None
+    address: str | None = None
+    rating: float | None = None
     
     class Config:
         from_attributes = True # Для перехода на sqlalchemy     
\ No newline at end of file
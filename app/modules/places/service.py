@@ -1,6 +1,10 @@
-from modules.places.schemas import PlaceCreate, PlaceResponse, PlaceType
+from modules.places.schemas import PlaceCreate, PlaceResponse
 from modules.places.repository import PlaceRepository
 from modules.places.models import Place 
+from shared.pagination import CursorPage, encode_cursor, decode_cursor
+from shared.bulk import aiter_records, bulk_import, bulk_import_async, iter_records
+from shared.serialization import dump_list, dump_page
+from core.cache import response_cache
 
 class PlaceService:
     def __init__(self, repository: PlaceRepository):
@@ -21,12 +25,15 @@ class PlaceService:
         return PlaceResponse(
             id=created_place.id,
             name=created_place.name,
-            type=PlaceType(created_place.type),
+            type=created_place.type,
             address=created_place.address,
             rating=created_place.rating
         )   
         
     def get_place(self, place_id: int) -> PlaceResponse:
+        return response_cache.get_or_load(f"place:{place_id}", lambda: self._load_place(place_id))
+
+    def _load_place(self, place_id: int) -> PlaceResponse:
         place = self.repository.get_by_id(place_id)
         if place is None:
             raise ValueError(f"Место с ID {place_id} не найдено")     
@@ -34,7 +41,7 @@ class PlaceService:
         return PlaceResponse(
             id=place_id,
             name=place.name,
-            type=PlaceType(place.type),
+            type=place.type,
             address=place.address,
             rating=place.rating
         )
@@ -51,6 +58,7 @@ class PlaceService:
        
             
         updated_place = self.repository.update_place(place_id, update_data)
+        response_cache.invalidate(f"place:{place_id}")
          
         if updated_place is None:
             raise ValueError(f"Место с ID {place_id} не найден")    
@@ -58,18 +66,15 @@ class PlaceService:
         return PlaceResponse(
             id=updated_place.id,
             name=updated_place.name,
-            type=PlaceType(updated_place.type),
+            type=updated_place.type,
             address=updated_place.address,
             rating=updated_place.rating
         )
         
     def delete_place(self, place_id: int) -> bool:
-        place = self.get_place(place_id)   
-        
-        if place is None:
-            return False
-        
-        return self.repository.delete_place(place_id)
+        deleted = self.repository.delete_place(place_id)
+        response_cache.invalidate(f"place:{place_id}")
+        return deleted
     
     def get_places(self, page: int = 1, limit: int = 10) -> list[PlaceResponse]:
         if page < 1:
@@ -81,9 +86,56 @@ class PlaceService:
         PlaceResponse(
             id=place.id,
             name=place.name,
-            type=PlaceType(place.type),  # Конвертация
+            type=place.type,
             address=place.address,
             rating=place.rating
         )
         for place in places
-    ]
\ No newline at end of file
+    ]
+
+    def get_places_json(self, page: int = 1, limit: int = 10) -> bytes:
+        """Тот же ответ, что у get_places, но JSON-байтами прямо из моделей"""
+        if page < 1:
+            raise ValueError("Номер страницы должен быть положительным")
+
+        return dump_list(Place, self.repository.get_all(page, limit))
+
+    def _places_after(self, after: str, limit: int) -> tuple[list[Place], str | None]:
+        """Keyset-пагинация: пустой курсор — первая страница"""
+        after_id = decode_cursor(after, 1)[0] if after else 0
+
+        places = self.repository.get_after(after_id, limit + 1)
+        has_more = len(places) > limit
+        places = places[:limit]
+        return places, encode_cursor(places[-1].id) if has_more else None
+
+    def get_places_after(self, after: str = "", limit: int = 10) -> CursorPage[PlaceResponse]:
+        places, next_cursor = self._places_after(after, limit)
+
+        return CursorPage[PlaceResponse](
+            items=[
+                PlaceResponse(
+                    id=place.id,
+                    name=place.name,
+                    type=place.type,
+                    address=place.address,
+                    rating=place.rating
+                )
+                for place in places
+            ],
+            next_cursor=next_cursor
+        )
+
+    def get_places_after_json(self, after: str = "", limit: int = 10) -> bytes:
+        return dump_page(Place, *self._places_after(after, limit))
+
+    def import_places(self, lines, fmt: str = "ndjson", chunk_size: int = 1000) -> dict:
+        """Массовый импорт из NDJSON/CSV: валидация схемой PlaceCreate, запись пачками"""
+        report = bulk_import(iter_records(lines, fmt), PlaceCreate, self.repository.create_places, chunk_size)
+        return report.to_dict()
+
+    async def import_places_stream(self, chunks, fmt: str = "ndjson", chunk_size: int = 1000) -> dict:
+        """То же для тела запроса: разбор в event loop, в поток БД уходят только пачки"""
+        report = await bulk_import_async(aiter_records(chunks, fmt), PlaceCreate, self.repository.create_places,
+                                         chunk_size)
+        return report.to_dict()
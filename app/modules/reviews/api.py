@@ -1,7 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from .schemas import ReviewCreate, ReviewUpdate, ReviewResponse, HotelReviewCreate, PlaceReviewCreate
 from .service import ReviewService
 from .repository import ReviewRepository
+from shared.pagination import CursorPage
+from core.async_database import run_db
+from shared.bulk import detect_format
+from shared.serialization import JSONBytesResponse, fast_json_enabled
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
@@ -12,99 +16,126 @@ def get_review_service():
     return ReviewService(repository, hotel_service=None, place_service=None)
 
 @router.post("/", response_model=ReviewResponse)
-def create_review(
+async def create_review(
     review_data: ReviewCreate,
     service: ReviewService = Depends(get_review_service)
 ):
     try:
-        return service.create_review(review_data)
+        return await run_db(service.create_review, review_data)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
     
 
+@router.post("/bulk")
+async def bulk_create_reviews(
+    request: Request,
+    chunk_size: int = Query(1000, ge=1, le=10000, description="Размер пачки"),
+    service: ReviewService = Depends(get_review_service)
+):
+    """NDJSON (по умолчанию) или CSV (Content-Type: text/csv), по записи на строку"""
+    try:
+        fmt = detect_format(request.headers.get("content-type", ""))
+        return await service.import_reviews_stream(request.stream(), fmt, chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/hotel/", response_model=ReviewResponse) 
-def create_review_hotel(
+async def create_review_hotel(
     review_data: HotelReviewCreate,
     service: ReviewService = Depends(get_review_service)
 ):
     try:
-        return service.create_hotel_review(review_data)
+        return await run_db(service.create_hotel_review, review_data)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))   
 
 @router.post("/place/", response_model=ReviewResponse)
-def create_review_place(
+async def create_review_place(
     review_data: PlaceReviewCreate,
     service: ReviewService = Depends(get_review_service)
 ):
     try:
-        return service.create_place_review(review_data)
+        return await run_db(service.create_place_review, review_data)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e)) 
 
 @router.get("/{review_id}", response_model=ReviewResponse)
-def get_review(
+async def get_review(
     review_id: int, 
     service: ReviewService = Depends(get_review_service)
 ):
     try:
-        return service.get_review(review_id)
+        return await run_db(service.get_review, review_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
         
-@router.get("/", response_model=list[ReviewResponse])
-def get_all_reviews(
+@router.get("/", response_model=list[ReviewResponse] | CursorPage[ReviewResponse])
+async def get_all_reviews(
     page: int = Query(1, ge=1, description="Номер страницы"),
     limit: int = Query(1, ge=1, le=100, description="Количество на стр"),
+    after: str | None = Query(None, description="Курсор keyset-пагинации, пустая строка — первая страница"),
     service: ReviewService = Depends(get_review_service)
 ):
     try:
-        return service.get_all_reviews(page=page, limit=limit)
+        if fast_json_enabled("reviews.list"):
+            if after is not None:
+                return JSONBytesResponse(await run_db(service.get_all_reviews_after_json, after=after, limit=limit))
+            return JSONBytesResponse(await run_db(service.get_all_reviews_json, page=page, limit=limit))
+
+        if after is not None:
+            return await run_db(service.get_all_reviews_after, after=after, limit=limit)
+        return await run_db(service.get_all_reviews, page=page, limit=limit)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/hotel/{hotel_id}",response_model=list[ReviewResponse])
-def get_hotel_reviews(
+@router.get("/hotel/{hotel_id}",response_model=list[ReviewResponse] | CursorPage[ReviewResponse])
+async def get_hotel_reviews(
     hotel_id: int,
     page: int = Query(1,ge=1),
     limit: int = Query(1, ge=1, le=100),
+    after: str | None = Query(None, description="Курсор keyset-пагинации, пустая строка — первая страница"),
     service: ReviewService = Depends(get_review_service)
 ):
     try:
-        return service.get_hotel_reviews(hotel_id, page=page, limit=limit)
+        if after is not None:
+            return await run_db(service.get_hotel_reviews_after, hotel_id, after=after, limit=limit)
+        return await run_db(service.get_hotel_reviews, hotel_id, page=page, limit=limit)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/place/{place_id}",response_model=list[ReviewResponse])
-def get_place_reviews(
+@router.get("/place/{place_id}",response_model=list[ReviewResponse] | CursorPage[ReviewResponse])
+async def get_place_reviews(
     place_id: int,
     page: int = Query(1,ge=1),
     limit: int = Query(1, ge=1, le=100),
+    after: str | None = Query(None, description="Курсор keyset-пагинации, пустая строка — первая страница"),
     service: ReviewService = Depends(get_review_service)
 ):
     try:
-        return service.get_place_reviews(place_id, page=page, limit=limit)
+        if after is not None:
+            return await run_db(service.get_place_reviews_after, place_id, after=after, limit=limit)
+        return await run_db(service.get_place_reviews, place_id, page=page, limit=limit)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.put("/{review_id}",response_model=ReviewResponse)
-def update_review(
+async def update_review(
     review_id: int,
     update_data: ReviewUpdate,
     service: ReviewService = Depends(get_review_service)
 ):
     try:
-        return get_review_service(review_id, update_data.dict(exclude_unset=True)) 
+        return await run_db(service.update_review, review_id, update_data.dict(exclude_unset=True))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/{review_id}")
-def delete_review(
+async def delete_review(
     review_id: int,
     service: ReviewService = Depends(get_review_service)
 ):
     try:
-        deleted = service.delete_review(review_id)
+        deleted = await run_db(service.delete_review, review_id)
         if not deleted:
             raise HTTPException(status_code=404, detail=f"Отзыв {review_id} не  айден")
         return {"message": f"Отзыв с ID {review_id} удален", "успех": True}
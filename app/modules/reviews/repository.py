@@ -1,271 +1,317 @@
 from modules.reviews.models import Review
 import sqlite3
-from core.database import DB_PATH
-from typing import List 
+from core.database import build_update_set, get_connection
+from typing import List
 import logging
 
 logger = logging.getLogger(__name__)
 
+REVIEW_COLUMNS = Review.select_list()
+
+# Порядок (created_at, id) совпадает с составными индексами idx_reviews_* из core.database
+BY_HOTEL_SQL = f"""SELECT {REVIEW_COLUMNS} FROM reviews WHERE hotel_id = ? ORDER BY created_at, id LIMIT ? OFFSET ?"""
+BY_PLACE_SQL = f"""SELECT {REVIEW_COLUMNS} FROM reviews WHERE place_id = ? ORDER BY created_at, id LIMIT ? OFFSET ?"""
+BY_USER_SQL = f"""SELECT {REVIEW_COLUMNS} FROM reviews WHERE user_id = ? ORDER BY created_at, id LIMIT ? OFFSET ?"""
+
+# Keyset-варианты: продолжаем с позиции (created_at, id) последнего отзыва предыдущей страницы
+BY_HOTEL_AFTER_SQL = f"""SELECT {REVIEW_COLUMNS} FROM reviews WHERE hotel_id = ? AND (created_at, id) > (?, ?)
+ORDER BY created_at, id LIMIT ?"""
+BY_PLACE_AFTER_SQL = f"""SELECT {REVIEW_COLUMNS} FROM reviews WHERE place_id = ? AND (created_at, id) > (?, ?)
+ORDER BY created_at, id LIMIT ?"""
+ALL_AFTER_SQL = f"""SELECT {REVIEW_COLUMNS} FROM reviews WHERE id > ? ORDER BY id LIMIT ?"""
+
+_STATS_ON_CONFLICT = """ON CONFLICT(target_type, target_id) DO UPDATE SET
+    review_count = review_count + excluded.review_count,
+    rating_sum = rating_sum + excluded.rating_sum,
+    rating_1 = rating_1 + excluded.rating_1,
+    rating_2 = rating_2 + excluded.rating_2,
+    rating_3 = rating_3 + excluded.rating_3,
+    rating_4 = rating_4 + excluded.rating_4,
+    rating_5 = rating_5 + excluded.rating_5,
+    last_review_at = MAX(COALESCE(last_review_at, ''), COALESCE(excluded.last_review_at, ''))"""
+
+STATS_UPSERT_SQL = """INSERT INTO review_stats
+(target_type, target_id, review_count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5, last_review_at)
+VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+""" + _STATS_ON_CONFLICT
+
+# Тот же upsert, но вклад считается из строки reviews прямо в SQL —
+# старый рейтинг не нужно читать в Python перед UPDATE
+STATS_FROM_REVIEW_SQL = """INSERT INTO review_stats
+(target_type, target_id, review_count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5, last_review_at)
+SELECT CASE WHEN hotel_id IS NOT NULL THEN 'hotel' ELSE 'place' END, COALESCE(hotel_id, place_id),
+       :delta, :delta * rating, :delta * (rating = 1), :delta * (rating = 2), :delta * (rating = 3),
+       :delta * (rating = 4), :delta * (rating = 5), NULL
+FROM reviews WHERE id = :id
+""" + _STATS_ON_CONFLICT
+
+UPDATABLE_COLUMNS = ("text", "rating")
+
+
+def _stats_target(review) -> tuple[str, int]:
+    if review.hotel_id is not None:
+        return "hotel", review.hotel_id
+    return "place", review.place_id
+
+
+def _apply_stats(cursor: sqlite3.Cursor, review, delta: int, created_at: str | None = None):
+    """Инкрементально правим review_stats в той же транзакции, что и сам отзыв"""
+    target_type, target_id = _stats_target(review)
+    histogram = [delta if review.rating == score else 0 for score in range(1, 6)]
+    cursor.execute(STATS_UPSERT_SQL, (target_type, target_id, delta, delta * review.rating,
+                                      *histogram, created_at))
+
+
+def _refresh_last_review_at(cursor: sqlite3.Cursor, review):
+    """После удаления пересчитываем last_review_at по индексу (key, created_at, id)"""
+    target_type, target_id = _stats_target(review)
+    column = "hotel_id" if target_type == "hotel" else "place_id"
+    cursor.execute(
+        f"""UPDATE review_stats SET last_review_at = (SELECT MAX(created_at) FROM reviews WHERE {column} = ?)
+        WHERE target_type = ? AND target_id = ?""",
+        (target_id, target_type, target_id)
+    )
+
 class ReviewRepository:
     def create_review(self, review: Review) -> Review:
         sql = """INSERT INTO reviews (hotel_id, place_id, user_id, text, rating)
         VALUES(?, ?, ?, ?, ?)"""
-        try: 
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute(sql,(review.hotel_id, 
-                                review.place_id, 
-                                review.user_id, 
-                                review.text, 
-                                review.rating))
-            review_id = cursor.lastrowid
-            conn.commit()
-            
-            cursor.execute("SELECT created_at FROM reviews WHERE id = ?", (review_id,))
-            created_at_row = cursor.fetchone()[0]
-            
-            if created_at_row is None:
-                raise sqlite3.Error("Не удалось получить created_at для созданного отзыва")
-        
-            created_at = created_at_row[0]
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute(sql,(review.hotel_id,
+                                    review.place_id,
+                                    review.user_id,
+                                    review.text,
+                                    review.rating))
+                review_id = cursor.lastrowid
+
+                cursor.execute("SELECT created_at FROM reviews WHERE id = ?", (review_id,))
+                created_at_row = cursor.fetchone()
+
+                if created_at_row is None:
+                    raise sqlite3.Error("Не удалось получить created_at для созданного отзыва")
+
+                created_at = created_at_row[0]
+
+                _apply_stats(cursor, review, +1, created_at)
 
         except sqlite3.Error as e:
             logger.error(f"Ошибка в базе: {e}")
-            if conn:
-                conn.rollback()
             raise e
-        finally:
-            if conn:
-                conn.close()
-                
+
         return Review(
-                      id=review_id, 
-                      hotel_id=review.hotel_id, 
-                      place_id=review.place_id, 
-                      user_id=review.user_id, 
-                      text=review.text, 
+                      id=review_id,
+                      hotel_id=review.hotel_id,
+                      place_id=review.place_id,
+                      user_id=review.user_id,
+                      text=review.text,
                       rating=review.rating,
                       created_at=created_at
-                      )          
-                
+                      )
+
+    def create_reviews(self, reviews: list[Review]) -> int:
+        """Пакетная вставка отзывов вместе с обновлением review_stats в одной транзакции"""
+        sql = """INSERT INTO reviews (hotel_id, place_id, user_id, text, rating)
+        VALUES(?, ?, ?, ?, ?)"""
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.executemany(sql, [
+                    (review.hotel_id, review.place_id, review.user_id, review.text, review.rating)
+                    for review in reviews
+                ])
+
+                cursor.executemany(STATS_UPSERT_SQL, [
+                    (*_stats_target(review), 1, review.rating,
+                     *[1 if review.rating == score else 0 for score in range(1, 6)], None)
+                    for review in reviews
+                ])
+
+                targets = {_stats_target(review): review for review in reviews}
+                for review in targets.values():
+                    _refresh_last_review_at(cursor, review)
+
+            return len(reviews)
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка в базе: {e}")
+            raise e
+
     def get_by_id(self, review_id: int) -> Review | None:
-        sql = """Select * From reviews where id = ?"""
+        sql = f"""SELECT {REVIEW_COLUMNS} FROM reviews WHERE id = ?"""
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute(sql, (review_id,))
-            row = cursor.fetchone()
-            if row is None: 
-                return None
-            
-            review = Review(
-                            id=row[0],
-                            hotel_id=row[1],
-                            place_id=row[2],
-                            user_id=row[3],
-                            text=row[4],
-                            rating=row[5],
-                            created_at=row[6]
-                            )
-            return review
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = Review.row_factory
+
+                cursor.execute(sql, (review_id,))
+                return cursor.fetchone()
         except sqlite3.Error as e:
             logger.error(f"Ошибка в базе: {e}")
             raise e
-        finally:
-            if conn:
-                conn.close()
-        
+
     def get_by_hotel_id(self, hotel_id: int, page: int = 1, limit: int = 10) -> list[Review]:
         offset = (page - 1) * limit
-        sql = """select * from reviews where hotel_id = ? limit ? offset ?"""
+        sql = BY_HOTEL_SQL
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute(sql,(hotel_id, limit, offset))
-            rows = cursor.fetchall()
-            
-            reviews = []
-            for row in rows:
-                review = Review(
-                        id=row[0],
-                        hotel_id=row[1],
-                        place_id=row[2],
-                        user_id=row[3],
-                        text=row[4],
-                        rating=row[5],
-                        created_at=row[6]
-                         )    
-                reviews.append(review)    
-            return reviews
-        
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = Review.row_factory
+
+                cursor.execute(sql,(hotel_id, limit, offset))
+                return cursor.fetchall()
+
         except sqlite3.Error as e:
             logger.error(f"Ошибка в базе: {e}")
             raise e
-        finally:
-            if conn:
-                conn.close()     
-            
-    
+
+
     def get_by_place_id(self, place_id: int, page: int = 1, limit: int = 10) -> list[Review]:
         offset = (page - 1) * limit
-        sql = """SELECT * FROM reviews WHERE place_id = ? LIMIT ? OFFSET ?"""
-        
+        sql = BY_PLACE_SQL
+
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute(sql, (place_id, limit, offset))
-            rows = cursor.fetchall()
-            
-            reviews = []
-            for row in rows:
-                review = Review(
-                    id=row[0],
-                    hotel_id=row[1],
-                    place_id=row[2],
-                    user_id=row[3],
-                    text=row[4],
-                    rating=row[5],
-                    created_at=row[6]
-                )
-                reviews.append(review)
-            
-            return reviews
-            
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = Review.row_factory
+
+                cursor.execute(sql, (place_id, limit, offset))
+                return cursor.fetchall()
+
         except sqlite3.Error as e:
             logger.error(f"Ошибка в базе: {e}")
             raise e
-        finally:
-            if conn:
-                conn.close()
-                
-    def get_by_user_id(self, user_id: int, page: int = 1, limit: int = 10) -> list[Review]: 
+
+    def get_by_user_id(self, user_id: int, page: int = 1, limit: int = 10) -> list[Review]:
         offset = (page - 1) * limit
-        sql = """SELECT * FROM reviews WHERE user_id = ? LIMIT ? OFFSET ?"""
-        
+        sql = BY_USER_SQL
+
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute(sql, (user_id, limit, offset))
-            rows = cursor.fetchall()
-            
-            reviews = []
-            for row in rows:
-                review = Review(
-                    id=row[0],
-                    hotel_id=row[1],
-                    place_id=row[2],
-                    user_id=row[3],
-                    text=row[4],
-                    rating=row[5],
-                    created_at=row[6]
-                )
-                reviews.append(review)
-            
-            return reviews
-            
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = Review.row_factory
+
+                cursor.execute(sql, (user_id, limit, offset))
+                return cursor.fetchall()
+
         except sqlite3.Error as e:
             logger.error(f"Ошибка в базе: {e}")
             raise e
-        finally:
-            if conn:
-                conn.close()
-                            
-                
+
+
     def update_review(self, review_id: int, update_data: dict) -> Review | None:
-        current_review = self.get_by_id(review_id)
-        
-        if current_review is None:
-            return None
-        
-        updated_text = update_data.get("text", current_review.text)
-        updated_rating = update_data.get("rating", current_review.rating)
-        
-        sql = """UPDATE reviews Set text = ?, rating = ? WHERE id = ?"""
+        """UPDATE ... RETURNING по переданным полям; при смене рейтинга
+        review_stats правится в той же транзакции без предварительного SELECT"""
+        assignments, params = build_update_set(update_data, UPDATABLE_COLUMNS)
+        if not assignments:
+            return self.get_by_id(review_id)
+
+        sql = f"""UPDATE reviews SET {assignments} WHERE id = ? RETURNING {REVIEW_COLUMNS}"""
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-
-            cursor.execute(sql,(updated_text, updated_rating, review_id))
-            conn.commit()
-            
-            return Review(
-                id=review_id,
-                hotel_id=current_review.hotel_id,
-                place_id=current_review.place_id,
-                user_id=current_review.user_id,
-                text=updated_text,
-                rating=updated_rating,
-                created_at=current_review.created_at
-            )
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = Review.row_factory
+
+                rating_changed = "rating" in update_data
+                if rating_changed:
+                    # Первая же запись берёт блокировку на запись — между ней и UPDATE никто не вклинится
+                    cursor.execute(STATS_FROM_REVIEW_SQL, {"delta": -1, "id": review_id})
+
+                cursor.execute(sql, (*params, review_id))
+                updated_review = cursor.fetchone()
+                if updated_review is None:
+                    return None
+
+                if rating_changed:
+                    _apply_stats(cursor, updated_review, +1)
+
+            return updated_review
         except sqlite3.Error as e:
             logger.error(f"Ошибка в базе: {e}")
-            if conn:
-                conn.rollback()
-                raise e
-        finally:
-            if conn:
-                conn.close()    
-        
-    def delete_review(self,review_id: int) -> bool:        
-        current_review = self.get_by_id(review_id)
-        if current_review is None:
-            return False
-        
-  
-        sql = """DELETE FROM reviews WHERE id = ?"""
+            raise e
+
+    def delete_review(self,review_id: int) -> bool:
+        sql = f"""DELETE FROM reviews WHERE id = ? RETURNING {REVIEW_COLUMNS}"""
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute(sql, (review_id,))
-            conn.commit()
-            
-            return cursor.rowcount > 0  
-            
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = Review.row_factory
+
+                cursor.execute(sql, (review_id,))
+                deleted_review = cursor.fetchone()
+                if deleted_review is None:
+                    return False
+
+                _apply_stats(cursor, deleted_review, -1)
+                _refresh_last_review_at(cursor, deleted_review)
+
+            return True
+
         except sqlite3.Error as e:
             logger.error(f"Ошибка в базе: {e}")
-            if conn:
-                conn.rollback()
             raise e
-        finally:
-            if conn:
-                conn.close()
-    
-    def get_all(self, page: int = 1, limit: int = 10) -> list[Review]: # все отзывы 
-        
+
+    def get_all(self, page: int = 1, limit: int = 10) -> list[Review]: # все отзывы
+
         offset = (page - 1) * limit
-        sql = """SELECT * FROM reviews LIMIT ? OFFSET ?"""
-        
+        sql = f"""SELECT {REVIEW_COLUMNS} FROM reviews LIMIT ? OFFSET ?"""
+
         try:
-            conn = sqlite3.connect(DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute(sql, (limit, offset))
-            rows = cursor.fetchall()
-            
-            reviews = []
-            for row in rows:
-                review = Review(
-                    id=row[0],
-                    hotel_id=row[1],
-                    place_id=row[2],
-                    user_id=row[3],
-                    text=row[4],
-                    rating=row[5],
-                    created_at=row[6]
-                )
-                reviews.append(review)
-            
-            return reviews
-            
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = Review.row_factory
+
+                cursor.execute(sql, (limit, offset))
+                return cursor.fetchall()
+
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка в базе: {e}")
+            raise e
+
+    def _fetch(self, sql: str, params: tuple) -> list[Review]:
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = Review.row_factory
+
+                cursor.execute(sql, params)
+                return cursor.fetchall()
+
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка в базе: {e}")
+            raise e
+
+    def get_by_hotel_id_after(self, hotel_id: int, after: tuple[str, int] = ("", 0), limit: int = 10) -> list[Review]:
+        return self._fetch(BY_HOTEL_AFTER_SQL, (hotel_id, after[0], after[1], limit))
+
+    def get_by_place_id_after(self, place_id: int, after: tuple[str, int] = ("", 0), limit: int = 10) -> list[Review]:
+        return self._fetch(BY_PLACE_AFTER_SQL, (place_id, after[0], after[1], limit))
+
+    def get_all_after(self, after_id: int = 0, limit: int = 10) -> list[Review]:
+        return self._fetch(ALL_AFTER_SQL, (after_id, limit))
+
+    def get_stats(self, target_type: str, target_id: int) -> dict | None:
+        """Агрегаты отзывов по первичному ключу review_stats"""
+        sql = """SELECT review_count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5, last_review_at
+        FROM review_stats WHERE target_type = ? AND target_id = ?"""
+        try:
+            with get_connection() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute(sql, (target_type, target_id))
+                row = cursor.fetchone()
+
+            if row is None:
+                return None
+
+            return {
+                "review_count": row[0],
+                "rating_sum": row[1],
+                "histogram": {score: row[1 + score] for score in range(1, 6)},
+                "last_review_at": row[7] or None,
+            }
         except sqlite3.Error as e:
             logger.error(f"Ошибка в базе: {e}")
             raise e
-        finally:
-            if conn:
-                conn.close()                    
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, model_validator
 
 
 
@@ -10,27 +10,13 @@ class ReviewCreate(BaseModel):
     text: str
     rating: int = Field(ge=1 , le=5)
     
-    @validator('hotel_id')
-    def validate_hotel_id(cls, hotel_id, values):
-        place_id = values.get('place_id')
-        if hotel_id is not None and place_id is not None:
+    @model_validator(mode='after')
+    def validate_target(self):
+        if self.hotel_id is not None and self.place_id is not None:
             raise ValueError('Можно указать только hotel_id или place_id')
-        return hotel_id
-    
-    @validator('place_id')
-    def validate_place_id(cls, place_id, values):
-        hotel_id = values.get('hotel_id')
-        if place_id is not None and hotel_id is not None:
-            raise ValueError('Можно указать только hotel_id или place_id')
-        return place_id
-    
-    @validator('hotel_id', 'place_id', always=True)
-    def validate_one_method(cls, values):
-        hotel_id = values.get('hotel_id')
-        place_id = values.get('place_id')
-        if hotel_id is None and place_id is None:
+        if self.hotel_id is None and self.place_id is None:
             raise ValueError('Должен быть указан hotel_id или place_id')
-        return values
+        return self
     
 class HotelReviewCreate(BaseModel):
     """Специальная схема для отзыва на отель"""
@@ -55,9 +41,19 @@ class ReviewResponse(BaseModel):
     hotel_id: int | None
     place_id: int | None
     user_id: int 
-    text: str  
-    rating: int 
+    text: str | None
+    rating: int | None
     created_at: str 
             
     class Config:
-        from_attributes = True            
\ No newline at end of file
+        from_attributes = True
+
+
+class ReviewStatsResponse(BaseModel):
+    """Агрегаты отзывов по отелю или месту"""
+    target_type: str
+    target_id: int
+    review_count: int = 0
+    average_rating: float | None = None
+    histogram: dict[int, int] = Field(default_factory=lambda: {score: 0 for score in range(1, 6)})
+    last_review_at: str | None = None
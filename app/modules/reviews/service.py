@@ -1,8 +1,11 @@
 from modules.hotels.service import HotelService
 from modules.places.service import PlaceService
-from modules.reviews.schemas import ReviewCreate, ReviewUpdate, ReviewResponse, HotelReviewCreate, PlaceReviewCreate
+from modules.reviews.schemas import ReviewCreate, ReviewUpdate, ReviewResponse, HotelReviewCreate, PlaceReviewCreate, ReviewStatsResponse
 from modules.reviews.repository import ReviewRepository
 from modules.reviews.models import Review
+from shared.pagination import CursorPage, encode_cursor, decode_cursor
+from shared.bulk import aiter_records, bulk_import, bulk_import_async, iter_records
+from shared.serialization import dump_list, dump_page
 
 
 
@@ -188,4 +191,120 @@ class ReviewService:
             created_at=review.created_at   
         )
         for review in reviews 
-        ]
\ No newline at end of file
+        ]
+
+    def get_all_reviews_json(self, page: int = 1, limit: int = 100) -> bytes:
+        """Тот же ответ, что у get_all_reviews, но JSON-байтами прямо из моделей"""
+        if page < 1:
+            raise ValueError("Номер страницы должен быть положительным")
+        if not 1 <= limit <= 100:
+            raise ValueError("Лимит должен быть 1 до 100")
+
+        return dump_list(Review, self.repository.get_all(page, limit))
+
+    def _review_page(self, reviews: list[Review], limit: int, cursor_key, as_json: bool = False):
+        has_more = len(reviews) > limit
+        reviews = reviews[:limit]
+        next_cursor = encode_cursor(*cursor_key(reviews[-1])) if has_more else None
+        if as_json:
+            return dump_page(Review, reviews, next_cursor)
+
+        return CursorPage[ReviewResponse](
+            items=[
+                ReviewResponse(
+                    id=review.id,
+                    hotel_id=review.hotel_id,
+                    place_id=review.place_id,
+                    user_id=review.user_id,
+                    text=review.text,
+                    rating=review.rating,
+                    created_at=review.created_at
+                )
+                for review in reviews
+            ],
+            next_cursor=next_cursor
+        )
+
+    def get_hotel_reviews_after(self, hotel_id: int, after: str = "", limit: int = 10) -> CursorPage[ReviewResponse]:
+
+        if self.hotel_service:
+            try:
+                self.hotel_service.get_hotel(hotel_id)
+            except ValueError:
+                raise ValueError(f"Отель с {hotel_id} не найден")
+
+        position = tuple(decode_cursor(after, 2)) if after else ("", 0)
+        reviews = self.repository.get_by_hotel_id_after(hotel_id, position, limit + 1)
+
+        return self._review_page(reviews, limit, lambda review: (review.created_at, review.id))
+
+    def get_place_reviews_after(self, place_id: int, after: str = "", limit: int = 10) -> CursorPage[ReviewResponse]:
+
+        if self.place_service:
+            try:
+                self.place_service.get_place(place_id)
+            except ValueError:
+                raise ValueError(f"Место с {place_id} не найден")
+
+        position = tuple(decode_cursor(after, 2)) if after else ("", 0)
+        reviews = self.repository.get_by_place_id_after(place_id, position, limit + 1)
+
+        return self._review_page(reviews, limit, lambda review: (review.created_at, review.id))
+
+    def _all_reviews_after(self, after: str, limit: int) -> list[Review]:
+        if not 1 <= limit <= 100:
+            raise ValueError("Лимит должен быть 1 до 100")
+
+        after_id = decode_cursor(after, 1)[0] if after else 0
+        return self.repository.get_all_after(after_id, limit + 1)
+
+    def get_all_reviews_after(self, after: str = "", limit: int = 10) -> CursorPage[ReviewResponse]:
+        return self._review_page(self._all_reviews_after(after, limit), limit, lambda review: (review.id,))
+
+    def get_all_reviews_after_json(self, after: str = "", limit: int = 10) -> bytes:
+        return self._review_page(self._all_reviews_after(after, limit), limit, lambda review: (review.id,), as_json=True)
+
+    def _stats(self, target_type: str, target_id: int) -> ReviewStatsResponse:
+        stats = self.repository.get_stats(target_type, target_id)
+        if stats is None or stats["review_count"] == 0:
+            return ReviewStatsResponse(target_type=target_type, target_id=target_id)
+
+        return ReviewStatsResponse(
+            target_type=target_type,
+            target_id=target_id,
+            review_count=stats["review_count"],
+            average_rating=round(stats["rating_sum"] / stats["review_count"], 2),
+            histogram=stats["histogram"],
+            last_review_at=stats["last_review_at"]
+        )
+
+    def get_hotel_stats(self, hotel_id: int) -> ReviewStatsResponse:
+
+        if self.hotel_service:
+            try:
+                self.hotel_service.get_hotel(hotel_id)
+            except ValueError:
+                raise ValueError(f"Отель с {hotel_id} не найден")
+
+        return self._stats("hotel", hotel_id)
+
+    def get_place_stats(self, place_id: int) -> ReviewStatsResponse:
+
+        if self.place_service:
+            try:
+                self.place_service.get_place(place_id)
+            except ValueError:
+                raise ValueError(f"Место с {place_id} не найден")
+
+        return self._stats("place", place_id)
+
+    def import_reviews(self, lines, fmt: str = "ndjson", chunk_size: int = 1000) -> dict:
+        """Массовый импорт из NDJSON/CSV: валидация схемой ReviewCreate, запись пачками"""
+        report = bulk_import(iter_records(lines, fmt), ReviewCreate, self.repository.create_reviews, chunk_size)
+        return report.to_dict()
+
+    async def import_reviews_stream(self, chunks, fmt: str = "ndjson", chunk_size: int = 1000) -> dict:
+        """То же для тела запроса: разбор в event loop, в поток БД уходят только пачки"""
+        report = await bulk_import_async(aiter_records(chunks, fmt), ReviewCreate, self.repository.create_reviews,
+                                         chunk_size)
+        return report.to_dict()
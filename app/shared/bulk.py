@@ -0,0 +1,240 @@
+import codecs
+import csv
+import json
+import logging
+import sqlite3
+import time
+from typing import AsyncIterator, Callable, Iterable, Iterator
+
+from pydantic import BaseModel, ValidationError
+
+from core.async_database import run_db
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {"ndjson", "csv"}
+MAX_REPORTED_ERRORS = 1000
+
+
+class BulkImportReport:
+    """Итог импорта: сколько строк записано, какие строки отклонены и скорость"""
+
+    def __init__(self):
+        self.total = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+        self.started_at = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add_error(self, offset: int, error: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"offset": offset, "error": error})
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started_at
+
+    @property
+    def rows_per_sec(self) -> float:
+        return round(self.inserted / self.elapsed, 1) if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "elapsed_sec": round(self.elapsed, 3),
+            "rows_per_sec": self.rows_per_sec,
+            "errors": self.errors,
+        }
+
+
+def detect_format(content_type: str) -> str:
+    """text/csv — CSV, всё остальное считаем NDJSON"""
+    return "csv" if "csv" in content_type.lower() else "ndjson"
+
+
+async def _aiter_line_batches(chunks: AsyncIterator[bytes]) -> AsyncIterator[list[str]]:
+    """Куски тела -> списки целых строк; хвост без перевода строки ждёт следующего куска.
+
+    Делим только по \n, как файл в CLI: splitlines() резал бы и по U+2028 и
+    другим разделителям, которые json.dumps(ensure_ascii=False) оставляет в строках.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    tail = ""
+    async for chunk in chunks:
+        lines = (tail + decoder.decode(chunk)).split("\n")
+        tail = lines.pop()
+        if lines:
+            yield [line.removesuffix("\r") for line in lines]
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield [tail.removesuffix("\r")]
+
+
+def iter_records(lines: Iterable[str], fmt: str = "ndjson") -> Iterator[tuple[int, dict | Exception]]:
+    """Построчно разбираем NDJSON/CSV, не загружая файл целиком.
+
+    Отдаём пары (offset, запись) — offset считается с нуля по строкам данных,
+    ошибка разбора возвращается вместо записи, чтобы не прерывать импорт.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат {fmt}, ожидается один из {sorted(FORMATS)}")
+
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for offset, row in enumerate(reader):
+            yield offset, {key: value for key, value in row.items() if value != ""}
+        return
+
+    offset = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Ожидается JSON-объект")
+            yield offset, record
+        except ValueError as e:
+            yield offset, e
+        offset += 1
+
+
+def _csv_records(lines: list[str], pending: str | None) -> tuple[list[str], str | None]:
+    """Склеиваем физические строки в записи CSV: перевод строки внутри кавычек
+    не конец записи, пока число кавычек нечётное"""
+    records = []
+    for line in lines:
+        if pending is not None:
+            line = pending + "\n" + line
+        if line.count('"') % 2:
+            pending = line
+        else:
+            pending = None
+            records.append(line)
+    return records, pending
+
+
+async def aiter_records(chunks: AsyncIterator[bytes], fmt: str = "ndjson") -> AsyncIterator[tuple[int, dict | Exception]]:
+    """iter_records для тела запроса: куски читаются и разбираются в event loop по мере прихода.
+
+    Каждая пачка строк разбирается тем же iter_records, offset продолжается
+    между пачками. В CSV заголовок подставляется перед каждой пачкой, а запись
+    с переводом строки в кавычках не разрывается между пачками.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат {fmt}, ожидается один из {sorted(FORMATS)}")
+
+    base = 0
+    header: list[str] = []
+    pending: str | None = None
+
+    async def batches() -> AsyncIterator[list[str]]:
+        nonlocal pending
+        async for lines in _aiter_line_batches(chunks):
+            if fmt == "csv":
+                lines, pending = _csv_records(lines, pending)
+            if lines:
+                yield lines
+        if pending is not None:
+            # Незакрытая кавычка в конце тела — пусть csv сообщит об ошибке сам
+            yield [pending]
+
+    async for lines in batches():
+        if fmt == "csv":
+            if not header:
+                header, lines = lines[:1], lines[1:]
+            lines = header + lines
+        count = 0
+        for offset, record in iter_records(lines, fmt):
+            yield base + offset, record
+            count = offset + 1
+        base += count
+
+
+def _write_chunk(report: BulkImportReport, chunk: list[tuple[int, BaseModel]],
+                 writer: Callable[[list[BaseModel]], int]):
+    """Пачка одной транзакцией; если она целиком откатилась (например, нарушено
+    ограничение БД), перезаписываем её по одной строке, чтобы указать offset виновных строк"""
+    try:
+        report.inserted += writer([item for _, item in chunk])
+    except sqlite3.Error as e:
+        logger.warning(f"Пачка из {len(chunk)} строк отклонена ({e}), пишем по одной")
+        for offset, item in chunk:
+            try:
+                report.inserted += writer([item])
+            except sqlite3.Error as row_error:
+                report.add_error(offset, str(row_error))
+
+
+def _validate(report: BulkImportReport, offset: int, record: dict | Exception,
+              schema: type[BaseModel]) -> BaseModel | None:
+    report.total += 1
+    if isinstance(record, Exception):
+        report.add_error(offset, str(record))
+        return None
+    try:
+        return schema.model_validate(record)
+    except ValidationError as e:
+        report.add_error(offset, "; ".join(error["msg"] for error in e.errors()))
+        return None
+
+
+def _finish(report: BulkImportReport, schema: type[BaseModel]) -> BulkImportReport:
+    report.finish()
+    logger.info(f"Импорт {schema.__name__}: {report.inserted}/{report.total} строк, {report.rows_per_sec} строк/сек")
+    return report
+
+
+def bulk_import(
+    records: Iterable[tuple[int, dict | Exception]],
+    schema: type[BaseModel],
+    writer: Callable[[list[BaseModel]], int],
+    chunk_size: int = 1000,
+) -> BulkImportReport:
+    """Валидируем записи схемой и пишем пачками через writer (executemany в одной транзакции)"""
+    report = BulkImportReport()
+    chunk: list[tuple[int, BaseModel]] = []
+
+    for offset, record in records:
+        item = _validate(report, offset, record, schema)
+        if item is None:
+            continue
+        chunk.append((offset, item))
+        if len(chunk) >= chunk_size:
+            _write_chunk(report, chunk, writer)
+            chunk = []
+
+    if chunk:
+        _write_chunk(report, chunk, writer)
+    return _finish(report, schema)
+
+
+async def bulk_import_async(
+    records: AsyncIterator[tuple[int, dict | Exception]],
+    schema: type[BaseModel],
+    writer: Callable[[list[BaseModel]], int],
+    chunk_size: int = 1000,
+) -> BulkImportReport:
+    """bulk_import для тела запроса: чтение и валидация в event loop, в поток БД
+    (run_db) уходит только запись готовой пачки. Пока клиент медленно шлёт тело,
+    поток БД свободен для остальных запросов.
+    """
+    report = BulkImportReport()
+    chunk: list[tuple[int, BaseModel]] = []
+
+    async for offset, record in records:
+        item = _validate(report, offset, record, schema)
+        if item is None:
+            continue
+        chunk.append((offset, item))
+        if len(chunk) >= chunk_size:
+            await run_db(_write_chunk, report, chunk, writer)
+            chunk = []
+
+    if chunk:
+        await run_db(_write_chunk, report, chunk, writer)
+    return _finish(report, schema)
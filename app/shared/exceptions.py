@@ -30,4 +30,12 @@ class ValidationException(TravelCompanionException):
         super().__init__(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=detail 
-        )
\ No newline at end of file
+        )
+        
+class TooManyRequestsException(TravelCompanionException):
+    def __init__(self, detail: str = "Слишком много запросов", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
@@ -0,0 +1,91 @@
+import sqlite3
+from dataclasses import fields
+from functools import lru_cache
+from typing import Callable, ClassVar, Sequence
+
+
+@lru_cache(maxsize=None)
+def _columns(cls) -> tuple[str, ...]:
+    return tuple(field.name for field in fields(cls))
+
+
+@lru_cache(maxsize=1024)
+def _plan(cls, names: tuple[str, ...]) -> tuple[bool, tuple[tuple[str, int, Callable | None], ...]]:
+    """Как разложить строку с колонками names по полям модели.
+
+    Первое значение — строку можно передать в конструктор как есть:
+    колонки идут в порядке полей и преобразований нет. Иначе — пары
+    (поле, индекс колонки, преобразование); лишние колонки (created_at из
+    SELECT * и т.п.) пропускаются.
+    """
+    columns = _columns(cls)
+    converters = cls._converters
+    positional = names == columns and not converters
+    mapping = tuple(
+        (name, names.index(name), converters.get(name))
+        for name in columns
+        if name in names
+    )
+    return positional, mapping
+
+
+@lru_cache(maxsize=1024)
+def _description_plan(cls, description: tuple):
+    return _plan(cls, tuple(column[0] for column in description))
+
+
+class RowModel:
+    """База моделей модулей: dataclass(slots=True) без __dict__ на экземпляр.
+
+    Поля модели — это имена колонок; строки SQLite раскладываются по именам
+    из cursor.description, а не по позициям row[0..N], поэтому порядок колонок
+    в SELECT и физический порядок в таблице не важны.
+    """
+
+    __slots__ = ()
+
+    # Преобразования значений из SQLite по имени колонки (0/1 -> bool и т.п.)
+    _converters: ClassVar[dict[str, Callable]] = {}
+
+    @classmethod
+    def columns(cls) -> tuple[str, ...]:
+        return _columns(cls)
+
+    @classmethod
+    def select_list(cls) -> str:
+        """Список колонок для SELECT/RETURNING в порядке полей модели"""
+        return ", ".join(_columns(cls))
+
+    @classmethod
+    def from_db_row(cls, row: Sequence, names: Sequence[str] | None = None):
+        """Единственный путь из строки БД в модель.
+
+        names — имена колонок строки; без них берутся из sqlite3.Row, а для
+        обычного кортежа считается, что колонки идут в порядке select_list().
+        """
+        if names is None:
+            names = row.keys() if isinstance(row, sqlite3.Row) else _columns(cls)
+        return cls._build(row, _plan(cls, tuple(names)))
+
+    @classmethod
+    def row_factory(cls, cursor: sqlite3.Cursor, row: tuple):
+        """cursor.row_factory = Model.row_factory — fetchall сразу отдаёт модели,
+        промежуточный список кортежей не накапливается"""
+        return cls._build(row, _description_plan(cls, cursor.description))
+
+    @classmethod
+    def _build(cls, row: Sequence, plan):
+        positional, mapping = plan
+        if positional:
+            return cls(*row)
+        return cls(**{
+            name: converter(row[index]) if converter and row[index] is not None else row[index]
+            for name, index, converter in mapping
+        })
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in _columns(type(self))}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**{name: data[name] for name in _columns(cls) if name in data})
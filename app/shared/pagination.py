@@ -0,0 +1,33 @@
+import base64
+import binascii
+import json
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """Страница keyset-пагинации: элементы и курсор на следующую страницу"""
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def encode_cursor(*values) -> str:
+    """Непрозрачный курсор из значений ключа сортировки последней записи"""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Обратное преобразование; ValueError, если курсор испорчен"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Некорректный курсор")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Некорректный курсор")
+    return values
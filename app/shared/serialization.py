@@ -0,0 +1,45 @@
+"""Быстрая сериализация списков и выгрузки: модели из SQLite сразу в JSON-байты.
+
+Обычный путь списка — модель -> *Response -> проверка по response_model ->
+jsonable_encoder -> json.dumps, то есть два преобразования на каждый элемент.
+Поля моделей RowModel совпадают с полями *Response, поэтому pydantic-core
+сериализует dataclass-модели напрямую, без промежуточных объектов.
+"""
+from functools import lru_cache
+from typing import Iterable
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from core.confing import settings
+
+
+class JSONBytesResponse(Response):
+    """Ответ из уже готовых JSON-байтов — FastAPI не проверяет и не кодирует их повторно"""
+    media_type = "application/json"
+
+
+def fast_json_enabled(endpoint: str) -> bool:
+    """Переключатель по эндпоинту: имена из settings.FAST_JSON_ENDPOINTS"""
+    return endpoint in settings.FAST_JSON_ENDPOINTS
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+def dump_list(model: type, items: list) -> bytes:
+    """JSON-массив моделей — те же байты, что у list[*Response] в обычном пути"""
+    return _list_adapter(model).dump_json(items)
+
+
+def dump_page(model: type, items: list, next_cursor: str | None) -> bytes:
+    """Страница в формате CursorPage: {"items": [...], "next_cursor": ...}"""
+    return b'{"items":' + dump_list(model, items) + b',"next_cursor":' + to_json(next_cursor) + b"}"
+
+
+def dump_ndjson(rows: Iterable[dict]) -> bytes:
+    """Пачка строк выгрузки в NDJSON одним проходом pydantic-core"""
+    return b"".join(to_json(row) + b"\n" for row in rows)
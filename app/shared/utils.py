@@ -17,6 +17,26 @@ def generate_random_string(length: int = 8) -> str:
     return ''.join(random.choice(letters) for _ in range(length))
 
 
+def accepts_encoding(header: str, coding: str) -> bool:
+    """Разрешает ли Accept-Encoding кодирование coding: явно или через *, с q > 0"""
+    qualities = {}
+    for item in header.split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[name.lower()] = q
+    q = qualities.get(coding.lower(), qualities.get("*", 0.0))
+    return q > 0
+
+
 def format_datetime(dt: datetime, format: str = "%Y-%m-%d %H:%M:%S") -> str:
     return dt.strftime(format)
 
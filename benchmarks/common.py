@@ -0,0 +1,51 @@
+"""Общие утилиты бенчмарков: пути, подготовка окружения, перцентили."""
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "app"
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+DEFAULT_DB = RESULTS_DIR / "bench_db.sqlite"
+
+
+def add_app_to_path():
+    """Модули приложения импортируются как в app/: core.*, modules.*"""
+    if str(APP_DIR) not in sys.path:
+        sys.path.insert(0, str(APP_DIR))
+
+
+def use_database(db_path: Path):
+    """Направляем приложение на БД бенчмарка до импорта модулей app/"""
+    os.environ["DATABASE_PATH"] = str(db_path)
+    add_app_to_path()
+
+    import core.database
+    core.database.DB_PATH = Path(db_path)
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float, statuses: dict | None = None) -> dict:
+    """Сводка по эндпоинту; задержки в миллисекундах, только по успешным запросам.
+
+    statuses — число не-2xx ответов по коду ("exception" — ответа не было вовсе).
+    """
+    values = sorted(latency * 1000 for latency in latencies)
+    total = len(values) + errors
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "non_2xx": dict(sorted((statuses or {}).items())),
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
@@ -0,0 +1,53 @@
+"""Стоимость verify_token на запрос: полный jwt.decode против кэша проверенных токенов.
+
+    python -m benchmarks.jwt_verify --iterations 100000 --tokens 100
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import add_app_to_path
+
+
+def measure(iterations: int, tokens: int, cached: bool) -> dict:
+    from modules.auth.jwt import create_tokens, verified_tokens, verify_token
+
+    issued = [
+        create_tokens({"user_id": i, "email": f"user{i}@example.com", "username": f"user{i}", "is_admin": False})["access_token"]
+        for i in range(1, tokens + 1)
+    ]
+    verified_tokens.enabled = cached
+    verified_tokens.clear()
+
+    started = time.perf_counter()
+    for i in range(iterations):
+        assert verify_token(issued[i % tokens]) is not None
+    elapsed = time.perf_counter() - started
+
+    return {
+        "cached": cached,
+        "iterations": iterations,
+        "distinct_tokens": tokens,
+        "us_per_call": round(elapsed / iterations * 1e6, 3),
+        "calls_per_sec": round(iterations / elapsed, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк verify_token")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--tokens", type=int, default=100, help="Сколько разных токенов крутится в нагрузке")
+    args = parser.parse_args(argv)
+
+    add_app_to_path()
+    before = measure(args.iterations, args.tokens, cached=False)
+    after = measure(args.iterations, args.tokens, cached=True)
+    print(json.dumps({
+        "decode": before,
+        "cached": after,
+        "speedup": round(before["us_per_call"] / after["us_per_call"], 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Память на страницу строк: кортежи, словари, прежние dict-модели и модели со __slots__.
+
+    python -m benchmarks.memory --rows 10000
+"""
+import argparse
+import gc
+import json
+import sqlite3
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.seed import seed
+
+PER_ROWS = 10_000
+
+
+class _LegacyReview:
+    """Модель до перехода на RowModel: обычный класс с __dict__ на экземпляр"""
+
+    def __init__(self, id, hotel_id, place_id, user_id, text, rating, created_at):
+        self.id = id
+        self.hotel_id = hotel_id
+        self.place_id = place_id
+        self.user_id = user_id
+        self.text = text
+        self.rating = rating
+        self.created_at = created_at
+
+
+def _strategies():
+    from modules.reviews.models import Review
+
+    columns = Review.columns()
+
+    def tuples(cursor):
+        return cursor.fetchall()
+
+    def dicts(cursor):
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def legacy(cursor):
+        return [_LegacyReview(id=row[0], hotel_id=row[1], place_id=row[2], user_id=row[3],
+                              text=row[4], rating=row[5], created_at=row[6]) for row in cursor.fetchall()]
+
+    def row_model(cursor):
+        cursor.row_factory = Review.row_factory
+        return cursor.fetchall()
+
+    return {"tuples": tuples, "dicts": dicts, "legacy_models": legacy, "slots_models": row_model}
+
+
+def measure(conn: sqlite3.Connection, rows: int, load) -> dict:
+    from modules.reviews.models import Review
+
+    sql = f"SELECT {Review.select_list()} FROM reviews ORDER BY id LIMIT ?"
+    gc.collect()
+    tracemalloc.start()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(sql, (rows,))
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = load(cursor)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    scale = PER_ROWS / len(result)
+    return {
+        "rows": len(result),
+        "retained_bytes_per_10k": round((retained - before) * scale),
+        "peak_bytes_per_10k": round((peak - before) * scale),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк памяти на строки отзывов")
+    parser.add_argument("--rows", type=int, default=PER_ROWS)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "memory.sqlite"
+        seed(db_path, reviews=args.rows, hotels=100, places=100, users=10)
+
+        conn = sqlite3.connect(db_path)
+        results = {name: measure(conn, args.rows, load) for name, load in _strategies().items()}
+        conn.close()
+
+    legacy = results["legacy_models"]["retained_bytes_per_10k"]
+    slots = results["slots_models"]["retained_bytes_per_10k"]
+    results["slots_vs_legacy"] = round(legacy / slots, 2) if slots else None
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Пропускная способность исходящих запросов к провайдерам без сети: фейковый сервер
+с записанными ответами, общий пул соединений против клиента на каждый запрос.
+
+    python -m benchmarks.providers --requests 2000 --concurrency 50 --latency-ms 20
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import add_app_to_path, summarize
+
+
+async def _run(search, requests: int, concurrency: int) -> tuple[list[float], int, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await search()
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def measure(requests: int, concurrency: int, latency: float, per_host: int) -> dict:
+    from integrations.fake_server import FakeProviderServer
+    from integrations.hotels.booking import BookingComProvider
+    from integrations.http import HttpClient
+
+    results = {}
+    for mode in ("client_per_request", "shared_pool"):
+        async with FakeProviderServer(latency=latency) as server:
+            base_url = f"{server.url}/booking"
+            shared = HttpClient(per_host=per_host, max_keepalive=per_host)
+
+            async def search():
+                if mode == "shared_pool":
+                    provider = BookingComProvider(base_url=base_url, client=shared)
+                    return await provider.search_hotels("Москва", "2024-06-01", "2024-06-03")
+                # Так выглядит наивная интеграция: новый клиент и новое соединение на запрос
+                own = HttpClient(per_host=per_host)
+                try:
+                    return await BookingComProvider(base_url=base_url, client=own).search_hotels(
+                        "Москва", "2024-06-01", "2024-06-03")
+                finally:
+                    await own.aclose()
+
+            latencies, errors, elapsed = await _run(search, requests, concurrency)
+            await shared.aclose()
+            results[mode] = {**summarize(latencies, errors, elapsed), "connections": server.connections}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк HTTP-клиента интеграций")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Задержка ответа фейкового провайдера")
+    parser.add_argument("--per-host", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    add_app_to_path()
+    results = asyncio.run(measure(args.requests, args.concurrency, args.latency_ms / 1000, args.per_host))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
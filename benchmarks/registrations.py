@@ -0,0 +1,114 @@
+"""Регистраций в секунду: одиночная запись, пакетная запись и полный путь через /auth/register.
+
+    python -m benchmarks.registrations --users 2000 --rounds 4
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import use_database
+
+
+def _users(prefix: str, count: int, hashed_password: str):
+    from modules.auth.models import User
+
+    return [
+        User(id=0, username=f"{prefix}{i}", email=f"{prefix}{i}@example.com", hashed_password=hashed_password)
+        for i in range(count)
+    ]
+
+
+def measure_repository(count: int, chunk_size: int, hashed_password: str) -> dict:
+    """Только запись в БД: хэш посчитан заранее, чтобы bcrypt не заслонял разницу"""
+    from modules.auth.repository import UserRepository
+
+    repository = UserRepository()
+
+    started = time.perf_counter()
+    for user in _users("single", count, hashed_password):
+        repository.create_user(user)
+    single = time.perf_counter() - started
+
+    users = _users("batch", count, hashed_password)
+    started = time.perf_counter()
+    for offset in range(0, count, chunk_size):
+        repository.create_users(users[offset:offset + chunk_size])
+    batch = time.perf_counter() - started
+
+    return {
+        "single_per_sec": round(count / single, 1),
+        "batch_per_sec": round(count / batch, 1),
+        "chunk_size": chunk_size,
+    }
+
+
+async def measure_api(count: int, concurrency: int) -> dict:
+    """Полный путь: валидация, bcrypt в пуле процессов, INSERT ... RETURNING"""
+    import httpx
+
+    from core.rate_limit import login_rate_limiter
+    from main import app, shutdown_event
+
+    login_rate_limiter.enabled = False
+    queue = asyncio.Queue()
+    for i in range(count):
+        queue.put_nowait(i)
+    failed = 0
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal failed
+        while not queue.empty():
+            i = queue.get_nowait()
+            response = await client.post("/auth/register", json={
+                "email": f"api{i}@example.com",
+                "username": f"api{i}",
+                "password": "Bench12345",
+                "password_confirm": "Bench12345",
+            })
+            failed += response.status_code != 200
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+    finally:
+        await shutdown_event()
+
+    return {"per_sec": round(count / elapsed, 1), "failed": failed, "concurrency": concurrency}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк регистрации")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=4, help="BCRYPT_ROUNDS для пути через API")
+    parser.add_argument("--api-users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        use_database(Path(tmp) / "registrations.sqlite")
+        import bcrypt
+        from core.confing import settings
+        from core.database import init_db
+
+        init_db()
+        settings.BCRYPT_ROUNDS = args.rounds
+        hashed_password = bcrypt.hashpw(b"Bench12345", bcrypt.gensalt(rounds=args.rounds)).decode("utf-8")
+
+        report = {
+            "users": args.users,
+            "bcrypt_rounds": args.rounds,
+            "repository": measure_repository(args.users, args.chunk_size, hashed_password),
+            "api": asyncio.run(measure_api(args.api_users, args.concurrency)),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""Нагрузочный прогон по всем роутерам.
+
+    python -m benchmarks.seed --reviews 100000
+    python -m benchmarks.run --mode inprocess --requests 500 --concurrency 20
+    python -m benchmarks.run --mode uvicorn --output benchmarks/results/after.json \\
+        --baseline benchmarks/results/before.json --max-regression 10
+
+Покрыты все роутеры приложения: hotels, places, reviews, auth, export и
+integrations, в каждом модуле — чтения и хотя бы одна запись (POST/PUT/DELETE,
+массовый импорт). Записи уникальны для прогона, hotels.delete удаляет только
+отели, созданные hotels.create в этом же прогоне, но остальные записи остаются
+в БД — для сравнимых результатов наполняйте её заново. Авторизованные роуты
+ходят от имени бенч-пользователя, benchmarks.seed делает его администратором.
+
+Результат — JSON с p50/p95/p99, RPS и числом не-2xx ответов по каждому
+эндпоинту. С --baseline прогон завершается с кодом 1, если p95 какого-то
+роута вырос больше, чем на --max-regression процентов, или выросла доля
+ошибок: быстрые 4xx/5xx иначе выглядели бы ускорением.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import httpx
+
+from benchmarks.common import APP_DIR, DEFAULT_DB, RESULTS_DIR, summarize, use_database
+from benchmarks.seed import BENCH_EMAIL, BENCH_PASSWORD
+
+
+class BenchState:
+    """Общее для эндпоинтов состояние прогона: токены бенч-пользователя и созданные записи"""
+
+    def __init__(self):
+        self.access_token = ""
+        self.refresh_tokens: list[str] = []
+        self.created_hotels: list[int] = []
+
+    def auth_headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    path: Callable[[random.Random], str]
+    body: Callable[[random.Random], dict] | None = None
+    # Сырое тело (NDJSON для массового импорта) вместо JSON
+    content: Callable[[random.Random], bytes] | None = None
+    headers: Callable[[], dict] | None = None
+    # Разбор ответа: запомнить созданный id или новый refresh-токен
+    after: Callable[[httpx.Response], None] | None = None
+    # bcrypt-эндпоинты намного медленнее остальных — гоняем их меньше
+    weight: float = 1.0
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Counter = field(default_factory=Counter)
+
+    async def send(self, client: httpx.AsyncClient, rnd: random.Random) -> httpx.Response:
+        headers = self.headers() if self.headers else {}
+        if self.content:
+            kwargs = {"content": self.content(rnd)}
+            headers["Content-Type"] = "application/x-ndjson"
+        else:
+            kwargs = {"json": self.body(rnd) if self.body else None}
+        response = await client.request(self.method, self.path(rnd), headers=headers, **kwargs)
+        await response.aread()
+        if self.after and response.is_success:
+            self.after(response)
+        return response
+
+
+def build_endpoints(hotels: int, places: int, state: BenchState) -> list[Endpoint]:
+    from shared.pagination import encode_cursor
+
+    counter = itertools.count()
+    # Уникален для прогона: повторный прогон по той же БД не должен упираться в занятые имена
+    run_id = f"{os.getpid()}_{uuid.uuid4().hex[:8]}"
+
+    def hotel_id(rnd):
+        return rnd.randint(1, hotels)
+
+    def place_id(rnd):
+        return rnd.randint(1, places)
+
+    def new_hotel(rnd):
+        return {"name": f"Бенч-отель {run_id} {next(counter)}", "address": f"ул. Бенч, {rnd.randint(1, 999)}",
+                "rating": round(rnd.uniform(1, 5), 1)}
+
+    def hotels_ndjson(rnd):
+        return "".join(json.dumps(new_hotel(rnd), ensure_ascii=False) + "\n" for _ in range(100)).encode("utf-8")
+
+    def created_hotel(rnd):
+        # Пустой список — отель, которого нет: 404 попадёт в ошибки прогона
+        return state.created_hotels.pop() if state.created_hotels else 0
+
+    def refresh_body(rnd):
+        # Токен одноразовый: after вернёт в пул выданный взамен
+        return {"refresh_token": state.refresh_tokens.pop()}
+
+    return [
+        Endpoint("health", "GET", lambda r: "/health"),
+        Endpoint("hotels.list", "GET", lambda r: "/hotels/?limit=50"),
+        Endpoint("hotels.list_page", "GET", lambda r: f"/hotels/?page={r.randint(1, max(1, hotels // 100))}&limit=50"),
+        Endpoint("hotels.list_after", "GET",
+                 lambda r: f"/hotels/?after={encode_cursor(r.randint(1, max(1, hotels // 2)))}&limit=50"),
+        Endpoint("hotels.get", "GET", lambda r: f"/hotels/{hotel_id(r)}"),
+        Endpoint("hotels.stats", "GET", lambda r: f"/hotels/{hotel_id(r)}/stats"),
+        Endpoint("hotels.search", "GET",
+                 lambda r: f"/hotels/search?city=Тестовая, {r.randint(1, 50)}&check_in=2024-06-01&check_out=2024-06-03"),
+        Endpoint("hotels.create", "POST", lambda r: "/hotels/", body=new_hotel,
+                 after=lambda response: state.created_hotels.append(response.json()["id"])),
+        Endpoint("hotels.update", "PUT", lambda r: f"/hotels/{hotel_id(r)}",
+                 body=lambda r: {"rating": round(r.uniform(1, 5), 1)}),
+        Endpoint("hotels.delete", "DELETE", lambda r: f"/hotels/{created_hotel(r)}"),
+        Endpoint("hotels.bulk", "POST", lambda r: "/hotels/bulk", content=hotels_ndjson, weight=0.1),
+        Endpoint("places.list", "GET", lambda r: "/places/?limit=50"),
+        Endpoint("places.get", "GET", lambda r: f"/places/{place_id(r)}"),
+        Endpoint("places.stats", "GET", lambda r: f"/places/{place_id(r)}/stats"),
+        Endpoint("places.create", "POST", lambda r: "/places/", body=lambda r: {
+            "name": f"Бенч-место {run_id} {next(counter)}", "type": "park",
+            "address": f"ул. Бенч, {r.randint(1, 999)}", "rating": round(r.uniform(1, 5), 1),
+        }),
+        Endpoint("reviews.list", "GET", lambda r: "/reviews/?limit=50"),
+        Endpoint("reviews.by_hotel", "GET", lambda r: f"/reviews/hotel/{hotel_id(r)}?limit=50"),
+        Endpoint("reviews.by_place", "GET", lambda r: f"/reviews/place/{place_id(r)}?limit=50"),
+        Endpoint("reviews.create", "POST", lambda r: "/reviews/", body=lambda r: {
+            "hotel_id": hotel_id(r), "user_id": 1, "text": f"Бенч-отзыв {run_id} {next(counter)}",
+            "rating": r.randint(1, 5),
+        }),
+        Endpoint("export.reviews_since", "GET", lambda r: "/export/reviews?since=2024-12-01"),
+        Endpoint("integrations.breakers", "GET", lambda r: "/integrations/breakers", headers=state.auth_headers),
+        Endpoint(
+            "auth.login", "POST", lambda r: "/auth/login",
+            body=lambda r: {"email": BENCH_EMAIL, "password": BENCH_PASSWORD},
+            weight=0.1,
+        ),
+        Endpoint("auth.me", "GET", lambda r: "/auth/me", headers=state.auth_headers),
+        Endpoint("auth.refresh", "POST", lambda r: "/auth/refresh", body=refresh_body,
+                 after=lambda response: state.refresh_tokens.append(response.json()["refresh_token"])),
+        Endpoint(
+            "auth.register", "POST", lambda r: "/auth/register",
+            body=lambda r: (lambda n: {
+                "email": f"bench{n}_{run_id}@example.com",
+                "username": f"bench{n}_{run_id}",
+                "password": BENCH_PASSWORD,
+                "password_confirm": BENCH_PASSWORD,
+            })(next(counter)),
+            weight=0.1,
+        ),
+    ]
+
+
+async def prepare(client: httpx.AsyncClient, state: BenchState, concurrency: int):
+    """Токены бенч-пользователя: access для авторизованных роутов и по refresh-токену
+    на воркера — каждый воркер auth.refresh крутит свою цепочку ротации"""
+    async def login() -> dict:
+        response = await client.post("/auth/login", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+        response.raise_for_status()
+        return response.json()
+
+    tokens = await asyncio.gather(*(login() for _ in range(max(1, concurrency))))
+    state.access_token = tokens[0]["access_token"]
+    state.refresh_tokens = [token["refresh_token"] for token in tokens if token.get("refresh_token")]
+
+
+async def drive(client: httpx.AsyncClient, endpoint: Endpoint, requests: int, concurrency: int, seed: int) -> dict:
+    """Гоняем один эндпоинт: `concurrency` воркеров делят `requests` запросов"""
+    rnd = random.Random(seed)
+    remaining = max(1, int(requests * endpoint.weight))
+    workers = min(concurrency, remaining)
+    queue = asyncio.Queue()
+    for _ in range(remaining):
+        queue.put_nowait(None)
+
+    async def worker():
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            try:
+                response = await endpoint.send(client, rnd)
+                status = str(response.status_code)
+            except Exception:
+                # В режиме inprocess необработанное исключение приложения долетает сюда
+                status = "exception"
+            if status.startswith("2"):
+                endpoint.latencies.append(time.perf_counter() - started)
+            else:
+                endpoint.errors += 1
+                endpoint.statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return summarize(endpoint.latencies, endpoint.errors, time.perf_counter() - started, endpoint.statuses)
+
+
+async def run_all(client: httpx.AsyncClient, endpoints: list[Endpoint], state: BenchState, args) -> dict:
+    await prepare(client, state, args.concurrency)
+    results = {}
+    for i, endpoint in enumerate(endpoints):
+        if args.only and endpoint.name not in args.only:
+            continue
+        # Прогрев: кэши, пул соединений, планы запросов
+        for _ in range(min(5, args.requests)):
+            try:
+                await endpoint.send(client, random.Random(i))
+            except Exception:
+                pass
+        results[endpoint.name] = await drive(client, endpoint, args.requests, args.concurrency, seed=i)
+        print(f"{endpoint.name:24} {json.dumps(results[endpoint.name])}")
+    return results
+
+
+async def run_inprocess(endpoints: list[Endpoint], state: BenchState, args) -> dict:
+    """Приложение в том же процессе через ASGITransport — без сети, только стек FastAPI"""
+    use_database(args.db)
+    from main import app, shutdown_event
+    from core.rate_limit import login_rate_limiter
+
+    # Бенчмарк логинится одним пользователем — лимит попыток входа ему помешает
+    login_rate_limiter.enabled = False
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            return await run_all(client, endpoints, state, args)
+    finally:
+        await shutdown_event()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(endpoints: list[Endpoint], state: BenchState, args) -> dict:
+    """Настоящий uvicorn в отдельном процессе на localhost"""
+    port = args.port or _free_port()
+    env = {**os.environ, "DATABASE_PATH": str(args.db), "LOGIN_RATE_LIMIT_ENABLED": "false"}
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+               "--port", str(port), "--workers", str(args.workers), "--log-level", "warning"]
+    server = subprocess.Popen(command, cwd=APP_DIR, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError("uvicorn не поднялся")
+                await asyncio.sleep(0.2)
+            return await run_all(client, endpoints, state, args)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def _error_rate(summary: dict) -> float:
+    # В старых результатах error_rate нет — считаем из errors/requests
+    if "error_rate" in summary:
+        return summary["error_rate"]
+    return summary["errors"] / summary["requests"] if summary.get("requests") else 0.0
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Роуты, у которых выросла доля ошибок или p95 вырос больше допустимого относительно baseline"""
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        errors_before, errors_now = _error_rate(before), _error_rate(current)
+        if errors_now > errors_before:
+            regressions.append(f"{name}: ошибки {errors_before:.2%} -> {errors_now:.2%} "
+                               f"({before['errors']} -> {current['errors']}, не-2xx {current.get('non_2xx', {})})")
+            continue
+        if not before.get("p95_ms"):
+            continue
+        change = (current["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+        if change > max_regression:
+            regressions.append(f"{name}: p95 {before['p95_ms']} -> {current['p95_ms']} мс (+{change:.1f}%)")
+    return regressions
+
+
+def _db_counts(db_path: Path) -> dict:
+    import sqlite3
+
+    conn = sqlite3.connect(db_path)
+    try:
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("hotels", "places", "reviews", "users")}
+    finally:
+        conn.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон TravelCompanion")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="БД, наполненная benchmarks.seed")
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--requests", type=int, default=500, help="Запросов на эндпоинт")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1, help="Воркеры uvicorn")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--only", nargs="*", help="Имена эндпоинтов, например hotels.get auth.login")
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "latest.json")
+    parser.add_argument("--baseline", type=Path, help="JSON предыдущего прогона для сравнения")
+    parser.add_argument("--max-regression", type=float, default=10.0, help="Допустимый рост p95, %%")
+    args = parser.parse_args(argv)
+
+    if not args.db.exists():
+        parser.error(f"{args.db} не найдена — сначала python -m benchmarks.seed")
+
+    use_database(args.db)
+    counts = _db_counts(args.db)
+    state = BenchState()
+    endpoints = build_endpoints(counts["hotels"], counts["places"], state)
+    runner = run_inprocess if args.mode == "inprocess" else run_uvicorn
+    results = asyncio.run(runner(endpoints, state, args))
+
+    report = {
+        "mode": args.mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "dataset": counts,
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "endpoints": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"Результаты: {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["endpoints"]
+        regressions = compare(results, baseline, args.max_regression)
+        for line in regressions:
+            print(f"РЕГРЕССИЯ {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Наполнение SQLite для бенчмарков.
+
+    python -m benchmarks.seed --reviews 100000
+    python -m benchmarks.seed --reviews 10000000 --db /tmp/bench.sqlite
+"""
+import argparse
+import random
+import sqlite3
+import time
+from pathlib import Path
+
+from benchmarks.common import DEFAULT_DB, use_database
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "Bench12345"
+CHUNK = 50_000
+
+
+def _chunks(rows, size: int = CHUNK):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def seed(db_path: Path, reviews: int, hotels: int, places: int, users: int, seed_value: int = 42) -> dict:
+    if db_path.exists():
+        db_path.unlink()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    use_database(db_path)
+    import bcrypt
+    from core.confing import settings
+    from core.database import init_db, rebuild_review_stats
+
+    init_db()
+    rnd = random.Random(seed_value)
+    started = time.perf_counter()
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA synchronous = OFF")
+    cursor = conn.cursor()
+
+    cursor.executemany(
+        "INSERT INTO hotels (name, address, rating) VALUES(?, ?, ?)",
+        ((f"Отель {i}", f"ул. Тестовая, {i}", round(rnd.uniform(1, 5), 1)) for i in range(hotels)),
+    )
+    cursor.executemany(
+        "INSERT INTO places (name, type, address, rating) VALUES(?, ?, ?, ?)",
+        ((f"Место {i}", rnd.choice(["museum", "park", "restaurant", "theater"]), f"ул. Мест, {i}",
+          round(rnd.uniform(1, 5), 1)) for i in range(places)),
+    )
+
+    password = bcrypt.hashpw(BENCH_PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode("utf-8")
+    # Администратор: бенчмарк ходит и в /integrations
+    cursor.execute("INSERT INTO users (email, username, hashed_password, is_admin) VALUES(?, ?, ?, 1)",
+                   (BENCH_EMAIL, "bench", password))
+    cursor.executemany(
+        "INSERT INTO users (email, username, hashed_password) VALUES(?, ?, ?)",
+        ((f"user{i}@example.com", f"user{i}", password) for i in range(1, users)),
+    )
+    conn.commit()
+
+    def review_rows():
+        for i in range(reviews):
+            on_hotel = rnd.random() < 0.7
+            yield (
+                rnd.randint(1, hotels) if on_hotel else None,
+                None if on_hotel else rnd.randint(1, places),
+                rnd.randint(1, users),
+                f"Отзыв {i}",
+                rnd.randint(1, 5),
+                f"2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} {rnd.randint(0, 23):02d}:00:00",
+            )
+
+    for chunk in _chunks(review_rows()):
+        cursor.executemany(
+            "INSERT INTO reviews (hotel_id, place_id, user_id, text, rating, created_at) VALUES(?, ?, ?, ?, ?, ?)",
+            chunk,
+        )
+        conn.commit()
+
+    rebuild_review_stats(cursor)
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+    return {
+        "db": str(db_path),
+        "hotels": hotels,
+        "places": places,
+        "users": users,
+        "reviews": reviews,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Наполнение БД для бенчмарков")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--reviews", type=int, default=10_000)
+    parser.add_argument("--hotels", type=int, default=1_000)
+    parser.add_argument("--places", type=int, default=1_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    args = parser.parse_args(argv)
+
+    print(seed(args.db, args.reviews, args.hotels, args.places, args.users))
+
+
+if __name__ == "__main__":
+    main()
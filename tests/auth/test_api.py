@@ -0,0 +1,183 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from core.confing import settings
+from core.hashing import password_hasher
+
+
+@pytest.fixture(autouse=True)
+def fast_bcrypt(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+
+
+def test_register_and_login(client: TestClient, clear_db):
+    """Тест регистрации и входа через пул хэширования"""
+    response = client.post("/auth/register", json={
+        "email": "new@example.com",
+        "username": "newuser",
+        "password": "Secret123",
+        "password_confirm": "Secret123",
+    })
+    assert response.status_code == 200
+    assert response.json()["email"] == "new@example.com"
+
+    response = client.post("/auth/login", json={"email": "new@example.com", "password": "Secret123"})
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+
+    stats = client.get("/health/auth").json()["hashing"]
+    assert stats["hash_time"]["count"] >= 2
+
+
+def test_login_wrong_password(client: TestClient, test_user, clear_db):
+    """Тест неверного пароля и несуществующего email"""
+    response = client.post("/auth/login", json={"email": test_user.email, "password": "Wrong12345"})
+    assert response.status_code == 401
+
+    response = client.post("/auth/login", json={"email": "nobody@example.com", "password": "Test12345"})
+    assert response.status_code == 401
+
+
+def test_login_rejected_when_hashing_saturated(client: TestClient, test_user, monkeypatch, clear_db):
+    """Тест: при заполненной очереди хэширования отвечаем 429, не дожидаясь bcrypt"""
+    monkeypatch.setattr(password_hasher, "_in_flight", password_hasher.workers + password_hasher.max_queue)
+
+    response = client.post("/auth/login", json={"email": test_user.email, "password": "Test12345"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"]
+
+
+def test_login_rehashes_outdated_cost(client: TestClient, test_user, user_repository, monkeypatch, clear_db):
+    """Тест: после входа хэш со старой стоимостью пересчитывается в фоне"""
+    assert test_user.hashed_password.startswith("$2b$04$")
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+
+    response = client.post("/auth/login", json={"email": test_user.email, "password": "Test12345"})
+    assert response.status_code == 200
+
+    user = user_repository.get_by_id(test_user.id)
+    assert user.hashed_password.startswith("$2b$05$")
+
+    response = client.post("/auth/login", json={"email": test_user.email, "password": "Test12345"})
+    assert response.status_code == 200
+
+
+def _login(client: TestClient, email: str) -> dict:
+    token = client.post("/auth/login", json={"email": email, "password": "Test12345"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_stateless_mode_skips_user_lookup(client: TestClient, test_user, monkeypatch, clear_db):
+    """Тест: в stateless-режиме профиль из токена, статус из БД один раз за TTL"""
+    from modules.auth.repository import UserRepository
+
+    headers = _login(client, test_user.email)
+    monkeypatch.setattr(settings, "AUTH_MODE", "stateless")
+
+    calls = []
+    original = UserRepository.is_active
+    monkeypatch.setattr(UserRepository, "is_active", lambda self, user_id: calls.append(user_id) or original(self, user_id))
+    monkeypatch.setattr(UserRepository, "get_by_id", lambda self, user_id: pytest.fail("лишний запрос к БД"))
+
+    for _ in range(3):
+        response = client.get("/auth/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["username"] == test_user.username
+
+    assert calls == [test_user.id]
+
+
+def test_stateless_mode_revocation(client: TestClient, test_user, user_repository, monkeypatch, clear_db):
+    """Тест: удалённый пользователь отклоняется сразу, не дожидаясь TTL"""
+    from modules.auth.service import AuthService
+
+    headers = _login(client, test_user.email)
+    monkeypatch.setattr(settings, "AUTH_MODE", "stateless")
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    assert AuthService(user_repository).delete_user(test_user.id)
+
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+
+def test_login_rate_limited_before_hashing(client: TestClient, test_user, monkeypatch, clear_db):
+    """Тест: сверх лимита попыток входа 429, bcrypt не вызывается"""
+    from core.rate_limit import login_rate_limiter
+
+    monkeypatch.setattr(login_rate_limiter, "per_email", 2)
+    for _ in range(2):
+        assert client.post("/auth/login", json={"email": test_user.email, "password": "Wrong12345"}).status_code == 401
+
+    hashed = password_hasher.stats()["hash_time"]["count"]
+    response = client.post("/auth/login", json={"email": test_user.email, "password": "Test12345"})
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    assert password_hasher.stats()["hash_time"]["count"] == hashed
+
+
+def _register(client: TestClient, email: str, username: str):
+    return client.post("/auth/register", json={
+        "email": email,
+        "username": username,
+        "password": "Secret123",
+        "password_confirm": "Secret123",
+    })
+
+
+def test_register_duplicates_use_unique_constraints(client: TestClient, test_user, clear_db):
+    """Тест: занятые email и username отклоняются прежними сообщениями"""
+    response = _register(client, "other@example.com", test_user.username)
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Имя пользователя {test_user.username} уже занято"
+
+    response = _register(client, test_user.email, "otheruser")
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Email {test_user.email} уже используется"
+
+
+def test_bulk_register_by_admin(client: TestClient, test_user, db_connection, clear_db):
+    """Тест: пакетная регистрация записывает новых и сообщает о занятых"""
+    db_connection.execute("UPDATE users SET is_admin = 1 WHERE id = ?", (test_user.id,))
+    db_connection.commit()
+    token = client.post("/auth/login", json={"email": test_user.email, "password": "Test12345"}).json()["access_token"]
+
+    users = [
+        {"email": f"bulk{i}@example.com", "username": f"bulk{i}", "password": "Secret123", "password_confirm": "Secret123"}
+        for i in range(3)
+    ]
+    users.append({"email": test_user.email, "username": "dup", "password": "Secret123", "password_confirm": "Secret123"})
+
+    response = client.post("/auth/users/bulk", json=users, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 3
+    assert report["errors"] == [{"offset": 3, "error": f"Email {test_user.email} уже используется"}]
+
+    response = client.post("/auth/login", json={"email": "bulk1@example.com", "password": "Secret123"})
+    assert response.status_code == 200
+
+
+def test_bulk_register_requires_admin(client: TestClient, test_user, clear_db):
+    """Тест: обычному пользователю пакетная регистрация недоступна"""
+    token = client.post("/auth/login", json={"email": test_user.email, "password": "Test12345"}).json()["access_token"]
+
+    response = client.post("/auth/users/bulk", json=[], headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+
+
+def test_update_user_partial_and_unique(user_repository, test_user, clear_db):
+    """Тест: обновление пользователя одним запросом, конфликт UNIQUE — прежнее сообщение"""
+    updated = user_repository.update_user(test_user.id, {"username": "renamed"})
+    assert updated.username == "renamed"
+    assert updated.email == test_user.email
+
+    other = user_repository.create_user(type(test_user)(id=0, username="other", email="other@example.com",
+                                                       hashed_password=test_user.hashed_password))
+    with pytest.raises(ValueError, match="уже используется"):
+        user_repository.update_user(other.id, {"email": test_user.email})
+
+    assert user_repository.delete_user(other.id)
+    assert not user_repository.delete_user(other.id)
+    assert user_repository.update_user(other.id, {"username": "ghost"}) is None
@@ -0,0 +1,50 @@
+import time
+
+import jwt
+
+from core.confing import settings
+from modules.auth.jwt import VerifiedTokenCache, create_tokens, verified_tokens, verify_token
+
+
+def _access_token(user_id: int = 1) -> str:
+    return create_tokens({"user_id": user_id, "email": "test@example.com", "is_admin": False})["access_token"]
+
+
+def test_verify_token_uses_cache():
+    """Тест: повторная проверка того же токена берётся из кэша"""
+    token = _access_token(101)
+    hits = verified_tokens.stats()["hits"]
+
+    first = verify_token(token)
+    first["user_id"] = -1
+    second = verify_token(token)
+
+    assert second["user_id"] == 101
+    assert verified_tokens.stats()["hits"] == hits + 1
+    # Тип проверяется и для токена из кэша
+    assert verify_token(token, token_type="refresh") is None
+
+
+def test_invalid_and_expired_tokens_not_cached():
+    """Тест: невалидные и истёкшие токены не попадают в кэш"""
+    expired = jwt.encode(
+        {"user_id": 1, "type": "access", "exp": int(time.time()) - 10},
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    entries = verified_tokens.stats()["entries"]
+
+    assert verify_token(expired) is None
+    assert verify_token("не-токен") is None
+    assert verified_tokens.stats()["entries"] == entries
+
+
+def test_cache_entry_lives_until_exp():
+    """Тест: запись кэша истекает вместе с токеном"""
+    cache = VerifiedTokenCache(max_entries=10)
+    cache.set("token", {"user_id": 1, "exp": time.time() + 0.05})
+
+    assert cache.get("token")["user_id"] == 1
+    time.sleep(0.06)
+    assert cache.get("token") is None
+    assert cache.stats()["expirations"] == 1
@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from core.confing import settings
+from modules.auth.jwt import create_tokens
+
+
+@pytest.fixture(autouse=True)
+def fast_bcrypt(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+
+
+def _login(client: TestClient, email: str) -> dict:
+    response = client.post("/auth/login", json={"email": email, "password": "Test12345"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _refresh(client: TestClient, refresh_token: str):
+    return client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_refresh_rotates_token(client: TestClient, test_user, clear_db):
+    """Тест: refresh выдаёт новую пару, а старый refresh-токен больше не принимается"""
+    tokens = _login(client, test_user.email)
+
+    response = _refresh(client, tokens["refresh_token"])
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+
+    assert _refresh(client, rotated["refresh_token"]).status_code == 200
+
+
+def test_refresh_reuse_revokes_family(client: TestClient, test_user, clear_db):
+    """Тест: повторное использование старого токена отзывает всю цепочку"""
+    tokens = _login(client, test_user.email)
+    rotated = _refresh(client, tokens["refresh_token"]).json()
+
+    response = _refresh(client, tokens["refresh_token"])
+    assert response.status_code == 401
+    assert "уже использован" in response.json()["detail"]
+
+    assert _refresh(client, rotated["refresh_token"]).status_code == 401
+
+    # Другие сессии пользователя не затронуты
+    other = _login(client, test_user.email)
+    assert _refresh(client, other["refresh_token"]).status_code == 200
+
+
+def test_logout_all_revokes_user_tokens(client: TestClient, test_user, clear_db):
+    """Тест: выход со всех устройств отзывает все refresh-токены пользователя"""
+    first = _login(client, test_user.email)
+    second = _login(client, test_user.email)
+
+    response = client.post("/auth/logout-all", headers={"Authorization": f"Bearer {second['access_token']}"})
+    assert response.status_code == 200
+    assert response.json()["revoked"] == 2
+
+    assert _refresh(client, first["refresh_token"]).status_code == 401
+    assert _refresh(client, second["refresh_token"]).status_code == 401
+
+
+def test_refresh_without_jti_rejected(client: TestClient, test_user, clear_db):
+    """Тест: токены без jti (выпущенные до хранилища) не обмениваются"""
+    tokens = create_tokens({"user_id": test_user.id, "email": test_user.email, "is_admin": False})
+
+    assert _refresh(client, tokens["refresh_token"]).status_code == 401
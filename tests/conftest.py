@@ -6,6 +6,11 @@ from datetime import datetime
 
 from app.main import app
 from core.database import DB_PATH, init_db
+from core.cache import response_cache
+from core.rate_limit import login_rate_limiter
+from integrations.cache import provider_cache
+from integrations.resilience import provider_policies
+from modules.auth.status import user_status_cache, revoked_tokens
 from modules.auth.models import User
 from modules.auth.repository import UserRepository
 from modules.auth.jwt import create_access_token
@@ -58,12 +63,20 @@ def clear_db(db_connection):
     """Очистка БД после каждого теста"""
     yield
     cursor = db_connection.cursor()
+    cursor.execute("DELETE FROM refresh_tokens")
     cursor.execute("DELETE FROM reviews")
+    cursor.execute("DELETE FROM review_stats")
     cursor.execute("DELETE FROM hotels")
     cursor.execute("DELETE FROM places")
     cursor.execute("DELETE FROM users")
     cursor.execute("DELETE FROM sqlite_sequence")  
     db_connection.commit()
+    response_cache.clear()
+    user_status_cache.clear()
+    revoked_tokens.clear()
+    login_rate_limiter.clear()
+    provider_cache.clear()
+    provider_policies.clear()
 
 
 
@@ -119,14 +132,18 @@ def user_repository():
 
 @pytest.fixture
 def test_user(user_repository):
-    """Тестовый пользователь"""
-    from modules.auth.schemas import UserCreate
+    """Тестовый пользователь (пароль Test12345); тесты без clear_db получают уже созданного"""
+    import bcrypt
     
-    user_data = UserCreate(
+    existing = user_repository.get_by_email("test@example.com")
+    if existing:
+        return existing
+    
+    user_data = User(
+        id=0,
         username="testuser",
         email="test@example.com",
-        password="Test12345",
-        password_confirm="Test12345"
+        hashed_password=bcrypt.hashpw(b"Test12345", bcrypt.gensalt(rounds=4)).decode("utf-8")
     )
     
     return user_repository.create_user(user_data)
@@ -0,0 +1,27 @@
+import asyncio
+import threading
+
+from core.async_database import run_db
+from core.confing import settings
+
+
+class _Repository:
+    def get_by_id(self, item_id: int):
+        return item_id, threading.current_thread().name
+
+
+def test_run_db_uses_db_executor():
+    """Тест: run_db выполняет вызовы репозитория в потоках БД"""
+    item_id, thread_name = asyncio.run(run_db(_Repository().get_by_id, 7))
+
+    assert item_id == 7
+    assert thread_name.startswith("db")
+
+
+def test_run_db_threadpool_mode(monkeypatch):
+    """Тест: режим threadpool оставляет старый путь через Starlette"""
+    monkeypatch.setattr(settings, "DB_EXECUTOR_MODE", "threadpool")
+
+    _, thread_name = asyncio.run(run_db(_Repository().get_by_id, 1))
+
+    assert not thread_name.startswith("db")
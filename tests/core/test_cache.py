@@ -0,0 +1,90 @@
+import threading
+import time
+
+from core.cache import MemoryCache, ResponseCache, MISS
+
+
+def test_lru_evicts_oldest_entry():
+    """Тест вытеснения самой старой записи"""
+    backend = MemoryCache(max_entries=2)
+    backend.set("a", 1, ttl=60)
+    backend.set("b", 2, ttl=60)
+    backend.get("a")
+    backend.set("c", 3, ttl=60)
+
+    assert backend.get("b") is MISS
+    assert backend.get("a") == 1
+    assert backend.stats()["evictions"] == 1
+
+
+def test_entry_expires_after_ttl():
+    """Тест истечения TTL"""
+    backend = MemoryCache()
+    backend.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+
+    assert backend.get("a") is MISS
+
+
+def test_byte_budget_is_respected():
+    """Тест ограничения по памяти"""
+    backend = MemoryCache(max_bytes=200)
+    for i in range(10):
+        backend.set(str(i), "x" * 50, ttl=60)
+
+    assert backend.stats()["bytes"] <= 200
+
+
+def test_response_cache_counts_hits_and_invalidates():
+    """Тест read-through и явной инвалидации"""
+    cache = ResponseCache(MemoryCache())
+    calls = []
+
+    def load():
+        calls.append(1)
+        return "hotel"
+
+    assert cache.get_or_load("hotel:1", load) == "hotel"
+    assert cache.get_or_load("hotel:1", load) == "hotel"
+    cache.invalidate("hotel:1")
+    cache.get_or_load("hotel:1", load)
+
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_loader_racing_invalidate_does_not_cache_stale_value():
+    """Тест: загрузчик, прочитавший строку до обновления, не кладёт её в кэш после invalidate"""
+    cache = ResponseCache(MemoryCache())
+    row = {"name": "Старое имя"}
+    read_done = threading.Event()
+    updated = threading.Event()
+
+    def slow_load():
+        value = dict(row)
+        read_done.set()
+        updated.wait()
+        return value
+
+    reader = threading.Thread(target=cache.get_or_load, args=("hotel:1", slow_load))
+    reader.start()
+    read_done.wait()
+    row["name"] = "Новое имя"
+    cache.invalidate("hotel:1")
+    updated.set()
+    reader.join()
+
+    assert cache.get_or_load("hotel:1", lambda: dict(row)) == {"name": "Новое имя"}
+    assert cache.stats()["stale_skips"] == 1
+
+
+def test_generations_are_kept_only_while_loading():
+    """Тест: инвалидации ключей, которые никто не загружает, не копят поколения"""
+    cache = ResponseCache(MemoryCache())
+    for i in range(1000):
+        cache.get_or_load(f"hotel:{i}", lambda: "hotel")
+        cache.invalidate(f"hotel:{i}")
+
+    assert cache._generations == {}
+    assert cache._loading == {}
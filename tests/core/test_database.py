@@ -0,0 +1,64 @@
+import sqlite3
+import pytest
+
+from core.confing import settings
+from core.database import ConnectionPool, PoolTimeoutError, storage_report
+
+
+def test_pool_reuses_connections(tmp_path):
+    """Тест повторного использования соединений"""
+    pool = ConnectionPool(tmp_path / "pool.sqlite", size=2)
+
+    with pool.connection() as conn:
+        first = conn
+    with pool.connection() as conn:
+        second = conn
+
+    assert first is second
+    stats = pool.stats()
+    assert stats["open"] == 1
+    assert stats["checkouts"] == 2
+    pool.close()
+
+
+def test_pool_rollback_on_error(tmp_path):
+    """Тест отката транзакции при ошибке"""
+    pool = ConnectionPool(tmp_path / "pool.sqlite", size=1)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t(id INTEGER)")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            raise sqlite3.IntegrityError("boom")
+
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    pool.close()
+
+
+def test_pool_timeout_when_exhausted(tmp_path):
+    """Тест ожидания свободного соединения"""
+    pool = ConnectionPool(tmp_path / "pool.sqlite", size=1, timeout=0.05)
+    conn = pool.acquire()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    pool.release(conn)
+    assert pool.stats()["waits"] == 1
+    pool.close()
+
+
+def test_storage_profile_applied(tmp_path):
+    """Тест применения pragma к соединениям пула"""
+    pool = ConnectionPool(tmp_path / "pool.sqlite", size=1)
+
+    with pool.connection() as conn:
+        report = storage_report(conn)
+
+    assert report["journal_mode"] == "wal"
+    assert report["synchronous"] == 1  # NORMAL
+    assert report["temp_store"] == 2  # MEMORY
+    assert report["busy_timeout"] == settings.SQLITE_BUSY_TIMEOUT_MS
+    pool.close()
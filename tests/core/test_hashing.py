@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.confing import settings
+from core.hashing import HashingBusyError, PasswordHasher, calibrate, hash_rounds
+
+
+def test_hash_and_verify_in_process_pool():
+    """Тест: bcrypt выполняется в пуле процессов, метрики заполняются"""
+    hasher = PasswordHasher(workers=1, max_queue=1)
+    try:
+        hashed = asyncio.run(hasher.hash("Secret123", rounds=4))
+
+        assert asyncio.run(hasher.verify("Secret123", hashed))
+        assert not asyncio.run(hasher.verify("Wrong123", hashed))
+        assert not asyncio.run(hasher.verify("Secret123", "не-хэш"))
+
+        stats = hasher.stats()
+        assert stats["hash_time"]["count"] == 3
+        assert stats["in_flight"] == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_rejects_over_queue_limit():
+    """Тест: сверх workers + max_queue задачи отклоняются сразу"""
+    hasher = PasswordHasher(workers=1, max_queue=1, mode="thread")
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(hasher._submit(release.wait))
+        second = asyncio.ensure_future(hasher._submit(release.wait))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(HashingBusyError):
+            await hasher.hash("Secret123", rounds=4)
+
+        release.set()
+        await asyncio.gather(first, second)
+
+    try:
+        asyncio.run(scenario())
+        assert hasher.stats()["rejected"] == 1
+        assert hasher.stats()["queue_wait"]["count"] == 2
+    finally:
+        hasher.shutdown()
+
+
+def test_needs_rehash(monkeypatch):
+    """Тест: стоимость читается из хэша и сравнивается с BCRYPT_ROUNDS"""
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 12)
+    hasher = PasswordHasher(workers=1, max_queue=1)
+
+    assert hash_rounds("$2b$12$" + "a" * 53) == 12
+    assert hash_rounds("не-хэш") is None
+    assert not hasher.needs_rehash("$2b$12$" + "a" * 53)
+    assert hasher.needs_rehash("$2b$10$" + "a" * 53)
+
+
+def test_calibrate_stops_past_target():
+    """Тест: калибровка выбирает стоимость в пределах цели и не идёт дальше первого превышения"""
+    rounds, timings = calibrate(target_ms=0.0, min_rounds=4, max_rounds=8, samples=1)
+
+    assert rounds == 4
+    assert list(timings) == [4]
@@ -0,0 +1,70 @@
+import pytest
+
+from core.rate_limit import LoginRateLimiter, MemoryRateLimitBackend, RateLimitExceeded
+
+
+def test_sliding_window_allows_limit_then_rejects(monkeypatch):
+    """Тест: в окне разрешено ровно limit запросов, затем — после выхода старейшего"""
+    now = [1000.0]
+    monkeypatch.setattr("core.rate_limit.time.monotonic", lambda: now[0])
+    backend = MemoryRateLimitBackend()
+
+    assert [backend.hit("k", 3, 60) for _ in range(3)] == [None, None, None]
+    assert backend.hit("k", 3, 60) == pytest.approx(60)
+
+    now[0] += 30
+    assert backend.hit("k", 3, 60) == pytest.approx(30)
+
+    now[0] += 30
+    assert backend.hit("k", 3, 60) is None
+    assert backend.stats()["rejected"] == 2
+
+
+def test_stale_keys_are_swept(monkeypatch):
+    """Тест: ключи без запросов дольше окна вычищаются, число ключей ограничено"""
+    now = [1000.0]
+    monkeypatch.setattr("core.rate_limit.time.monotonic", lambda: now[0])
+    backend = MemoryRateLimitBackend(max_keys=2, sweep_interval=10)
+
+    backend.hit("a", 1, 5)
+    backend.hit("b", 1, 5)
+    backend.hit("c", 1, 5)
+    assert backend.stats()["keys"] == 2
+
+    now[0] += 20
+    backend.hit("d", 1, 5)
+    assert backend.stats()["keys"] == 1
+
+
+def test_login_limiter_checks_ip_and_email():
+    """Тест: лимит по email срабатывает независимо от IP"""
+    limiter = LoginRateLimiter(MemoryRateLimitBackend(), per_ip=100, per_email=2, window=60)
+
+    limiter.check("1.1.1.1", "User@Example.com")
+    limiter.check("2.2.2.2", "user@example.com ")
+    with pytest.raises(RateLimitExceeded):
+        limiter.check("3.3.3.3", "user@example.com")
+
+    limiter.check("3.3.3.3", "other@example.com")
+
+
+def test_rejected_attempt_does_not_spend_other_limits():
+    """Тест: попытка, отклонённая по email, не тратит лимит IP"""
+    limiter = LoginRateLimiter(MemoryRateLimitBackend(), per_ip=2, per_email=1, window=60)
+
+    limiter.check("1.1.1.1", "user@example.com")
+    for _ in range(3):
+        with pytest.raises(RateLimitExceeded):
+            limiter.check("1.1.1.1", "user@example.com")
+
+    limiter.check("1.1.1.1", "other@example.com")
+
+
+def test_zero_limit_rejects_everything():
+    """Тест: лимит 0 запрещает все попытки, а не падает"""
+    backend = MemoryRateLimitBackend()
+    assert backend.hit("k", 0, 60) == 60
+
+    limiter = LoginRateLimiter(backend, per_ip=0, per_email=5, window=60)
+    with pytest.raises(RateLimitExceeded):
+        limiter.check("1.1.1.1", "user@example.com")
@@ -0,0 +1,232 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.singleflight import SingleFlight
+from integrations.cache import CachedHotelProvider, ProviderCache
+from integrations.hotels.base import BaseHotelProvider
+from modules.hotels.repository import hotel_lookups
+
+
+def test_threads_share_one_call():
+    """Тест: одновременные вызовы из потоков с одним ключом выполняют работу один раз"""
+    flight = SingleFlight("test")
+    calls = []
+    started = threading.Event()
+
+    def load():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return {"id": 1}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        first = pool.submit(flight.do, 1, load)
+        started.wait()
+        rest = [pool.submit(flight.do, 1, load) for _ in range(7)]
+        results = [first.result()] + [future.result() for future in rest]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats()["executed"] == 1
+    assert flight.stats()["coalesced"] == 7
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_thread_error_reaches_all_waiters_and_is_not_remembered():
+    """Тест: ошибка первого получают все ожидавшие, следующий вызов выполняется заново"""
+    flight = SingleFlight("test")
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.05)
+        raise ValueError("нет")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        first = pool.submit(flight.do, "k", fail)
+        started.wait()
+        second = pool.submit(flight.do, "k", fail)
+        for future in (first, second):
+            with pytest.raises(ValueError):
+                future.result()
+
+    assert flight.do("k", lambda: 42) == 42
+    assert flight.stats()["errors"] == 1
+
+
+def test_async_callers_share_one_call():
+    """Тест: одновременные корутины с одним ключом ждут одну работу, разные ключи — независимы"""
+    flight = SingleFlight("test")
+    calls = []
+
+    async def load(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key * 2
+
+    async def scenario():
+        return await asyncio.gather(*[flight.do_async(key, lambda key=key: load(key)) for key in (1, 1, 1, 2)])
+
+    assert asyncio.run(scenario()) == [2, 2, 2, 4]
+    assert sorted(calls) == [1, 2]
+    assert flight.stats()["coalesced"] == 2
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    """Тест: отмена первого ожидающего не отменяет работу для остальных"""
+    flight = SingleFlight("test")
+
+    async def load():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def scenario():
+        leader = asyncio.create_task(flight.do_async("k", load))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do_async("k", load))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+def test_disabled_flight_calls_every_time():
+    """Тест: выключенная склейка просто вызывает функцию"""
+    flight = SingleFlight("test", enabled=False)
+
+    assert flight.do(1, lambda: 1) == 1
+    assert flight.stats()["executed"] == 0
+
+
+def test_concurrent_cache_misses_hit_provider_once():
+    """Тест: одновременные промахи кэша провайдера по одному ключу — один запрос к провайдеру"""
+    class SlowDetails(BaseHotelProvider):
+        calls = 0
+
+        async def search_hotels(self, city, check_in, check_out, guests=2):
+            return []
+
+        async def get_hotel_details(self, hotel_id):
+            SlowDetails.calls += 1
+            await asyncio.sleep(0.01)
+            return {"id": hotel_id}
+
+        async def check_availability(self, hotel_id, check_in, check_out):
+            return True
+
+    cached = CachedHotelProvider("slow", SlowDetails(), ProviderCache())
+
+    async def scenario():
+        return await asyncio.gather(*[cached.get_hotel_details("7") for _ in range(20)])
+
+    results = asyncio.run(scenario())
+
+    assert all(result == {"id": "7"} for result in results)
+    assert SlowDetails.calls == 1
+
+
+def test_hotel_repository_reads_are_coalesced(hotel_repository, test_hotel, monkeypatch, clear_db):
+    """Тест: одновременные get_by_id одного отеля делают один SELECT"""
+    selects = []
+    original = hotel_repository._fetch_by_id
+
+    def slow_fetch(hotel_id):
+        selects.append(hotel_id)
+        time.sleep(0.05)
+        return original(hotel_id)
+
+    monkeypatch.setattr(hotel_repository, "_fetch_by_id", slow_fetch)
+    before = hotel_lookups.stats()["coalesced"]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        hotels = list(pool.map(hotel_repository.get_by_id, [test_hotel.id] * 8))
+
+    assert all(hotel.name == "Тестовый отель" for hotel in hotels)
+    assert len(selects) < 8
+    assert hotel_lookups.stats()["coalesced"] - before == 8 - len(selects)
+
+
+def test_work_cancelled_when_last_waiter_leaves():
+    """Тест: когда все ожидающие отменены, сама работа тоже отменяется"""
+    flight = SingleFlight("test")
+    state = {}
+
+    async def load():
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+
+    async def scenario():
+        waiters = [asyncio.create_task(flight.do_async("k", load)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        await asyncio.sleep(0.01)
+        assert "cancelled" not in state
+        waiters[1].cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+    assert state["cancelled"]
+    assert flight.stats()["in_flight"] == 0
+    assert flight.stats()["errors"] == 0
+
+
+def test_caller_right_after_abandon_starts_new_work():
+    """Тест: вызов, пришедший сразу после ухода последнего ожидающего, не получает чужую отмену"""
+    flight = SingleFlight("test")
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.05 if len(calls) == 1 else 0)
+        return len(calls)
+
+    async def scenario():
+        first = asyncio.create_task(flight.do_async("k", load))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        # Запустится в той же итерации цикла сразу после отмены first: работа ещё не done()
+        second = asyncio.create_task(flight.do_async("k", load))
+        await asyncio.gather(first, return_exceptions=True)
+        return await second
+
+    assert asyncio.run(scenario()) == 2
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_read_after_update_is_not_coalesced_with_older_read(hotel_repository, test_hotel, monkeypatch, clear_db):
+    """Тест: чтение, начатое после update, не получает результат SELECT, начатого до него"""
+    original = hotel_repository._fetch_by_id
+    started, release = threading.Event(), threading.Event()
+
+    def fetch(hotel_id):
+        if not started.is_set():
+            hotel = original(hotel_id)
+            started.set()
+            release.wait(1.0)
+            return hotel
+        return original(hotel_id)
+
+    monkeypatch.setattr(hotel_repository, "_fetch_by_id", fetch)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        before = pool.submit(hotel_repository.get_by_id, test_hotel.id)
+        started.wait()
+        hotel_repository.update_hotel(test_hotel.id, {"name": "Новое имя"})
+        after = pool.submit(hotel_repository.get_by_id, test_hotel.id)
+        after_name = after.result(timeout=0.5).name
+        release.set()
+        before_name = before.result().name
+
+    assert before_name == "Тестовый отель"
+    assert after_name == "Новое имя"
+    assert hotel_lookups.stats()["in_flight"] == 0
@@ -0,0 +1,86 @@
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+
+from core.database import get_pool
+from modules.export.repository import ExportRepository
+
+
+def test_export_hotels_ndjson(client: TestClient, test_hotel, clear_db):
+    """Тест потоковой выгрузки отелей в NDJSON"""
+    response = client.get("/export/hotels", headers={"Accept-Encoding": "identity"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows[0]["id"] == test_hotel.id
+    assert rows[0]["created_at"]
+
+
+def test_export_since_filter(client: TestClient, test_hotel, clear_db):
+    """Тест инкрементальной выгрузки по created_at"""
+    response = client.get("/export/hotels", params={"since": "2999-01-01T00:00:00"})
+
+    assert response.status_code == 200
+    assert response.text == ""
+
+
+def test_export_since_with_offset_is_converted_to_utc(client: TestClient, test_hotel, db_connection, clear_db):
+    """Тест: since со смещением сравнивается с created_at в UTC, а не как местное время"""
+    db_connection.execute("UPDATE hotels SET created_at = '2024-06-01 10:00:00' WHERE id = ?", (test_hotel.id,))
+    db_connection.commit()
+
+    # 12:30+03:00 — это 09:30 UTC, отель создан позже
+    response = client.get("/export/hotels", params={"since": "2024-06-01T12:30:00+03:00"})
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [test_hotel.id]
+
+    # 13:30+03:00 — это 10:30 UTC, отель создан раньше
+    response = client.get("/export/hotels", params={"since": "2024-06-01T13:30:00+03:00"})
+    assert response.text == ""
+
+
+def test_export_gzip(client: TestClient, test_place, clear_db):
+    """Тест сжатия выгрузки на лету"""
+    # iter_raw отдаёт байты без автоматической распаковки httpx
+    with client.stream("GET", "/export/places", params={"gzip": True},
+                       headers={"Accept-Encoding": "identity"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        raw = b"".join(response.iter_raw())
+
+    rows = [json.loads(line) for line in gzip.decompress(raw).decode("utf-8").splitlines()]
+    assert rows[0]["id"] == test_place.id
+
+
+def test_export_unknown_table(client: TestClient):
+    """Тест запрета выгрузки пользователей"""
+    response = client.get("/export/users")
+
+    assert response.status_code == 422
+
+
+def test_open_exports_do_not_hold_pool_connections(client: TestClient, test_hotel, clear_db, monkeypatch):
+    """Тест: пока открыто больше выгрузок, чем соединений в пуле, остальные роуты работают"""
+    pool = get_pool()
+    monkeypatch.setattr(pool, "timeout", 0.2)
+    exports = [ExportRepository().iter_rows("hotels", batch_size=1) for _ in range(pool.size + 1)]
+    for export in exports:
+        next(export)
+
+    try:
+        response = client.get(f"/hotels/{test_hotel.id}")
+        assert response.status_code == 200
+        assert pool.stats()["in_use"] == 0
+    finally:
+        for export in exports:
+            export.close()
+
+
+def test_export_respects_gzip_refusal(client: TestClient, test_hotel, clear_db):
+    """Тест: gzip;q=0 — явный отказ от сжатия, а не согласие"""
+    response = client.get("/export/hotels", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "content-encoding" not in response.headers
+    assert json.loads(response.text.splitlines()[0])["id"] == test_hotel.id
+
+    response = client.get("/export/hotels", headers={"Accept-Encoding": "br, *;q=0.5"})
+    assert response.headers["content-encoding"] == "gzip"
@@ -0,0 +1,114 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from modules.hotels.schemas import HotelCreate
+
+
+def test_get_hotels_cursor_pagination(client: TestClient, hotel_repository, clear_db):
+    """Тест keyset-пагинации отелей"""
+    for i in range(5):
+        hotel_repository.create_hotel(HotelCreate(name=f"Отель {i}", address="ул. Тестовая", rating=4))
+
+    response = client.get("/hotels/", params={"after": "", "limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert [hotel["name"] for hotel in data["items"]] == ["Отель 0", "Отель 1"]
+    assert data["next_cursor"]
+
+    seen = [hotel["id"] for hotel in data["items"]]
+    cursor = data["next_cursor"]
+    while cursor:
+        data = client.get("/hotels/", params={"after": cursor, "limit": 2}).json()
+        seen.extend(hotel["id"] for hotel in data["items"])
+        cursor = data["next_cursor"]
+
+    assert seen == sorted(seen)
+    assert len(seen) == 5
+
+
+def test_get_hotels_invalid_cursor(client: TestClient):
+    """Тест испорченного курсора"""
+    response = client.get("/hotels/", params={"after": "не-курсор"})
+
+    assert response.status_code == 400
+
+
+def test_update_hotel_invalidates_cache(client: TestClient, test_hotel, clear_db):
+    """Тест сброса кэша после обновления отеля"""
+    assert client.get(f"/hotels/{test_hotel.id}").json()["name"] == "Тестовый отель"
+
+    response = client.put(f"/hotels/{test_hotel.id}", json={"name": "Новое имя", "address": "ул. Новая, 2", "rating": 4.0})
+    assert response.status_code == 200
+
+    assert client.get(f"/hotels/{test_hotel.id}").json()["name"] == "Новое имя"
+
+
+def test_bulk_create_hotels(client: TestClient, clear_db):
+    """Тест массового импорта отелей с отчётом об ошибочных строках"""
+    body = "\n".join([
+        '{"name": "Отель 1", "address": "ул. 1", "rating": 4.5}',
+        '{"name": "Отель 2", "address": "ул. 2", "rating": 9}',
+        'не json',
+        '{"name": "Отель 3", "address": "ул. 3", "rating": 3}',
+    ])
+
+    response = client.post("/hotels/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 2
+    assert [error["offset"] for error in report["errors"]] == [1, 2]
+
+
+def test_bulk_create_hotels_keeps_unicode_line_separators(client: TestClient, clear_db):
+    """Тест: U+2028 внутри строки JSON не разрывает запись, как и при импорте файла из CLI"""
+    body = "\r\n".join([
+        json.dumps({"name": "Отель\u2028у моря", "address": "ул. 1", "rating": 4}, ensure_ascii=False),
+        json.dumps({"name": "Отель 2", "address": "ул. 2", "rating": 3}, ensure_ascii=False),
+    ])
+
+    response = client.post("/hotels/bulk", content=body.encode("utf-8"),
+                           headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.json()["inserted"] == 2
+    assert response.json()["failed"] == 0
+    names = {hotel["name"] for hotel in client.get("/hotels/", params={"limit": 10}).json()}
+    assert names == {"Отель\u2028у моря", "Отель 2"}
+
+
+def test_bulk_create_hotels_csv(client: TestClient, clear_db):
+    """Тест массового импорта отелей из CSV"""
+    body = "name,address,rating\nОтель 1,ул. 1,4.5\nОтель 2,ул. 2,3\n"
+
+    response = client.post("/hotels/bulk", content=body, headers={"Content-Type": "text/csv"})
+
+    assert response.json()["inserted"] == 2
+    assert len(client.get("/hotels/", params={"limit": 10}).json()) == 2
+
+
+def test_partial_update_hotel(client: TestClient, test_hotel, clear_db):
+    """Тест: обновляются только переданные поля"""
+    response = client.put(f"/hotels/{test_hotel.id}", json={"rating": 3.5})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["rating"] == 3.5
+    assert data["name"] == "Тестовый отель"
+    assert data["address"] == "ул. Тестовая, 1"
+
+
+def test_update_and_delete_missing_hotel(client: TestClient, clear_db):
+    """Тест: запись в несуществующий отель — 404 без отдельного чтения"""
+    assert client.put("/hotels/999999", json={"name": "Нет такого"}).status_code == 404
+
+    response = client.delete("/hotels/999999")
+    assert response.status_code == 404
+
+
+def test_delete_hotel(client: TestClient, test_hotel, clear_db):
+    """Тест удаления отеля"""
+    assert client.get(f"/hotels/{test_hotel.id}").status_code == 200
+
+    assert client.delete(f"/hotels/{test_hotel.id}").status_code == 200
+    assert client.get(f"/hotels/{test_hotel.id}").status_code == 404
@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from integrations.hotels.base import BaseHotelProvider
+from integrations.hotels.registry import HotelProviderRegistry
+
+
+class _Provider(BaseHotelProvider):
+    def __init__(self, hotels, delay: float = 0.0, error: Exception | None = None):
+        self.hotels = hotels
+        self.delay = delay
+        self.error = error
+
+    async def search_hotels(self, city, check_in, check_out, guests=2):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.hotels
+
+    async def get_hotel_details(self, hotel_id):
+        return None
+
+    async def check_availability(self, hotel_id, check_in, check_out):
+        return True
+
+
+@pytest.fixture
+def providers(monkeypatch, test_hotel):
+    registry = HotelProviderRegistry()
+    registry.register("fast", _Provider([
+        {"id": "f1", "name": "Отель у моря", "address": "Тестовая набережная", "price": 3000, "rating": 4.0},
+        # Тот же отель, что test_hotel — должен слиться с локальным
+        {"id": "f2", "name": test_hotel.name, "address": test_hotel.address, "price": 4200, "rating": 4.5},
+    ], delay=0.01))
+    registry.register("slow", _Provider([{"id": "s1", "name": "Опоздавший", "address": "Тестовая, 9"}], delay=2.0))
+    registry.register("broken", _Provider([], error=RuntimeError("502 Bad Gateway")))
+    monkeypatch.setattr("modules.hotels.api.hotel_providers", registry)
+    return registry
+
+
+def test_search_returns_partial_results_by_deadline(client: TestClient, providers, test_hotel, clear_db):
+    """Тест: ждём не дольше дедлайна, отдаём успевших и локальные отели"""
+    started = time.perf_counter()
+    response = client.get("/hotels/search", params={"city": "Тестовая", "check_in": "2024-06-01",
+                                                     "check_out": "2024-06-03", "deadline_ms": 200})
+    elapsed = time.perf_counter() - started
+
+    assert response.status_code == 200
+    assert elapsed < 1.0
+    data = response.json()
+    assert data["partial"] is True
+    assert data["providers"]["fast"]["status"] == "ok"
+    assert data["providers"]["slow"]["status"] == "timeout"
+    assert data["providers"]["broken"]["status"] == "error"
+
+    local = data["items"][0]
+    assert local["source"] == "local" and local["id"] == str(test_hotel.id)
+    assert local["sources"] == ["local", "fast"]
+    assert local["price"] == 4200
+    assert [item["id"] for item in data["items"]] == [str(test_hotel.id), "f1"]
+
+    stats = providers.stats()
+    assert stats["slow"]["timeouts"] == 1 and stats["broken"]["errors"] == 1 and stats["fast"]["ok"] == 1
+
+
+def test_malformed_provider_items_are_skipped(client: TestClient, monkeypatch, clear_db):
+    """Тест: битая запись одного провайдера не роняет поиск — она пропускается, провайдер degraded"""
+    registry = HotelProviderRegistry()
+    registry.register("sloppy", _Provider([
+        {"id": "ok1", "name": "Целый отель", "address": "Тестовая, 1"},
+        {"name": "Без id"},
+        {"id": "no-name"},
+        "не объект",
+    ]))
+    registry.register("fast", _Provider([{"id": "f1", "name": "Отель у моря", "address": "Тестовая, 2"}]))
+    monkeypatch.setattr("modules.hotels.api.hotel_providers", registry)
+
+    response = client.get("/hotels/search", params={"city": "Тестовая", "check_in": "2024-06-01",
+                                                     "check_out": "2024-06-03"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert sorted(item["id"] for item in data["items"]) == ["f1", "ok1"]
+    assert data["providers"]["sloppy"]["status"] == "degraded"
+    assert data["providers"]["sloppy"]["skipped"] == 3
+    assert data["providers"]["fast"]["status"] == "ok"
+    assert data["partial"] is True
+
+
+def test_search_route_declared_before_hotel_id(client: TestClient, clear_db):
+    """Тест: /hotels/search не перехватывается маршрутом /hotels/{hotel_id}"""
+    response = client.get("/hotels/search", params={"city": "Москва", "check_in": "2024-06-01",
+                                                     "check_out": "2024-06-03"})
+
+    assert response.status_code == 200
+    assert response.json()["providers"]["booking"]["status"] == "ok"
+
+
+def test_late_provider_is_cancelled_through_cache():
+    """Тест: по дедлайну запрос опоздавшего провайдера отменяется, а не продолжает работать в фоне"""
+    from integrations.cache import CachedHotelProvider, ProviderCache
+
+    class Hanging(BaseHotelProvider):
+        cancelled = False
+        finished = False
+
+        async def search_hotels(self, city, check_in, check_out, guests=2):
+            try:
+                await asyncio.sleep(1.0)
+                Hanging.finished = True
+                return []
+            except asyncio.CancelledError:
+                Hanging.cancelled = True
+                raise
+
+        async def get_hotel_details(self, hotel_id):
+            return None
+
+        async def check_availability(self, hotel_id, check_in, check_out):
+            return True
+
+    registry = HotelProviderRegistry()
+    registry.register("hanging", CachedHotelProvider("hanging", Hanging(), ProviderCache()))
+
+    async def scenario():
+        _, statuses = await registry.search_hotels("Москва", "2024-06-01", "2024-06-03", 2, deadline=0.05)
+        await asyncio.sleep(0.01)
+        # Проверяем до выхода из цикла: при закрытии asyncio.run отменил бы задачу сам
+        return statuses, Hanging.cancelled
+
+    statuses, cancelled = asyncio.run(scenario())
+
+    assert statuses["hanging"]["status"] == "timeout"
+    assert cancelled and not Hanging.finished
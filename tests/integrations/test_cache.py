@@ -0,0 +1,195 @@
+import asyncio
+
+import pytest
+
+from integrations.cache import CachedHotelProvider, CachedPlaceProvider, ProviderCache, SQLiteCacheStore, cache_key
+from integrations.hotels.base import BaseHotelProvider
+from integrations.places.base import BasePlaceProvider
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _CountingHotels(BaseHotelProvider):
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    async def search_hotels(self, city, check_in, check_out, guests=2):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("провайдер недоступен")
+        return [{"id": str(self.calls), "name": f"Отель {city}", "address": "ул. Ленина, 1"}]
+
+    async def get_hotel_details(self, hotel_id):
+        self.calls += 1
+        return {"id": hotel_id}
+
+    async def check_availability(self, hotel_id, check_in, check_out):
+        self.calls += 1
+        return True
+
+
+class _CountingPlaces(BasePlaceProvider):
+    def __init__(self):
+        self.calls = 0
+
+    async def search_places(self, query, location=None, radius=1000, limit=20):
+        self.calls += 1
+        return [{"id": str(self.calls), "name": query}]
+
+    async def get_place_details(self, place_id):
+        return None
+
+    async def get_place_photos(self, photo_reference, max_width=400):
+        return None
+
+    async def get_place_reviews(self, place_id, limit=10):
+        return []
+
+
+def test_cache_key_normalizes_params():
+    """Тест: регистр и пробелы не важны, близкие координаты попадают в одну ячейку"""
+    assert cache_key("booking", "search_hotels", city="  Москва ", guests=2) == \
+        cache_key("booking", "search_hotels", city="москва", guests=2)
+    assert cache_key("fsq", "search_places", location=(55.7512, 37.6181)) == \
+        cache_key("fsq", "search_places", location=(55.7549, 37.6102))
+    assert cache_key("fsq", "search_places", location=(55.7512, 37.6181)) != \
+        cache_key("fsq", "search_places", location=(55.7612, 37.6181))
+
+
+def test_fresh_hit_skips_provider():
+    """Тест: повторный поиск в пределах TTL не ходит к провайдеру"""
+    provider = _CountingHotels()
+    cache = ProviderCache(ttl=60, stale=60, clock=_Clock())
+    cached = CachedHotelProvider("booking", provider, cache)
+
+    async def scenario():
+        first = await cached.search_hotels("Москва", "2024-06-01", "2024-06-03")
+        second = await cached.search_hotels("москва", "2024-06-01", "2024-06-03")
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second
+    assert provider.calls == 1
+    stats = cache.stats()["providers"]["booking"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_availability_is_not_cached():
+    """Тест: наличие мест всегда запрашивается у провайдера"""
+    provider = _CountingHotels()
+    cached = CachedHotelProvider("booking", provider, ProviderCache(clock=_Clock()))
+
+    async def scenario():
+        await cached.check_availability("1", "2024-06-01", "2024-06-03")
+        await cached.check_availability("1", "2024-06-01", "2024-06-03")
+
+    asyncio.run(scenario())
+
+    assert provider.calls == 2
+
+
+def test_stale_entry_served_and_refreshed_in_background():
+    """Тест: после TTL отдаётся старое значение, обновление идёт в фоне один раз"""
+    provider = _CountingHotels()
+    clock = _Clock()
+    cache = ProviderCache(ttl=60, stale=60, clock=clock)
+    cached = CachedHotelProvider("booking", provider, cache)
+
+    async def scenario():
+        first = await cached.search_hotels("Москва", "2024-06-01", "2024-06-03")
+        clock.now += 90
+        stale = await asyncio.gather(*[cached.search_hotels("Москва", "2024-06-01", "2024-06-03") for _ in range(5)])
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        fresh = await cached.search_hotels("Москва", "2024-06-01", "2024-06-03")
+        return first, stale, fresh
+
+    first, stale, fresh = asyncio.run(scenario())
+
+    assert all(items == first for items in stale)
+    assert fresh[0]["id"] == "2"
+    assert provider.calls == 2
+    stats = cache.stats()["providers"]["booking"]
+    assert stats["stale_hits"] == 5
+    assert stats["refreshes"] == 1
+
+
+def test_failed_refresh_keeps_stale_and_errors_are_not_cached():
+    """Тест: ошибка фонового обновления не портит запись; за окном stale ошибка доходит до вызывающего"""
+    provider = _CountingHotels()
+    clock = _Clock()
+    cache = ProviderCache(ttl=60, stale=60, clock=clock)
+    cached = CachedHotelProvider("booking", provider, cache)
+
+    async def scenario():
+        first = await cached.search_hotels("Москва", "2024-06-01", "2024-06-03")
+        provider.fail = True
+        clock.now += 90
+        stale = await cached.search_hotels("Москва", "2024-06-01", "2024-06-03")
+        await asyncio.sleep(0)
+        clock.now += 60
+        with pytest.raises(RuntimeError):
+            await cached.search_hotels("Москва", "2024-06-01", "2024-06-03")
+        return first, stale
+
+    first, stale = asyncio.run(scenario())
+
+    assert stale == first
+    assert cache.stats()["providers"]["booking"]["refresh_errors"] == 1
+
+
+def test_place_search_shares_grid_cell():
+    """Тест: поиск мест из соседних точек одной ячейки берётся из кэша"""
+    provider = _CountingPlaces()
+    cached = CachedPlaceProvider("foursquare", provider, ProviderCache(clock=_Clock()), grid=0.01)
+
+    async def scenario():
+        await cached.search_places("Кофе", location=(55.7512, 37.6181))
+        await cached.search_places("кофе", location=(55.7549, 37.6102))
+
+    asyncio.run(scenario())
+
+    assert provider.calls == 1
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    """Тест: записи из SQLite доступны новому экземпляру кэша (после перезапуска)"""
+    provider = _CountingHotels()
+    clock = _Clock()
+    path = tmp_path / "provider_cache.sqlite"
+
+    first_cache = ProviderCache(ttl=60, stale=60, store=SQLiteCacheStore(path), clock=clock)
+    asyncio.run(CachedHotelProvider("booking", provider, first_cache).search_hotels("Москва", "2024-06-01", "2024-06-03"))
+    first_cache.close()
+
+    second_cache = ProviderCache(ttl=60, stale=60, store=SQLiteCacheStore(path), clock=clock)
+    items = asyncio.run(
+        CachedHotelProvider("booking", provider, second_cache).search_hotels("Москва", "2024-06-01", "2024-06-03")
+    )
+
+    assert items[0]["id"] == "1"
+    assert provider.calls == 1
+    assert second_cache.stats()["providers"]["booking"]["persistent_hits"] == 1
+
+    clock.now += 1000
+    assert second_cache.purge() == 1
+    second_cache.close()
+
+
+def test_health_integrations_reports_cache(client):
+    """Тест: статистика кэша провайдеров видна в /health/integrations"""
+    response = client.get("/health/integrations")
+
+    assert response.status_code == 200
+    assert "provider_cache" in response.json()
+    assert "providers" in response.json()["provider_cache"]
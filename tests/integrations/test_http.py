@@ -0,0 +1,145 @@
+import asyncio
+import gc
+import threading
+import warnings
+
+import httpx
+import pytest
+
+from integrations.fake_server import FakeProviderServer
+from integrations.hotels.booking import BookingComProvider
+from integrations.http import HttpClient
+from integrations.places.foursqure import FoursquareProvider
+
+
+def test_providers_read_recorded_payloads():
+    """Тест: провайдеры ходят в фейковый сервер через общий клиент и приводят ответы к своему формату"""
+    async def scenario():
+        client = HttpClient()
+        async with FakeProviderServer() as server:
+            booking = BookingComProvider(base_url=f"{server.url}/booking", client=client)
+            foursquare = FoursquareProvider(base_url=f"{server.url}/foursquare", client=client)
+
+            hotels = await booking.search_hotels("Москва", "2024-06-01", "2024-06-03")
+            places = await foursquare.search_places("кофе", location=(55.75, 37.61))
+        await client.aclose()
+        return hotels, places
+
+    hotels, places = asyncio.run(scenario())
+
+    assert hotels[0] == {"id": "1001", "name": "Отель 'Центральный'", "address": "ул. Ленина, 1",
+                         "price": 5000, "rating": 4.5}
+    assert places[0]["id"] == "4b5988fef964a520f08d28e3"
+    assert places[0]["categories"] == ["coffee shop", "bakery"]
+    assert places[0]["location"]["lat"] == 55.7558
+
+
+def test_providers_without_url_keep_stubs():
+    """Тест: без URL в настройках остаются прежние заглушки"""
+    hotels = asyncio.run(BookingComProvider().search_hotels("Москва", "2024-06-01", "2024-06-03"))
+
+    assert hotels[0]["id"] == "1"
+
+
+def test_keep_alive_and_per_host_limit():
+    """Тест: соединения переиспользуются, одновременно к хосту не больше per_host запросов"""
+    async def scenario():
+        client = HttpClient(per_host=3)
+        async with FakeProviderServer(latency=0.02) as server:
+            url = f"{server.url}/booking/hotels/search"
+            await asyncio.gather(*(client.get_json(url) for _ in range(12)))
+            stats = client.stats()["hosts"][f"127.0.0.1:{server.port}"]
+        await client.aclose()
+        return server.stats(), stats
+
+    server_stats, host_stats = asyncio.run(scenario())
+
+    assert server_stats["requests"] == 12
+    assert server_stats["max_in_flight"] <= 3
+    assert server_stats["connections"] <= 3
+    assert host_stats["requests"] == 12 and host_stats["in_flight"] == 0
+
+
+def test_read_timeout_counted():
+    """Тест: таймаут чтения — httpx.ReadTimeout и счётчик timeouts по хосту"""
+    async def scenario():
+        client = HttpClient(read_timeout=0.05)
+        async with FakeProviderServer(latency={"/booking/hotels/search": 0.5}) as server:
+            with pytest.raises(httpx.ReadTimeout):
+                await client.get_json(f"{server.url}/booking/hotels/search")
+            missing = await client.request("GET", f"{server.url}/unknown")
+            stats = client.stats()["hosts"][f"127.0.0.1:{server.port}"]
+        await client.aclose()
+        return missing.status_code, stats
+
+    status_code, stats = asyncio.run(scenario())
+
+    assert status_code == 404
+    assert stats["timeouts"] == 1
+    assert stats["requests"] == 2
+
+
+def test_stream_response():
+    """Тест: потоковое чтение тела по частям"""
+    async def scenario():
+        client = HttpClient()
+        async with FakeProviderServer() as server:
+            async with client.stream("GET", f"{server.url}/foursquare/places/search") as response:
+                chunks = [chunk async for chunk in response.aiter_bytes()]
+        await client.aclose()
+        return b"".join(chunks)
+
+    body = asyncio.run(scenario())
+
+    assert body.startswith(b"{") and b"fsq_id" in body
+
+
+@pytest.fixture
+def threaded_server():
+    """Фейковый провайдер в своём потоке и loop — переживает loop-ы клиента"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = asyncio.run_coroutine_threadsafe(FakeProviderServer().start(), loop).result()
+    yield server
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_clients_closed_with_their_loop(threaded_server):
+    """Тест: без aclose клиенты закрываются при завершении asyncio.run, следующий loop открывает свои"""
+    client = HttpClient()
+    url = f"{threaded_server.url}/booking/hotels/search"
+    opened = []
+
+    async def request():
+        await client.get_json(url)
+        opened.append(client.stats()["open_clients"])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", ResourceWarning)
+        asyncio.run(request())
+        assert client.stats()["open_clients"] == 0
+        asyncio.run(request())
+        gc.collect()
+
+    assert opened == [1, 1]
+    assert client.stats()["open_clients"] == 0
+    assert client.stats()["clients_created"] == 2
+
+
+def test_second_live_loop_is_rejected(threaded_server):
+    """Тест: пока первый loop жив и держит соединения, второй loop получает ошибку, а не тихую подмену пула"""
+    client = HttpClient()
+    url = f"{threaded_server.url}/booking/hotels/search"
+    first = asyncio.new_event_loop()
+    try:
+        first.run_until_complete(client.get_json(url))
+        with pytest.raises(RuntimeError):
+            asyncio.run(client.get_json(url))
+        first.run_until_complete(client.aclose())
+        assert client.stats()["open_clients"] == 0
+    finally:
+        first.close()
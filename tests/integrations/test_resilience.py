@@ -0,0 +1,269 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from core.confing import settings
+from integrations.fake_server import FakeProviderServer
+from integrations.hotels.base import BaseHotelProvider
+from integrations.hotels.booking import BookingComProvider
+from integrations.hotels.registry import HotelProviderRegistry
+from integrations.http import HttpClient
+from integrations.resilience import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, PolicyRegistry,
+                                     ResiliencePolicy, ResilientHotelProvider)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Flaky(BaseHotelProvider):
+    """Первый вызов отвечает slow секунд, следующие — fast"""
+
+    def __init__(self, slow: float = 0.0, fast: float = 0.0, error: Exception | None = None):
+        self.slow = slow
+        self.fast = fast
+        self.error = error
+        self.calls = 0
+
+    async def search_hotels(self, city, check_in, check_out, guests=2):
+        self.calls += 1
+        await asyncio.sleep(self.slow if self.calls == 1 else self.fast)
+        if self.error:
+            raise self.error
+        return [{"id": str(self.calls)}]
+
+    async def get_hotel_details(self, hotel_id):
+        return None
+
+    async def check_availability(self, hotel_id, check_in, check_out):
+        return True
+
+
+def _search(provider):
+    return provider.search_hotels("Москва", "2024-06-01", "2024-06-03")
+
+
+def test_breaker_opens_fails_fast_and_recovers():
+    """Тест: доля ошибок выше порога размыкает автомат, после паузы пробные вызовы его замыкают"""
+    clock = _Clock()
+    breaker = CircuitBreaker("booking", window=30, min_calls=4, error_rate=0.5, open_seconds=10,
+                             half_open_calls=2, clock=clock)
+
+    for ok in (True, False, True, False):
+        breaker.before_call()
+        breaker.record(ok, 0.01)
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats()["rejected"] == 1
+
+    clock.now += 11
+    breaker.before_call()
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record(True, 0.01)
+    breaker.record(True, 0.01)
+    assert breaker.state == CLOSED
+
+
+def test_breaker_opens_on_slow_calls_and_forgets_old_ones():
+    """Тест: медленные вызовы тоже размыкают автомат; вызовы старше окна не учитываются"""
+    clock = _Clock()
+    breaker = CircuitBreaker("booking", window=30, min_calls=3, slow_call=1.0, slow_rate=0.5, clock=clock)
+
+    breaker.record(True, 2.0)
+    breaker.record(True, 2.0)
+    clock.now += 31
+    breaker.record(True, 0.1)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 1
+
+    breaker.record(True, 2.0)
+    breaker.record(True, 2.0)
+    assert breaker.state == OPEN
+
+
+def test_adaptive_timeout_follows_p95():
+    """Тест: без замеров — верхний таймаут, потом p95 × множитель в заданных пределах"""
+    policy = ResiliencePolicy(CircuitBreaker("booking"), timeout_multiplier=2.0, min_timeout=0.2,
+                              max_timeout=5.0, min_samples=10)
+    assert policy.timeout() == 5.0
+
+    policy._latencies.extend([0.3] * 10)
+    assert policy.timeout() == pytest.approx(0.6)
+
+    policy._latencies.extend([0.01] * 200)
+    assert policy.timeout() == 0.2
+
+
+def test_latency_samples_are_configured_separately_from_breaker(monkeypatch):
+    """Тест: порог замеров для таймаута берётся из своей настройки, а не из порога автомата"""
+    monkeypatch.setattr(settings, "PROVIDER_LATENCY_MIN_SAMPLES", 5)
+    monkeypatch.setattr(settings, "BREAKER_MIN_CALLS", 50)
+
+    policy = PolicyRegistry().get("booking")
+
+    assert policy.min_samples == 5
+    assert policy.breaker.min_calls == 50
+
+
+def test_slow_call_times_out_by_adaptive_timeout():
+    """Тест: зависший вызов обрывается по адаптивному таймауту и считается ошибкой"""
+    policy = ResiliencePolicy(CircuitBreaker("booking"), min_timeout=0.05, min_samples=5, hedge=False)
+    policy._latencies.extend([0.02] * 5)
+    provider = ResilientHotelProvider(_Flaky(slow=1.0), policy)
+
+    started = time.perf_counter()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(_search(provider))
+
+    assert time.perf_counter() - started < 0.5
+    assert policy.stats()["timeouts"] == 1
+    assert policy.breaker.stats()["error_rate"] == 1.0
+
+
+def test_hedged_request_wins_over_slow_primary():
+    """Тест: если ответа нет дольше p95, второй запрос отвечает раньше первого"""
+    policy = ResiliencePolicy(CircuitBreaker("booking"), min_samples=5, hedge_min_delay=0.01, hedge_ratio=1.0)
+    policy._latencies.extend([0.02] * 5)
+    inner = _Flaky(slow=0.5, fast=0.0)
+    provider = ResilientHotelProvider(inner, policy)
+
+    started = time.perf_counter()
+    items = asyncio.run(_search(provider))
+
+    assert time.perf_counter() - started < 0.3
+    assert items == [{"id": "2"}]
+    assert inner.calls == 2
+    assert policy.stats()["hedges"] == 1
+    assert policy.stats()["hedge_wins"] == 1
+
+
+def test_hedges_are_limited_by_ratio():
+    """Тест: без бюджета на хеджи второй запрос не отправляется"""
+    policy = ResiliencePolicy(CircuitBreaker("booking"), min_samples=5, hedge_min_delay=0.01, hedge_ratio=0.0)
+    policy._latencies.extend([0.01] * 5)
+    inner = _Flaky(slow=0.05)
+
+    asyncio.run(_search(ResilientHotelProvider(inner, policy)))
+
+    assert inner.calls == 1
+    assert policy.stats()["hedges"] == 0
+
+
+def test_breaker_against_fault_injecting_server():
+    """Тест: провайдер с 503 на каждый запрос отключается, дальше вызовы не доходят до сервера"""
+    async def scenario():
+        client = HttpClient()
+        async with FakeProviderServer(error_rate=1.0) as server:
+            policy = ResiliencePolicy(CircuitBreaker("booking", min_calls=5, error_rate=0.5), hedge=False)
+            provider = ResilientHotelProvider(BookingComProvider(base_url=f"{server.url}/booking", client=client),
+                                              policy)
+            for _ in range(5):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await _search(provider)
+
+            started = time.perf_counter()
+            for _ in range(20):
+                with pytest.raises(CircuitOpenError):
+                    await _search(provider)
+            rejected_in = time.perf_counter() - started
+
+            server.error_rate = 0.0
+            policy.reset()
+            items = await _search(provider)
+            requests = server.stats()["requests"]
+        await client.aclose()
+        return policy, rejected_in, items, requests
+
+    policy, rejected_in, items, requests = asyncio.run(scenario())
+
+    assert rejected_in < 0.05
+    assert requests == 6
+    assert items[0]["id"] == "1001"
+    assert policy.breaker.stats()["rejected"] == 20
+
+
+def test_registry_reports_circuit_open():
+    """Тест: отключённый автоматом провайдер помечается в статусах поиска без ожидания"""
+    breaker = CircuitBreaker("broken", min_calls=1, error_rate=0.5)
+    breaker.record(False, 0.01)
+    registry = HotelProviderRegistry()
+    registry.register("broken", ResilientHotelProvider(_Flaky(slow=2.0), ResiliencePolicy(breaker)))
+
+    _, statuses = asyncio.run(registry.search_hotels("Москва", "2024-06-01", "2024-06-03", 2, deadline=1.0))
+
+    assert statuses["broken"]["status"] == "circuit_open"
+    assert statuses["broken"]["latency_ms"] < 50
+    assert registry.stats()["broken"]["rejected"] == 1
+
+
+def test_provider_hanging_past_search_deadline_opens_breaker():
+    """Тест: дедлайн поиска короче таймаута политики — политика обрывает вызов по нему сама и размыкает автомат"""
+    policy = ResiliencePolicy(CircuitBreaker("hanging", min_calls=3, error_rate=0.5, slow_call=2.0),
+                              max_timeout=5.0, min_samples=3, hedge=False)
+    inner = _Flaky(slow=10.0, fast=10.0)
+    registry = HotelProviderRegistry()
+    registry.register("hanging", ResilientHotelProvider(inner, policy))
+
+    async def scenario():
+        statuses = []
+        for _ in range(4):
+            _, status = await registry.search_hotels("Москва", "2024-06-01", "2024-06-03", 2, deadline=0.05)
+            statuses.append(status["hanging"]["status"])
+        return statuses
+
+    statuses = asyncio.run(scenario())
+
+    assert statuses == ["timeout", "timeout", "timeout", "circuit_open"]
+    assert inner.calls == 3
+    assert policy.breaker.state == OPEN
+    assert policy.stats()["timeouts"] == 3
+    assert registry.stats()["hanging"]["timeouts"] == 3
+
+
+def test_cancelled_call_is_not_counted():
+    """Тест: отмена снаружи (клиент ушёл) не снижает адаптивный таймаут и не считается ошибкой"""
+    policy = ResiliencePolicy(CircuitBreaker("booking"), min_samples=5, hedge=False)
+    policy._latencies.extend([0.3] * 5)
+    timeout = policy.timeout()
+
+    async def scenario():
+        task = asyncio.create_task(_search(ResilientHotelProvider(_Flaky(slow=1.0), policy)))
+        await asyncio.sleep(0.001)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+    assert policy.timeout() == timeout
+    assert policy.stats()["failures"] == 0 and policy.stats()["timeouts"] == 0
+    assert policy.breaker.stats()["window_calls"] == 0
+
+
+def test_breakers_endpoint_requires_admin(client: TestClient, test_user, db_connection, clear_db):
+    """Тест: состояние автоматов видно только администратору, сброс неизвестного — 404"""
+    token = client.post("/auth/login", json={"email": test_user.email, "password": "Test12345"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/integrations/breakers", headers=headers).status_code == 401
+
+    db_connection.execute("UPDATE users SET is_admin = 1 WHERE id = ?", (test_user.id,))
+    db_connection.commit()
+
+    response = client.get("/integrations/breakers", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["booking"]["state"] == CLOSED
+    assert "timeout_ms" in response.json()["booking"]
+
+    assert client.post("/integrations/breakers/booking/reset", headers=headers).status_code == 200
+    assert client.post("/integrations/breakers/unknown/reset", headers=headers).status_code == 404
@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+
+
+def test_get_places_cursor_pagination(client: TestClient, test_place, clear_db):
+    """Тест keyset-пагинации мест"""
+    response = client.get("/places/", params={"after": "", "limit": 10})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"][0]["id"] == test_place.id
+    assert data["next_cursor"] is None
+
+
+def test_partial_update_place(client: TestClient, test_place, clear_db):
+    """Тест: обновляются только переданные поля, тип сохраняется"""
+    response = client.put(f"/places/{test_place.id}", json={"name": "Новое место"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["name"] == "Новое место"
+    assert data["type"] == "restaurant"
+    assert data["rating"] == 4.8
@@ -43,4 +43,12 @@ def test_get_hotel_reviews(client: TestClient, test_hotel, test_hotel_review):
     data = response.json()
     assert isinstance(data, list)
     assert len(data) > 0
-    assert data[0]["hotel_id"] == test_hotel.id
\ No newline at end of file
+    assert data[0]["hotel_id"] == test_hotel.id
+
+def test_get_hotel_reviews_cursor(client: TestClient, test_hotel, test_hotel_review):
+    """Тест keyset-пагинации отзывов отеля"""
+    response = client.get(f"/reviews/hotel/{test_hotel.id}", params={"after": "", "limit": 1})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"][0]["id"] == test_hotel_review.id
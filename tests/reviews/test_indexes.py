@@ -0,0 +1,23 @@
+import pytest
+
+from core.database import explain_query_plan, check_indexes
+from modules.reviews.repository import BY_HOTEL_SQL, BY_PLACE_SQL, BY_USER_SQL
+
+
+@pytest.mark.parametrize("sql, index_name", [
+    (BY_HOTEL_SQL, "idx_reviews_hotel"),
+    (BY_PLACE_SQL, "idx_reviews_place"),
+    (BY_USER_SQL, "idx_reviews_user"),
+])
+def test_review_lookups_use_index(db_connection, sql, index_name):
+    """Тест: выборки отзывов идут по индексу, а не полным сканом"""
+    plan = explain_query_plan(db_connection, sql, (1, 10, 0))
+
+    assert any(index_name in detail for detail in plan)
+    assert not any(detail.startswith("SCAN reviews") for detail in plan)
+    assert not any("USE TEMP B-TREE" in detail for detail in plan)
+
+
+def test_init_db_checks_indexes(db_connection):
+    """Тест проверки индексов при инициализации"""
+    assert all(check_indexes(db_connection).values())
@@ -0,0 +1,57 @@
+from fastapi.testclient import TestClient
+
+from modules.reviews.models import Review
+
+
+def _review(hotel_id: int, rating: int) -> Review:
+    return Review(id=0, hotel_id=hotel_id, place_id=None, user_id=1,
+                  text="Отзыв", rating=rating, created_at="")
+
+
+def test_hotel_stats_follow_review_writes(client: TestClient, review_repository, test_hotel, clear_db):
+    """Тест инкрементального обновления агрегатов отзывов"""
+    first = review_repository.create_review(_review(test_hotel.id, 5))
+    second = review_repository.create_review(_review(test_hotel.id, 3))
+
+    review_repository.update_review(second.id, {"rating": 4})
+    review_repository.delete_review(first.id)
+
+    response = client.get(f"/hotels/{test_hotel.id}/stats")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["review_count"] == 1
+    assert data["average_rating"] == 4
+    assert data["histogram"] == {"1": 0, "2": 0, "3": 0, "4": 1, "5": 0}
+    assert data["last_review_at"] == second.created_at
+
+
+def test_hotel_stats_without_reviews(client: TestClient, test_hotel, clear_db):
+    """Тест агрегатов отеля без отзывов"""
+    response = client.get(f"/hotels/{test_hotel.id}/stats")
+
+    assert response.status_code == 200
+    assert response.json()["review_count"] == 0
+
+
+def test_hotel_stats_unknown_hotel(client: TestClient):
+    """Тест агрегатов несуществующего отеля"""
+    response = client.get("/hotels/999999/stats")
+
+    assert response.status_code == 404
+
+
+def test_bulk_reviews_update_stats(client: TestClient, test_hotel, clear_db):
+    """Тест агрегатов после массового импорта отзывов"""
+    body = "\n".join(
+        f'{{"hotel_id": {test_hotel.id}, "user_id": 1, "text": "Отзыв", "rating": {rating}}}'
+        for rating in (5, 4, 4)
+    )
+
+    report = client.post("/reviews/bulk", content=body).json()
+    stats = client.get(f"/hotels/{test_hotel.id}/stats").json()
+
+    assert report["inserted"] == 3
+    assert stats["review_count"] == 3
+    assert stats["histogram"]["4"] == 2
+    assert stats["last_review_at"] is not None
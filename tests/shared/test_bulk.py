@@ -0,0 +1,88 @@
+import asyncio
+
+from pydantic import BaseModel
+
+import core.async_database
+from core.async_database import DatabaseExecutor, run_db
+from shared.bulk import aiter_records, bulk_import_async
+
+
+async def _chunks(parts, produced):
+    for part in parts:
+        produced.append(part)
+        await asyncio.sleep(0)
+        yield part
+
+
+async def _collect(records):
+    return [item async for item in records]
+
+
+class _Row(BaseModel):
+    name: str
+
+
+def test_aiter_records_splits_chunks_on_line_boundaries():
+    """Тест: строки и многобайтные символы, разрезанные между кусками, собираются целиком"""
+    body = '{"name": "Отель 1"}\r\n{"name": "Отель 2"}\n\n{"name": "Отель 3"}'.encode("utf-8")
+    parts = [body[i:i + 7] for i in range(0, len(body), 7)]
+
+    records = asyncio.run(_collect(aiter_records(_chunks(parts, []))))
+
+    assert records == [(0, {"name": "Отель 1"}), (1, {"name": "Отель 2"}), (2, {"name": "Отель 3"})]
+
+
+def test_aiter_records_csv_keeps_header_and_quoted_newlines_across_chunks():
+    """Тест: заголовок CSV действует на все куски, перевод строки в кавычках не разрывает запись"""
+    parts = [part.encode("utf-8") for part in ("name,address\n", '"Отель 1","ул. 1\n', 'корпус 2"\n', "Отель 2,\n")]
+
+    records = asyncio.run(_collect(aiter_records(_chunks(parts, []), "csv")))
+
+    assert records == [
+        (0, {"name": "Отель 1", "address": "ул. 1\nкорпус 2"}),
+        (1, {"name": "Отель 2"}),
+    ]
+
+
+def test_bulk_import_async_leaves_db_thread_free_while_body_arrives(monkeypatch):
+    """Тест: пока клиент не прислал следующий кусок, единственный поток БД свободен для других запросов"""
+    monkeypatch.setattr(core.async_database, "db_executor", DatabaseExecutor(1))
+    written = []
+
+    async def scenario():
+        more = asyncio.Event()
+
+        async def body():
+            yield b'{"name": "a"}\n{"name": "b"}\n'
+            await more.wait()
+            yield b'{"name": "c"}\n'
+
+        def writer(rows):
+            written.append([row.name for row in rows])
+            return len(rows)
+
+        task = asyncio.create_task(bulk_import_async(aiter_records(body()), _Row, writer, chunk_size=2))
+        while not written:
+            await asyncio.sleep(0.01)
+        free = await asyncio.wait_for(run_db(lambda: "free"), 1.0)
+        more.set()
+        return free, await task
+
+    free, report = asyncio.run(scenario())
+    core.async_database.db_executor.shutdown()
+
+    assert free == "free"
+    assert written == [["a", "b"], ["c"]]
+    assert report.inserted == 3 and report.total == 3
+
+
+def test_bulk_endpoint_accepts_chunked_body(client, clear_db):
+    """Тест: импорт из тела, пришедшего кусками (chunked), без Content-Length"""
+    def body():
+        for i in range(5):
+            yield f'{{"name": "Отель {i}", "address": "ул. Тестовая", "rating": 4}}\n'.encode("utf-8")
+
+    response = client.post("/hotels/bulk", content=body(), params={"chunk_size": 2})
+
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 5
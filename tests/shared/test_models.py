@@ -0,0 +1,34 @@
+import sqlite3
+
+from modules.auth.models import User
+from modules.hotels.models import Hotel
+
+
+def test_row_factory_maps_columns_by_name():
+    """Тест: строки раскладываются по именам колонок, а не по позициям"""
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE hotels(rating REAL, created_at TEXT, address TEXT, name TEXT, id INTEGER)")
+    conn.execute("INSERT INTO hotels VALUES(4.5, '2024-01-01', 'ул. Тестовая, 1', 'Отель', 7)")
+
+    cursor = conn.cursor()
+    cursor.row_factory = Hotel.row_factory
+    hotel = cursor.execute("SELECT * FROM hotels").fetchone()
+
+    assert hotel == Hotel(id=7, name="Отель", address="ул. Тестовая, 1", rating=4.5)
+    assert not hasattr(hotel, "__dict__")
+    conn.close()
+
+
+def test_from_db_row_converters_and_positional():
+    """Тест: кортеж в порядке select_list() и преобразования 0/1 -> bool"""
+    row = (1, "user@example.com", "user", "hash", 1, 0, "2024-01-01", None)
+    user = User.from_db_row(row)
+
+    assert User.select_list().startswith("id, email, username")
+    assert user.is_active is True and user.is_admin is False
+    assert user.to_dict()["email"] == "user@example.com"
+    assert "hashed_password" not in user.to_dict()
+
+    hotel = Hotel.from_db_row((1, "Отель", "Адрес", 5.0))
+    assert hotel.to_dict() == {"id": 1, "name": "Отель", "address": "Адрес", "rating": 5.0}
+    assert Hotel.from_dict(hotel.to_dict()) == hotel
@@ -0,0 +1,119 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.confing import settings
+from modules.hotels.models import Hotel
+from modules.places.models import Place
+from modules.reviews.models import Review
+
+
+@pytest.fixture
+def catalog(hotel_repository, place_repository, review_repository, test_user, clear_db):
+    """Несколько отелей, мест и отзывов — хватает на две keyset-страницы"""
+    hotels = [hotel_repository.create_hotel(Hotel(id=0, name=f"Отель \"{i}\"", address=f"ул. Тестовая, {i}",
+                                                  rating=4.5 - i / 10)) for i in range(3)]
+    places = [place_repository.create_place(Place(id=0, name=f"Место {i}", type="museum",
+                                                  address=f"пр. Мест, {i}", rating=5.0)) for i in range(3)]
+    for i, hotel in enumerate(hotels):
+        review_repository.create_review(Review(id=0, hotel_id=hotel.id, place_id=None, user_id=test_user.id,
+                                               text=f"Отзыв\n{i}", rating=i + 1, created_at=""))
+    review_repository.create_review(Review(id=0, hotel_id=None, place_id=places[0].id, user_id=test_user.id,
+                                           text="Место 👍", rating=5, created_at=""))
+
+
+def _both(client: TestClient, monkeypatch, url: str, params: dict, endpoint: str):
+    """Один и тот же запрос в обычном режиме и в режиме JSON-байтов"""
+    monkeypatch.setattr(settings, "FAST_JSON_ENDPOINTS", set())
+    slow = client.get(url, params=params)
+    monkeypatch.setattr(settings, "FAST_JSON_ENDPOINTS", {endpoint})
+    fast = client.get(url, params=params)
+    return slow, fast
+
+
+@pytest.mark.parametrize("url,endpoint", [
+    ("/hotels/", "hotels.list"),
+    ("/places/", "places.list"),
+    ("/reviews/", "reviews.list"),
+])
+@pytest.mark.parametrize("params", [
+    {"page": 1, "limit": 10},
+    {"page": 2, "limit": 2},
+    {"after": "", "limit": 2},
+])
+def test_fast_json_matches_response_model(client: TestClient, monkeypatch, catalog, url, endpoint, params):
+    """Тест: быстрый путь отдаёт те же байты, что и проверка через response_model"""
+    slow, fast = _both(client, monkeypatch, url, params, endpoint)
+
+    assert slow.status_code == fast.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.content == slow.content
+
+    if "after" in params:
+        next_params = {"after": fast.json()["next_cursor"], "limit": 2}
+        slow, fast = _both(client, monkeypatch, url, next_params, endpoint)
+        assert fast.content == slow.content
+
+
+def test_fast_json_keeps_errors(client: TestClient, monkeypatch, clear_db):
+    """Тест: испорченный курсор — прежняя ошибка 400"""
+    slow, fast = _both(client, monkeypatch, "/hotels/", {"after": "not-a-cursor"}, "hotels.list")
+
+    assert slow.status_code == fast.status_code == 400
+    assert slow.json() == fast.json()
+
+
+@pytest.mark.parametrize("table", ["hotels", "places", "reviews"])
+def test_fast_export_matches_json_dumps(client: TestClient, monkeypatch, catalog, table):
+    """Тест: построчно выгрузка совпадает с json.dumps после разбора"""
+    headers = {"Accept-Encoding": "identity"}
+    monkeypatch.setattr(settings, "FAST_JSON_ENDPOINTS", set())
+    slow = client.get(f"/export/{table}", headers=headers)
+    monkeypatch.setattr(settings, "FAST_JSON_ENDPOINTS", {"export"})
+    fast = client.get(f"/export/{table}", headers=headers)
+
+    slow_rows = [json.loads(line) for line in slow.text.splitlines()]
+    fast_rows = [json.loads(line) for line in fast.text.splitlines()]
+    assert fast_rows == slow_rows
+    assert len(fast_rows) >= 3
+
+
+@pytest.fixture
+def legacy_rows(catalog, db_connection, test_user):
+    """Строки из старой схемы: NULL в необязательных колонках"""
+    db_connection.execute("INSERT INTO hotels (name, address, rating) VALUES ('Старый отель', NULL, NULL)")
+    db_connection.execute("INSERT INTO places (name, type, address, rating) VALUES ('Старое место', NULL, NULL, NULL)")
+    hotel_id = db_connection.execute("SELECT MAX(id) FROM hotels").fetchone()[0]
+    db_connection.execute("INSERT INTO reviews (hotel_id, place_id, user_id, text, rating) VALUES (?, NULL, ?, NULL, 3)",
+                          (hotel_id, test_user.id))
+    db_connection.commit()
+
+
+@pytest.mark.parametrize("url,endpoint", [
+    ("/hotels/", "hotels.list"),
+    ("/places/", "places.list"),
+    ("/reviews/", "reviews.list"),
+])
+@pytest.mark.parametrize("params", [{"page": 1, "limit": 10}, {"after": "", "limit": 10}])
+def test_fast_json_matches_with_null_columns(client: TestClient, monkeypatch, legacy_rows, url, endpoint, params):
+    """Тест: строки с NULL отдаются обоими путями одинаково — поля на месте, значения null"""
+    slow, fast = _both(client, monkeypatch, url, params, endpoint)
+
+    assert slow.status_code == fast.status_code == 200
+    assert fast.content == slow.content
+    items = fast.json() if isinstance(fast.json(), list) else fast.json()["items"]
+    assert any(None in item.values() for item in items)
+
+
+@pytest.mark.parametrize("table", ["hotels", "places", "reviews"])
+def test_fast_export_matches_with_null_columns(client: TestClient, monkeypatch, legacy_rows, table):
+    """Тест: выгрузка строк с NULL совпадает в обоих режимах"""
+    headers = {"Accept-Encoding": "identity"}
+    monkeypatch.setattr(settings, "FAST_JSON_ENDPOINTS", set())
+    slow = client.get(f"/export/{table}", headers=headers)
+    monkeypatch.setattr(settings, "FAST_JSON_ENDPOINTS", {"export"})
+    fast = client.get(f"/export/{table}", headers=headers)
+
+    assert [json.loads(line) for line in fast.text.splitlines()] == [json.loads(line) for line in slow.text.splitlines()]
+    assert any(None in json.loads(line).values() for line in fast.text.splitlines())